@@ -0,0 +1,75 @@
+"""
+Сравнение последовательной, конвейерной обработки и параллельного сжатия блоков custom формата.
+
+Запуск из корня репозитория:
+    python -m benchmarks.custom_pipeline --rows 200000 --repeat 3 --compression-threads 4
+"""
+
+import argparse
+import io
+import time
+from typing import Any, Dict, List
+
+from src.pg_stage.obfuscators.custom import CustomObfuscator
+from tests.dump_builder import build_custom_dump
+
+COMMENTS = ['COMMENT ON COLUMN public.users.email IS \'anon: [{"mutation_name": "email"}]\';\n']
+
+
+def build_dump(rows: int) -> bytes:
+    """
+    Сборка сжатого дампа с одной таблицей.
+    :param rows: количество строк
+    :return: байты дампа
+    """
+    data = [f'{row}\tuser{row}@mail.ru\t{"x" * 200}\t2024-01-01 00:00:00' for row in range(rows)]
+    return build_custom_dump(
+        tables=[('users', ['id', 'email', 'payload', 'created_at'], data)],
+        comments=COMMENTS,
+        compression='zlib',
+    )
+
+
+def measure(dump: bytes, *, repeat: int, **kwargs: Any) -> float:
+    """
+    Лучшее время обработки дампа из нескольких запусков.
+    :param dump: байты дампа
+    :param repeat: количество запусков
+    :param kwargs: параметры CustomObfuscator
+    :return: время в секундах
+    """
+    timings: List[float] = []
+    for _ in range(repeat):
+        stdin = io.BufferedReader(io.BytesIO(dump))
+        started_at = time.perf_counter()
+        CustomObfuscator(**kwargs).run(stdin=stdin, stdout=io.BytesIO())
+        timings.append(time.perf_counter() - started_at)
+
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--compression-threads', type=int, default=4)
+    args = parser.parse_args()
+
+    dump = build_dump(args.rows)
+    results: Dict[str, float] = {
+        'sequential': measure(dump, use_threads=False, repeat=args.repeat),
+        'pipelined': measure(dump, use_threads=True, repeat=args.repeat),
+        'parallel-zlib': measure(
+            dump,
+            use_threads=True,
+            compression_threads=args.compression_threads,
+            repeat=args.repeat,
+        ),
+    }
+    for name, seconds in results.items():
+        speed_up = results['sequential'] / seconds
+        print(f'{name:<14} {seconds:8.3f}s  {args.rows / seconds:12.0f} rows/s  {speed_up:6.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -9,7 +9,12 @@ setup(
     package_dir={'': 'src'},
     long_description=open(join(dirname(__file__), 'README.md')).read(),
     install_requires=['typing-extensions>=4.5.0', 'mimesis==4.1.3'],
-    extras_require={'dev': ['pytest']},
+    extras_require={
+        'dev': ['pytest'],
+        'lz4': ['lz4'],
+        'numpy': ['numpy'],
+        'zstd': ['zstandard; python_version < "3.14"'],
+    },
     include_package_data=True,
     license_files=('LICENSE.txt',),
 )
@@ -0,0 +1,875 @@
+import zlib
+from abc import ABCMeta, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO, Callable, Deque, Dict, Iterator, Optional
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - зависит от окружения
+    lz4_frame = None
+
+try:
+    from compression import zstd as stdlib_zstd  # Python 3.14+
+except ImportError:  # pragma: no cover - зависит от окружения
+    stdlib_zstd = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - зависит от окружения
+    zstandard = None
+
+DECOMPRESS_CHUNK_SIZE = 1024 * 1024  # 1MB; максимальный размер распакованных данных за один шаг
+
+ZSTD_DEFAULT_LEVEL = 3
+ZLIB_PIECE_SIZE = 128 * 1024  # 128KB; размер части для параллельного сжатия, как в pigz
+ZLIB_WINDOW_SIZE = 32 * 1024  # окно deflate; конец предыдущей части используется как словарь следующей
+
+LZ4_MAGIC = b'\x04\x22\x4d\x18'
+LZ4_SKIPPABLE_MAGIC_MASK = 0xFFFFFFF0
+LZ4_SKIPPABLE_MAGIC = 0x184D2A50
+LZ4_BLOCK_SIZES = {4: 64 * 1024, 5: 256 * 1024, 6: 1024 * 1024, 7: 4 * 1024 * 1024}
+LZ4_WINDOW_SIZE = 64 * 1024
+LZ4_MIN_MATCH = 4
+LZ4_LAST_LITERALS = 5  # последние байты блока всегда записываются литералами
+LZ4_MATCH_LIMIT = 12  # совпадение не может начинаться ближе к концу блока
+LZ4_MAX_OFFSET = 65535
+LZ4_UNCOMPRESSED_FLAG = 0x80000000
+
+XXH_PRIME_1 = 2654435761
+XXH_PRIME_2 = 2246822519
+XXH_PRIME_3 = 3266489917
+XXH_PRIME_4 = 668265263
+XXH_PRIME_5 = 374761393
+XXH_MASK = 0xFFFFFFFF
+
+
+class Decompressor(metaclass=ABCMeta):
+    """Потоковый распаковщик."""
+
+    @abstractmethod
+    def decompress(self, data: bytes) -> Iterator[bytes]:
+        """
+        Распаковка очередной порции сжатых данных.
+        :param data: сжатые данные
+        :return: итератор распакованных данных ограниченного размера
+        """
+        raise NotImplementedError()
+
+    def flush(self) -> bytes:
+        """
+        Завершение распаковки.
+        :return: оставшиеся распакованные данные
+        """
+        return b''
+
+
+class Compressor(metaclass=ABCMeta):
+    """Потоковый упаковщик."""
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """
+        Сжатие очередной порции данных.
+        :param data: исходные данные
+        :return: сжатые данные, готовые к записи (могут быть пустыми)
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def flush(self) -> bytes:
+        """
+        Завершение сжатия.
+        :return: оставшиеся сжатые данные
+        """
+        raise NotImplementedError()
+
+
+class Codec:
+    """Алгоритм сжатия с фабриками потоковых упаковщика и распаковщика."""
+
+    def __init__(
+        self,
+        name: str,
+        decompressor_factory: Callable[[], Decompressor],
+        compressor_factory: Callable[[Optional[int]], Compressor],
+    ) -> None:
+        """
+        Инициализация кодека.
+        :param name: название алгоритма
+        :param decompressor_factory: фабрика распаковщика
+        :param compressor_factory: фабрика упаковщика (принимает уровень сжатия)
+        """
+        self.name = name
+        self._decompressor_factory = decompressor_factory
+        self._compressor_factory = compressor_factory
+
+    def create_decompressor(self) -> Decompressor:
+        """
+        Создание распаковщика.
+        :return: распаковщик
+        """
+        return self._decompressor_factory()
+
+    def create_compressor(self, level: Optional[int] = None) -> Compressor:
+        """
+        Создание упаковщика.
+        :param level: уровень сжатия (None - уровень алгоритма по умолчанию)
+        :return: упаковщик
+        """
+        return self._compressor_factory(level)
+
+
+class PassthroughDecompressor(Decompressor):
+    """Распаковщик для несжатых данных: данные передаются без изменений."""
+
+    def decompress(self, data: bytes) -> Iterator[bytes]:
+        if data:
+            yield data
+
+
+class PassthroughCompressor(Compressor):
+    """Упаковщик для записи без сжатия: данные передаются без изменений."""
+
+    def __init__(self, level: Optional[int] = None) -> None:
+        pass
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def flush(self) -> bytes:
+        return b''
+
+
+class ZlibDecompressor(Decompressor):
+    """Распаковщик zlib."""
+
+    def __init__(self) -> None:
+        self._decompressor = zlib.decompressobj()
+
+    def decompress(self, data: bytes) -> Iterator[bytes]:
+        while data and not self._decompressor.eof:
+            # Ограничение размера распакованных данных защищает от данных с большим коэффициентом сжатия
+            decompressed = self._decompressor.decompress(data, DECOMPRESS_CHUNK_SIZE)
+            data = self._decompressor.unconsumed_tail
+            if decompressed:
+                yield decompressed
+
+    def flush(self) -> bytes:
+        return self._decompressor.flush()
+
+
+class ZlibCompressor(Compressor):
+    """Упаковщик zlib."""
+
+    def __init__(self, level: Optional[int] = None) -> None:
+        self._compressor = zlib.compressobj(level=zlib.Z_DEFAULT_COMPRESSION if level is None else level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+def _deflate_piece(data: bytes, dictionary: bytes, level: int, *, is_last: bool) -> bytes:
+    """
+    Сжатие части потока в raw deflate.
+    Промежуточные части завершаются Z_SYNC_FLUSH (выравнивание по байту без признака последнего блока),
+    поэтому их конкатенация остается одним корректным потоком deflate.
+    :param data: данные части
+    :param dictionary: последние данные предыдущей части
+    :param level: уровень сжатия
+    :param is_last: последняя часть потока
+    :return: сжатые данные
+    """
+    if dictionary:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=dictionary)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+
+    return compressor.compress(data) + compressor.flush(zlib.Z_FINISH if is_last else zlib.Z_SYNC_FLUSH)
+
+
+class ParallelZlibCompressor(Compressor):
+    """
+    Упаковщик zlib, сжимающий части потока параллельно в пуле потоков (как pigz).
+    Результат - один поток zlib: заголовок, части deflate по порядку и контрольная сумма adler32.
+    zlib освобождает GIL на время сжатия, поэтому части сжимаются одновременно.
+    """
+
+    def __init__(self, level: Optional[int] = None, threads: int = 2, piece_size: int = ZLIB_PIECE_SIZE) -> None:
+        """
+        Метод инициализации класса.
+        :param level: уровень сжатия
+        :param threads: количество потоков
+        :param piece_size: размер части
+        """
+        self._level = zlib.Z_DEFAULT_COMPRESSION if level is None else level
+        self._piece_size = piece_size
+        self._max_in_flight = threads * 2
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='pg_stage_deflate')
+        self._pending: Deque[Future] = deque()
+        self._buffer = bytearray()
+        self._dictionary = b''
+        self._checksum = zlib.adler32(b'')
+        self._header = zlib.compress(b'', self._level)[:2]
+
+    def _submit(self, data: bytes, *, is_last: bool) -> None:
+        """
+        Передача части в пул потоков.
+        :param data: данные части
+        :param is_last: последняя часть потока
+        """
+        self._checksum = zlib.adler32(data, self._checksum)
+        self._pending.append(
+            self._executor.submit(_deflate_piece, data, self._dictionary, self._level, is_last=is_last),
+        )
+        self._dictionary = (self._dictionary + data)[-ZLIB_WINDOW_SIZE:]
+
+    def _collect(self, *, wait: bool) -> bytes:
+        """
+        Получение сжатых частей в исходном порядке.
+        :param wait: дождаться всех частей (иначе - только готовых и превышающих лимит частей в обработке)
+        :return: сжатые данные
+        """
+        output = bytearray(self._header)
+        self._header = b''
+        while self._pending and (wait or self._pending[0].done() or len(self._pending) > self._max_in_flight):
+            output += self._pending.popleft().result()
+
+        return bytes(output)
+
+    def compress(self, data: bytes) -> bytes:
+        self._buffer += data
+        while len(self._buffer) >= self._piece_size:
+            self._submit(bytes(self._buffer[: self._piece_size]), is_last=False)
+            del self._buffer[: self._piece_size]
+
+        return self._collect(wait=False)
+
+    def flush(self) -> bytes:
+        self._submit(bytes(self._buffer), is_last=True)
+        self._buffer.clear()
+        try:
+            return self._collect(wait=True) + self._checksum.to_bytes(4, 'big')
+        finally:
+            self._executor.shutdown()
+
+
+def _rotl32(value: int, count: int) -> int:
+    """
+    Циклический сдвиг 32-битного числа влево.
+    :param value: число
+    :param count: величина сдвига
+    :return: результат сдвига
+    """
+    return ((value << count) | (value >> (32 - count))) & XXH_MASK
+
+
+def xxh32(data: bytes, seed: int = 0) -> int:
+    """
+    Хеш xxHash32 (используется для контрольных сумм формата LZ4 frame).
+    :param data: данные
+    :param seed: начальное значение
+    :return: значение хеша
+    """
+    length = len(data)
+    index = 0
+    if length >= 16:
+        accumulators = [
+            (seed + XXH_PRIME_1 + XXH_PRIME_2) & XXH_MASK,
+            (seed + XXH_PRIME_2) & XXH_MASK,
+            seed,
+            (seed - XXH_PRIME_1) & XXH_MASK,
+        ]
+        while index <= length - 16:
+            for lane in range(4):
+                value = int.from_bytes(data[index : index + 4], 'little')
+                accumulators[lane] = (
+                    _rotl32((accumulators[lane] + value * XXH_PRIME_2) & XXH_MASK, 13) * XXH_PRIME_1 & XXH_MASK
+                )
+                index += 4
+
+        result = (
+            _rotl32(accumulators[0], 1)
+            + _rotl32(accumulators[1], 7)
+            + _rotl32(accumulators[2], 12)
+            + _rotl32(accumulators[3], 18)
+        )
+    else:
+        result = seed + XXH_PRIME_5
+
+    result = (result + length) & XXH_MASK
+    while index + 4 <= length:
+        value = int.from_bytes(data[index : index + 4], 'little')
+        result = _rotl32((result + value * XXH_PRIME_3) & XXH_MASK, 17) * XXH_PRIME_4 & XXH_MASK
+        index += 4
+
+    while index < length:
+        result = _rotl32((result + data[index] * XXH_PRIME_5) & XXH_MASK, 11) * XXH_PRIME_1 & XXH_MASK
+        index += 1
+
+    result ^= result >> 15
+    result = result * XXH_PRIME_2 & XXH_MASK
+    result ^= result >> 13
+    result = result * XXH_PRIME_3 & XXH_MASK
+    result ^= result >> 16
+    return result
+
+
+def _read_lz4_length(data: bytes, index: int, value: int) -> tuple:
+    """
+    Чтение расширенной длины литералов или совпадения.
+    :param data: сжатый блок
+    :param index: позиция первого байта расширения
+    :param value: длина из токена
+    :return: длина и позиция после расширения
+    """
+    if value != 15:
+        return value, index
+
+    while True:
+        byte = data[index]
+        index += 1
+        value += byte
+        if byte != 255:
+            return value, index
+
+
+def lz4_decompress_block(data: bytes, output: bytearray) -> None:
+    """
+    Распаковка блока LZ4 в конец буфера (в буфере может находиться история предыдущих блоков).
+    :param data: сжатый блок
+    :param output: буфер для распакованных данных
+    """
+    index = 0
+    length = len(data)
+    try:
+        while index < length:
+            token = data[index]
+            index += 1
+            literals_length, index = _read_lz4_length(data, index, token >> 4)
+            output += data[index : index + literals_length]
+            index += literals_length
+            if index >= length:
+                break
+
+            offset = data[index] | (data[index + 1] << 8)
+            index += 2
+            match_length, index = _read_lz4_length(data, index, token & 15)
+            match_length += LZ4_MIN_MATCH
+            start = len(output) - offset
+            if offset == 0 or start < 0:
+                msg = 'Invalid LZ4 match offset.'
+                raise ValueError(msg)
+
+            while match_length > 0:
+                # При пересечении с копируемыми данными повторяется период длиной offset
+                piece = output[start : start + min(offset, match_length)]
+                output += piece
+                start += len(piece)
+                match_length -= len(piece)
+    except IndexError as error:
+        msg = 'Truncated LZ4 block.'
+        raise ValueError(msg) from error
+
+
+def _write_lz4_length(output: bytearray, value: int) -> None:
+    """
+    Запись расширенной длины литералов или совпадения.
+    :param output: буфер для записи
+    :param value: длина сверх значения в токене
+    """
+    while value >= 255:
+        output.append(255)
+        value -= 255
+
+    output.append(value)
+
+
+def _write_lz4_sequence(output: bytearray, literals: bytes, offset: int, match_length: int) -> None:
+    """
+    Запись последовательности LZ4: литералы и ссылка на совпадение.
+    :param output: буфер для записи
+    :param literals: литералы
+    :param offset: смещение совпадения (0 - последняя последовательность без совпадения)
+    :param match_length: длина совпадения
+    """
+    literals_length = len(literals)
+    match_code = match_length - LZ4_MIN_MATCH if offset else 0
+    output.append((min(literals_length, 15) << 4) | min(match_code, 15))
+    if literals_length >= 15:
+        _write_lz4_length(output, literals_length - 15)
+
+    output += literals
+    if offset:
+        output += offset.to_bytes(2, 'little')
+        if match_code >= 15:
+            _write_lz4_length(output, match_code - 15)
+
+
+def lz4_compress_block(data: bytes) -> bytes:
+    """
+    Сжатие блока LZ4 жадным поиском совпадений по хешу последних четырех байт.
+    :param data: исходные данные (не больше 4MB)
+    :return: сжатый блок
+    """
+    length = len(data)
+    output = bytearray()
+    match_limit = length - LZ4_MATCH_LIMIT
+    positions: Dict[bytes, int] = {}
+    anchor = 0
+    index = 0
+    misses = 0
+    while index < match_limit:
+        sequence = data[index : index + LZ4_MIN_MATCH]
+        candidate = positions.get(sequence)
+        positions[sequence] = index
+        if candidate is None or index - candidate > LZ4_MAX_OFFSET:
+            # Как в эталонной реализации, шаг поиска растет на несжимаемых данных
+            misses += 1
+            index += 1 + (misses >> 6)
+            continue
+
+        misses = 0
+        match_length = LZ4_MIN_MATCH
+        max_length = length - LZ4_LAST_LITERALS - index
+        while match_length < max_length and data[candidate + match_length] == data[index + match_length]:
+            match_length += 1
+
+        _write_lz4_sequence(output, data[anchor:index], index - candidate, match_length)
+        index += match_length
+        anchor = index
+
+    _write_lz4_sequence(output, data[anchor:], 0, 0)
+    return bytes(output)
+
+
+class PyLz4Decompressor(Decompressor):
+    """Распаковщик формата LZ4 frame на чистом Python."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._history = bytearray()
+        self._state = 'magic'
+        self._block_independent = True
+        self._block_checksum = False
+        self._content_checksum = False
+        self._skip = 0
+
+    def decompress(self, data: bytes) -> Iterator[bytes]:
+        self._buffer += data
+        while True:
+            decompressed = self._step()
+            if decompressed is None:
+                return
+
+            if decompressed:
+                yield decompressed
+
+    def flush(self) -> bytes:
+        if self._state not in ('magic', 'done') or self._buffer:
+            msg = 'Truncated LZ4 frame.'
+            raise ValueError(msg)
+
+        return b''
+
+    def _take(self, size: int) -> Optional[bytes]:
+        """
+        Извлечение данных из буфера, если их достаточно.
+        :param size: размер
+        :return: данные или None
+        """
+        if len(self._buffer) < size:
+            return None
+
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def _step(self) -> Optional[bytes]:
+        """
+        Обработка следующего элемента кадра.
+        :return: распакованные данные, пустые байты для служебных элементов или None, если данных недостаточно
+        """
+        if self._state in ('magic', 'done'):
+            if self._skip:
+                skipped = min(self._skip, len(self._buffer))
+                del self._buffer[:skipped]
+                self._skip -= skipped
+                return b'' if skipped else None
+
+            magic = self._take(4)
+            if magic is None:
+                return None
+
+            if magic == LZ4_MAGIC:
+                self._state = 'descriptor'
+                return b''
+
+            if int.from_bytes(magic, 'little') & LZ4_SKIPPABLE_MAGIC_MASK == LZ4_SKIPPABLE_MAGIC:
+                self._state = 'skippable'
+                return b''
+
+            msg = f'Invalid LZ4 frame magic: {magic!r}'
+            raise ValueError(msg)
+
+        if self._state == 'skippable':
+            size = self._take(4)
+            if size is None:
+                return None
+
+            self._skip = int.from_bytes(size, 'little')
+            self._state = 'done'
+            return b''
+
+        if self._state == 'descriptor':
+            return self._read_descriptor()
+
+        if self._state == 'block':
+            return self._read_block()
+
+        size = self._take(4)  # контрольная сумма содержимого
+        if size is None:
+            return None
+
+        self._state = 'done'
+        return b''
+
+    def _read_descriptor(self) -> Optional[bytes]:
+        """
+        Чтение дескриптора кадра.
+        :return: пустые байты или None, если данных недостаточно
+        """
+        if len(self._buffer) < 2:
+            return None
+
+        flags = self._buffer[0]
+        descriptor_size = 3 + (8 if flags & 0x08 else 0) + (4 if flags & 0x01 else 0)
+        descriptor = self._take(descriptor_size)
+        if descriptor is None:
+            return None
+
+        if flags >> 6 != 1:
+            msg = f'Unsupported LZ4 frame version: {flags >> 6}'
+            raise ValueError(msg)
+
+        if (xxh32(descriptor[:-1]) >> 8) & 0xFF != descriptor[-1]:
+            msg = 'Invalid LZ4 frame descriptor checksum.'
+            raise ValueError(msg)
+
+        if flags & 0x01:
+            msg = 'LZ4 frames with dictionary are not supported.'
+            raise ValueError(msg)
+
+        self._block_independent = bool(flags & 0x20)
+        self._block_checksum = bool(flags & 0x10)
+        self._content_checksum = bool(flags & 0x04)
+        self._history.clear()
+        self._state = 'block'
+        return b''
+
+    def _read_block(self) -> Optional[bytes]:
+        """
+        Чтение и распаковка блока кадра.
+        :return: распакованные данные или None, если данных недостаточно
+        """
+        if len(self._buffer) < 4:
+            return None
+
+        block_size = int.from_bytes(self._buffer[:4], 'little')
+        if block_size == 0:
+            del self._buffer[:4]
+            self._state = 'checksum' if self._content_checksum else 'done'
+            return b''
+
+        data_size = block_size & ~LZ4_UNCOMPRESSED_FLAG
+        block = self._take(4 + data_size + (4 if self._block_checksum else 0))
+        if block is None:
+            return None
+
+        data = block[4 : 4 + data_size]
+        if block_size & LZ4_UNCOMPRESSED_FLAG:
+            decompressed = data
+        else:
+            output = bytearray() if self._block_independent else self._history
+            start = len(output)
+            lz4_decompress_block(data, output)
+            decompressed = bytes(output[start:])
+
+        if not self._block_independent:
+            # Связанные блоки могут ссылаться на последние 64KB предыдущих данных
+            self._history += decompressed if block_size & LZ4_UNCOMPRESSED_FLAG else b''
+            del self._history[:-LZ4_WINDOW_SIZE]
+
+        return decompressed
+
+
+class PyLz4Compressor(Compressor):
+    """Упаковщик формата LZ4 frame на чистом Python (независимые блоки по 64KB)."""
+
+    block_size_id = 4
+
+    def __init__(self, level: Optional[int] = None) -> None:
+        self._buffer = bytearray()
+        self._started = False
+
+    def _header(self) -> bytes:
+        """
+        Заголовок кадра.
+        :return: байты заголовка
+        """
+        descriptor = bytes([0x60, self.block_size_id << 4])
+        return LZ4_MAGIC + descriptor + bytes([(xxh32(descriptor) >> 8) & 0xFF])
+
+    def _blocks(self, *, is_final: bool) -> bytes:
+        """
+        Сжатие накопленных полных блоков (и неполного при завершении).
+        :param is_final: завершение сжатия
+        :return: сжатые блоки
+        """
+        block_size = LZ4_BLOCK_SIZES[self.block_size_id]
+        output = bytearray()
+        if not self._started:
+            output += self._header()
+            self._started = True
+
+        while len(self._buffer) >= block_size or (is_final and self._buffer):
+            data = bytes(self._buffer[:block_size])
+            del self._buffer[:block_size]
+            compressed = lz4_compress_block(data)
+            if len(compressed) >= len(data):
+                output += (len(data) | LZ4_UNCOMPRESSED_FLAG).to_bytes(4, 'little') + data
+            else:
+                output += len(compressed).to_bytes(4, 'little') + compressed
+
+        return bytes(output)
+
+    def compress(self, data: bytes) -> bytes:
+        self._buffer += data
+        return self._blocks(is_final=False)
+
+    def flush(self) -> bytes:
+        return self._blocks(is_final=True) + b'\x00\x00\x00\x00'
+
+
+class Lz4FrameDecompressor(Decompressor):
+    """Распаковщик LZ4 frame на основе пакета lz4."""
+
+    def __init__(self) -> None:
+        self._decompressor = lz4_frame.LZ4FrameDecompressor()
+
+    def decompress(self, data: bytes) -> Iterator[bytes]:
+        while data:
+            if self._decompressor.eof:
+                # После окончания кадра может начинаться следующий
+                data = self._decompressor.unused_data + data if self._decompressor.unused_data else data
+                self._decompressor = lz4_frame.LZ4FrameDecompressor()
+
+            decompressed = self._decompressor.decompress(data)
+            data = self._decompressor.unused_data if self._decompressor.eof else b''
+            if decompressed:
+                yield decompressed
+
+
+class Lz4FrameCompressor(Compressor):
+    """Упаковщик LZ4 frame на основе пакета lz4."""
+
+    def __init__(self, level: Optional[int] = None) -> None:
+        self._compressor = lz4_frame.LZ4FrameCompressor(compression_level=level or 0)
+        self._header = self._compressor.begin()
+
+    def compress(self, data: bytes) -> bytes:
+        header, self._header = self._header, b''
+        return header + self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        header, self._header = self._header, b''
+        return header + self._compressor.flush()
+
+
+class StdlibZstdDecompressor(Decompressor):
+    """Распаковщик zstd на основе модуля compression.zstd стандартной библиотеки."""
+
+    def __init__(self) -> None:
+        self._decompressor = stdlib_zstd.ZstdDecompressor()
+
+    def decompress(self, data: bytes) -> Iterator[bytes]:
+        while True:
+            if self._decompressor.eof:
+                # После окончания кадра может начинаться следующий
+                data = self._decompressor.unused_data + data
+                if not data:
+                    return
+
+                self._decompressor = stdlib_zstd.ZstdDecompressor()
+
+            decompressed = self._decompressor.decompress(data, DECOMPRESS_CHUNK_SIZE)
+            data = b''
+            if decompressed:
+                yield decompressed
+
+            if self._decompressor.needs_input and not self._decompressor.eof:
+                return
+
+
+class StdlibZstdCompressor(Compressor):
+    """Упаковщик zstd на основе модуля compression.zstd стандартной библиотеки."""
+
+    def __init__(self, level: Optional[int] = None) -> None:
+        self._compressor = stdlib_zstd.ZstdCompressor(level=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+class ZstandardDecompressor(Decompressor):
+    """Распаковщик zstd на основе пакета zstandard."""
+
+    def __init__(self) -> None:
+        self._decompressor = zstandard.ZstdDecompressor().decompressobj()
+
+    def decompress(self, data: bytes) -> Iterator[bytes]:
+        while data:
+            decompressed = self._decompressor.decompress(data)
+            data = b''
+            if self._decompressor.eof:
+                data = self._decompressor.unused_data
+                self._decompressor = zstandard.ZstdDecompressor().decompressobj()
+
+            if decompressed:
+                yield decompressed
+
+
+class ZstandardCompressor(Compressor):
+    """Упаковщик zstd на основе пакета zstandard."""
+
+    def __init__(self, level: Optional[int] = None) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_DEFAULT_LEVEL if level is None else level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+CODECS: Dict[str, Codec] = {
+    'none': Codec('none', PassthroughDecompressor, PassthroughCompressor),
+    'zlib': Codec('zlib', ZlibDecompressor, ZlibCompressor),
+    'lz4': Codec(
+        'lz4',
+        Lz4FrameDecompressor if lz4_frame else PyLz4Decompressor,
+        Lz4FrameCompressor if lz4_frame else PyLz4Compressor,
+    ),
+}
+if stdlib_zstd is not None:
+    CODECS['zstd'] = Codec('zstd', StdlibZstdDecompressor, StdlibZstdCompressor)
+elif zstandard is not None:  # pragma: no cover - зависит от окружения
+    CODECS['zstd'] = Codec('zstd', ZstandardDecompressor, ZstandardCompressor)
+
+CODEC_REQUIREMENTS = {'zstd': 'Python 3.14+ (compression.zstd) or the zstandard package'}
+
+
+def get_codec(name: str) -> Codec:
+    """
+    Метод для получения кодека по названию алгоритма сжатия.
+    :param name: название алгоритма
+    :return: кодек
+    """
+    codec = CODECS.get(name)
+    if codec is None:
+        requirement = CODEC_REQUIREMENTS.get(name)
+        msg = (
+            f'Compression method {name} requires {requirement}.'
+            if requirement
+            else f'Unsupported compression method {name}.'
+        )
+        raise ValueError(msg)
+
+    return codec
+
+
+class DecompressingReader:
+    """Чтение распакованных данных из сжатого потока."""
+
+    def __init__(self, stream: BinaryIO, codec: Codec, read_size: int = DECOMPRESS_CHUNK_SIZE) -> None:
+        """
+        Метод инициализации класса.
+        :param stream: сжатый поток
+        :param codec: кодек
+        :param read_size: размер чтения сжатых данных
+        """
+        self._stream = stream
+        self._decompressor = codec.create_decompressor()
+        self._read_size = read_size
+        self._pieces: Iterator[bytes] = iter(())
+        self._is_finished = False
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Чтение следующей порции распакованных данных.
+        :param size: не используется, размер порции определяется распаковщиком
+        :return: распакованные данные (пустые байты при окончании потока)
+        """
+        while not self._is_finished:
+            piece = next(self._pieces, None)
+            if piece:
+                return piece
+
+            data = self._stream.read(self._read_size)
+            if not data:
+                self._is_finished = True
+                return self._decompressor.flush()
+
+            self._pieces = self._decompressor.decompress(data)
+
+        return b''
+
+    def close(self) -> None:
+        """Закрытие потока."""
+        self._stream.close()
+
+    def __enter__(self) -> 'DecompressingReader':
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+class CompressingWriter:
+    """Запись данных в поток со сжатием."""
+
+    def __init__(self, stream: BinaryIO, codec: Codec, level: Optional[int] = None) -> None:
+        """
+        Метод инициализации класса.
+        :param stream: поток для записи сжатых данных
+        :param codec: кодек
+        :param level: уровень сжатия
+        """
+        self._stream = stream
+        self._compressor = codec.create_compressor(level)
+
+    def write(self, data: bytes) -> int:
+        """
+        Сжатие и запись данных.
+        :param data: данные
+        :return: количество принятых байт
+        """
+        self._stream.write(self._compressor.compress(data))
+        return len(data)
+
+    def close(self) -> None:
+        """Завершение сжатия и закрытие потока."""
+        self._stream.write(self._compressor.flush())
+        self._stream.close()
+
+    def __enter__(self) -> 'CompressingWriter':
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
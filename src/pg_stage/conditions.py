@@ -0,0 +1,146 @@
+import re
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from typing_extensions import TypeGuard
+
+from pg_stage.types import ConditionGroupType, ConditionType, ConditionTypeMany
+
+# Значение NULL в данных COPY
+NULL_VALUE = '\\N'
+
+# Предикат строки: принимает значения строки из дампа
+Predicate = Callable[[List[str]], bool]
+
+
+def compile_conditions(conditions: ConditionTypeMany, column_indexes: Dict[str, int]) -> Optional[Predicate]:
+    """
+    Компиляция условий мутации в один предикат строки.
+    Условия списка объединяются по ИЛИ; группа {"all": [...]} выполняется, если выполнены все ее условия,
+    группа {"any": [...]} - если выполнено хотя бы одно. Группы могут быть вложенными.
+    :param conditions: условия мутации
+    :param column_indexes: индексы колонок таблицы по названию
+    :return: предикат или None, если условий нет (мутация применяется всегда)
+    """
+    if not conditions:
+        return None
+
+    return _compile_group(conditions, column_indexes, is_all=False)
+
+
+def iter_condition_columns(conditions: ConditionTypeMany) -> Iterator[str]:
+    """
+    Названия колонок, значения которых читают условия (включая вложенные группы).
+    :param conditions: условия мутации
+    :return: итератор названий колонок
+    """
+    for condition in conditions:
+        if _is_condition_group(condition):
+            yield from iter_condition_columns(condition['all'] if 'all' in condition else condition['any'])
+        elif _is_condition_operation(condition):
+            yield condition['column_name']
+
+
+def _is_condition_group(condition: Union[ConditionType, ConditionGroupType]) -> TypeGuard[ConditionGroupType]:
+    """
+    Проверка, что условие - группа условий.
+    :param condition: условие
+    :return: True, если задан ключ all или any
+    """
+    return 'all' in condition or 'any' in condition
+
+
+def _is_condition_operation(condition: Union[ConditionType, ConditionGroupType]) -> TypeGuard[ConditionType]:
+    """
+    Проверка, что условие - операция над значением колонки.
+    :param condition: условие
+    :return: True, если задана колонка
+    """
+    return 'column_name' in condition
+
+
+def _compile_group(conditions: ConditionTypeMany, column_indexes: Dict[str, int], *, is_all: bool) -> Predicate:
+    """
+    Компиляция группы условий.
+    :param conditions: условия группы
+    :param column_indexes: индексы колонок таблицы по названию
+    :param is_all: группа выполняется, только если выполнены все условия (иначе - хотя бы одно)
+    :return: предикат
+    """
+    predicates: Tuple[Predicate, ...] = tuple(_compile_condition(item, column_indexes) for item in conditions)
+    if len(predicates) == 1:
+        return predicates[0]
+
+    if is_all:
+
+        def predicate(values: List[str]) -> bool:
+            for item in predicates:
+                if not item(values):
+                    return False
+
+            return True
+
+    else:
+
+        def predicate(values: List[str]) -> bool:
+            for item in predicates:
+                if item(values):
+                    return True
+
+            return False
+
+    return predicate
+
+
+def _compile_condition(
+    condition: Union[ConditionType, ConditionGroupType],
+    column_indexes: Dict[str, int],
+) -> Predicate:
+    """
+    Компиляция одного условия или вложенной группы.
+    :param condition: условие
+    :param column_indexes: индексы колонок таблицы по названию
+    :return: предикат
+    """
+    if _is_condition_group(condition):
+        if 'all' in condition:
+            return _compile_group(condition['all'], column_indexes, is_all=True)
+
+        return _compile_group(condition['any'], column_indexes, is_all=False)
+
+    if not _is_condition_operation(condition):
+        msg = 'Condition must have a column_name or an all/any group.'
+        raise ValueError(msg)
+
+    index = column_indexes[condition['column_name']]
+    operation = condition['operation']
+    value = condition.get('value')
+    if operation == 'equal':
+        return lambda values: values[index] == value
+
+    if operation == 'not_equal':
+        return lambda values: values[index] != value
+
+    if operation == 'by_pattern':
+        if not isinstance(value, str):
+            msg = 'Condition value for "by_pattern" must be a string.'
+            raise ValueError(msg)
+
+        search = re.compile(value).search
+        return lambda values: search(values[index]) is not None
+
+    if operation in ('in', 'not_in'):
+        if not isinstance(value, list):
+            msg = f'Condition value for "{operation}" must be a list.'
+            raise ValueError(msg)
+
+        choices = frozenset(NULL_VALUE if item is None else str(item) for item in value)
+        if operation == 'in':
+            return lambda values: values[index] in choices
+
+        return lambda values: values[index] not in choices
+
+    if operation == 'is_null':
+        return lambda values: values[index] == NULL_VALUE
+
+    msg = 'Invalid condition operation.'
+    raise ValueError(msg)
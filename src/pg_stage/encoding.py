@@ -0,0 +1,63 @@
+from typing import Dict
+
+# Соответствие кодировок PostgreSQL кодекам Python
+PG_ENCODINGS: Dict[str, str] = {
+    'UTF8': 'utf-8',
+    'SQL_ASCII': 'latin-1',
+    'LATIN1': 'iso8859-1',
+    'LATIN2': 'iso8859-2',
+    'LATIN3': 'iso8859-3',
+    'LATIN4': 'iso8859-4',
+    'LATIN5': 'iso8859-9',
+    'LATIN6': 'iso8859-10',
+    'LATIN7': 'iso8859-13',
+    'LATIN8': 'iso8859-14',
+    'LATIN9': 'iso8859-15',
+    'LATIN10': 'iso8859-16',
+    'ISO_8859_5': 'iso8859-5',
+    'ISO_8859_6': 'iso8859-6',
+    'ISO_8859_7': 'iso8859-7',
+    'ISO_8859_8': 'iso8859-8',
+    'WIN866': 'cp866',
+    'WIN874': 'cp874',
+    'WIN1250': 'cp1250',
+    'WIN1251': 'cp1251',
+    'WIN1252': 'cp1252',
+    'WIN1253': 'cp1253',
+    'WIN1254': 'cp1254',
+    'WIN1255': 'cp1255',
+    'WIN1256': 'cp1256',
+    'WIN1257': 'cp1257',
+    'WIN1258': 'cp1258',
+    'KOI8R': 'koi8-r',
+    'KOI8U': 'koi8-u',
+    'EUC_JP': 'euc_jp',
+    'EUC_KR': 'euc_kr',
+    'EUC_CN': 'gb2312',
+    'EUC_JIS_2004': 'euc_jis_2004',
+    'SJIS': 'shift_jis',
+    'SHIFT_JIS_2004': 'shift_jis_2004',
+    'BIG5': 'big5',
+    'GBK': 'gbk',
+    'GB18030': 'gb18030',
+    'UHC': 'cp949',
+    'JOHAB': 'johab',
+}
+
+# Обработчик ошибок, позволяющий без потерь вернуть исходные байты невалидных последовательностей
+DECODE_ERRORS = 'surrogateescape'
+
+
+def get_python_encoding(pg_encoding: str) -> str:
+    """
+    Метод для получения кодека Python по названию кодировки PostgreSQL.
+    :param pg_encoding: кодировка PostgreSQL (например, WIN1251)
+    :return: название кодека Python
+    """
+    normalized = pg_encoding.strip().upper().replace('-', '_')
+    python_encoding = PG_ENCODINGS.get(normalized) or PG_ENCODINGS.get(normalized.replace('_', ''))
+    if python_encoding is None:
+        msg = f'Unsupported client encoding {pg_encoding}.'
+        raise ValueError(msg)
+
+    return python_encoding
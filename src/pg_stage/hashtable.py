@@ -0,0 +1,198 @@
+from array import array
+from typing import Optional
+
+INITIAL_CAPACITY = 1024  # начальное количество ячеек (степень двойки)
+_EMPTY = -1  # значение свободной ячейки
+_MAX_VALUE = 2**31 - 1
+
+
+class HashTable:
+    """
+    Таблица с открытой адресацией (линейное пробирование): 128-битный хеш ключа -> целое число от 0 до 2^31 - 1.
+    Хеш хранится двумя знаковыми 64-битными половинами: первая выбирает ячейку, вторая сверяется при поиске,
+    поэтому совпадение первой половины у разных ключей не объединяет их.
+    Ячейки лежат в трех массивах array без объектов Python на запись: 20 байт на ячейку,
+    при заполнении до 3/4 перед удвоением - 27-53 байта на ключ.
+    """
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY) -> None:
+        """
+        Метод инициализации класса.
+        :param capacity: начальное количество ячеек (округляется до степени двойки)
+        """
+        self._size = 0
+        self._allocate(1 << max(3, (capacity - 1).bit_length()))
+
+    def __len__(self) -> int:
+        """Количество ключей в таблице."""
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """Количество ячеек таблицы."""
+        return len(self._values)
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Создание пустых массивов ячеек.
+        :param capacity: количество ячеек (степень двойки)
+        """
+        self._mask = capacity - 1
+        self._keys = array('q', bytes(8 * capacity))
+        self._checks = array('q', bytes(8 * capacity))
+        self._values = array('i', [_EMPTY]) * capacity
+
+    def _find_slot(self, key: int, check: int) -> int:
+        """
+        Поиск ячейки ключа или свободной ячейки, в которую его можно записать.
+        :param key: первая половина хеша
+        :param check: вторая половина хеша
+        :return: индекс ячейки
+        """
+        keys = self._keys
+        checks = self._checks
+        values = self._values
+        mask = self._mask
+        index = key & mask
+        while values[index] != _EMPTY:
+            if keys[index] == key and checks[index] == check:
+                return index
+
+            index = (index + 1) & mask
+
+        return index
+
+    def get(self, key: int, check: int) -> Optional[int]:
+        """
+        Получение значения ключа.
+        :param key: первая половина хеша
+        :param check: вторая половина хеша
+        :return: значение или None, если ключа нет
+        """
+        keys = self._keys
+        checks = self._checks
+        values = self._values
+        mask = self._mask
+        index = key & mask
+        value = values[index]
+        while value != _EMPTY:
+            if keys[index] == key and checks[index] == check:
+                return value
+
+            index = (index + 1) & mask
+            value = values[index]
+
+        return None
+
+    def set(self, key: int, check: int, value: int) -> None:
+        """
+        Запись значения ключа (существующее значение заменяется).
+        :param key: первая половина хеша
+        :param check: вторая половина хеша
+        :param value: значение от 0 до 2^31 - 1
+        """
+        if not 0 <= value <= _MAX_VALUE:
+            message = f'Hash table value out of range: {value}'
+            raise ValueError(message)
+
+        index = self._find_slot(key, check)
+        if self._values[index] == _EMPTY:
+            self._keys[index] = key
+            self._checks[index] = check
+            self._size += 1
+
+        self._values[index] = value
+        if self._size * 4 > self.capacity * 3:
+            self._grow()
+
+    def clear(self) -> None:
+        """Удаление всех ключей с возвратом памяти."""
+        self._size = 0
+        self._allocate(INITIAL_CAPACITY)
+
+    def _grow(self) -> None:
+        """Удвоение количества ячеек с переносом ключей."""
+        keys, checks, values = self._keys, self._checks, self._values
+        self._allocate(2 * len(values))
+        for index, value in enumerate(values):
+            if value != _EMPTY:
+                slot = self._find_slot(keys[index], checks[index])
+                self._keys[slot] = keys[index]
+                self._checks[slot] = checks[index]
+                self._values[slot] = value
+
+
+class HashSet:
+    """
+    Множество 64-битных хешей с открытой адресацией (линейное пробирование) в одном массиве array('q'):
+    8 байт на ячейку, при заполнении до 3/4 перед удвоением - 11-21 байт на хеш.
+    Ноль обозначает свободную ячейку, поэтому хеш 0 хранится как 1.
+    """
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY) -> None:
+        """
+        Метод инициализации класса.
+        :param capacity: начальное количество ячеек (округляется до степени двойки)
+        """
+        self._size = 0
+        self._allocate(1 << max(3, (capacity - 1).bit_length()))
+
+    def __len__(self) -> int:
+        """Количество хешей в множестве."""
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """Количество ячеек множества."""
+        return len(self._keys)
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Создание пустого массива ячеек.
+        :param capacity: количество ячеек (степень двойки)
+        """
+        self._mask = capacity - 1
+        self._keys = array('q', bytes(8 * capacity))
+
+    def add(self, key: int) -> bool:
+        """
+        Добавление хеша.
+        :param key: знаковое 64-битное число
+        :return: True, если хеша еще не было в множестве
+        """
+        key = key or 1
+        keys = self._keys
+        mask = self._mask
+        index = key & mask
+        current = keys[index]
+        while current:
+            if current == key:
+                return False
+
+            index = (index + 1) & mask
+            current = keys[index]
+
+        keys[index] = key
+        self._size += 1
+        if self._size * 4 > self.capacity * 3:
+            self._grow()
+
+        return True
+
+    def clear(self) -> None:
+        """Удаление всех хешей с возвратом памяти."""
+        self._size = 0
+        self._allocate(INITIAL_CAPACITY)
+
+    def _grow(self) -> None:
+        """Удвоение количества ячеек с переносом хешей."""
+        old_keys = self._keys
+        self._allocate(2 * len(old_keys))
+        keys = self._keys
+        mask = self._mask
+        for key in old_keys:
+            if key:
+                index = key & mask
+                while keys[index]:
+                    index = (index + 1) & mask
+                keys[index] = key
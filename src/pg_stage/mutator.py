@@ -1,20 +1,39 @@
+import calendar
 import datetime
 import hashlib
 import hmac
+import math
+import os
 import random
+import string
 import uuid
+from itertools import repeat
 from os import environ
-from typing import Any, Callable, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from mimesis import Address, Datetime, Internet, Numbers, Person
 from mimesis.builtins import RussiaSpecProvider
+from mimesis.random import Random
+
+from pg_stage.permutation import FeistelPermutation
+from pg_stage.pools import ValuePool
+from pg_stage.uniqueness import HashedScope, UniqueScope
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - зависит от окружения
+    numpy = None
+
+# Таблицы установки версии (4) и варианта (RFC 4122) в байтах uuid
+_UUID_VERSION_TABLE = bytes((byte & 0x0F) | 0x40 for byte in range(256))
+_UUID_VARIANT_TABLE = bytes((byte & 0x3F) | 0x80 for byte in range(256))
 
 
 class Mutator:
     """Класс с описанием основных методов для мутации значений полей."""
 
     min_value_smallint = -32768
-    max_value_smallint = -32767
+    max_value_smallint = 32767
     min_value_integer = -2147483648
     max_value_integer = 2147483647
     min_value_bigint = -9223372036854775808
@@ -25,22 +44,34 @@ class Mutator:
     max_value_serial = 2147483647
     min_value_bigserial = 1
     max_value_bigserial = 9223372036854775807
+    # Мутации, результат которых не зависит от строки и может быть вычислен один раз
+    constant_mutations = frozenset({'null', 'empty_string', 'fixed_value'})
+    # Целочисленные типы мутаций numeric_* с границами min_value_*/max_value_*
+    integer_types = ('smallint', 'integer', 'bigint', 'smallserial', 'serial', 'bigserial')
 
     def __init__(
         self,
         locale: str = 'en',
-        secret_key: Optional[str] = environ.get('SECRET_KEY'),
-        secret_key_nonce: Optional[str] = environ.get('SECRET_KEY_NONCE'),
+        secret_key: Optional[str] = None,
+        secret_key_nonce: Optional[str] = None,
+        *,
+        deterministic: bool = False,
+        pool_size: int = 0,
+        pool_refresh: Optional[int] = None,
     ) -> None:
         """
         Метод инициализации класса.
         :param locale: локализация для Faker
-        :param secret_key: Секретный ключ для детерминированной обфускации
-        :param secret_key_nonce: Одноразовый секретный ключ (соль)
+        :param secret_key: Секретный ключ для детерминированной обфускации (по умолчанию SECRET_KEY из окружения)
+        :param secret_key_nonce: Одноразовый секретный ключ (соль, по умолчанию SECRET_KEY_NONCE из окружения)
+        :param deterministic: выбирать результат мутаций по HMAC исходного значения вместо случайного состояния
+        :param pool_size: размер пулов заранее сгенерированных имен, фамилий, email и адресов (0 - без пулов)
+        :param pool_refresh: количество значений, после выдачи которых пул генерируется заново
+            (None - не обновлять; в детерминированном режиме пулы не обновляются)
         """
         self._locale = locale
-        self._secret_key = secret_key
-        self._secret_key_nonce = secret_key_nonce
+        self._secret_key = secret_key or environ.get('SECRET_KEY')
+        self._secret_key_nonce = secret_key_nonce or environ.get('SECRET_KEY_NONCE')
         self._is_russian_locale = locale == 'ru'
         self._person = Person(locale=self._locale)
         self._address = Address(locale=self._locale)
@@ -52,12 +83,293 @@ class Mutator:
         self._now = datetime.datetime.now()
         self._today = self._now.date()
         self._cache = {}  # type: ignore
-        self._unique_values = set()  # type: ignore
+        self._unique_values: UniqueScope = HashedScope()
+        self.pool_size = pool_size
+        self.pool_refresh = pool_refresh
+        self._pools: Dict[str, ValuePool] = {}
+        self._pool_factories: Dict[str, Callable[[], str]] = {
+            'first_name': self._person.name,
+            'last_name': self._person.surname,
+            'email': self._person.email,
+            'address': self._address.address,
+        }
+        self._numpy_random = numpy.random.default_rng() if numpy is not None else None
+        self.deterministic = deterministic
+        self._random: Any = random
+        # Ключ колонки, исходное значение и его HMAC текущей детерминированной мутации (см. seed_by_value)
+        self._seed_key: Optional[str] = None
+        self._seed_value: Optional[str] = None
+        self._seed_digest = 0
+        self._permutations: Dict[Any, FeistelPermutation] = {}
+        if deterministic:
+            self._hmac_key = self._get_hmac_key()
+            # Все генераторы используют один экземпляр, который перед каждой мутацией инициализируется HMAC значения
+            self._random = Random()
+            for provider in (
+                self._person,
+                self._address,
+                self._datetime,
+                self._internet,
+                self._numeric,
+                self._russian_provider,
+            ):
+                provider.random = self._random
+
+    def _get_hmac_key(self) -> bytes:
+        """
+        Метод для получения ключа HMAC детерминированной обфускации.
+        :return: ключ
+        """
+        if not self._secret_key:
+            msg_secret_key = 'Environment variable SECRET_KEY not set'  # nosec B105
+            raise ValueError(msg_secret_key)
+
+        if not self._secret_key_nonce:
+            msg_secret_key_nonce = 'Environment variable SECRET_KEY_NONCE not set'  # nosec B105
+            raise ValueError(msg_secret_key_nonce)
+
+        return f'{self._secret_key_nonce}{self._secret_key}'.encode()
+
+    def seed_by_value(self, *, key: str, value: Optional[str]) -> None:
+        """
+        Метод для инициализации генератора случайных чисел HMAC ключа колонки и исходного значения.
+        Одинаковые значения дают одинаковый результат мутации в любых таблицах, запусках и процессах.
+        :param key: ключ колонки (мутация и ее параметры)
+        :param value: исходное значение
+        """
+        self._seed_key = key
+        self._seed_value = value
+        self._seed_digest = int.from_bytes(self._hmac_digest(key=key, value=value), byteorder='big')
+        self._random.seed(self._seed_digest)
+
+    def _hmac_digest(self, *, key: str, value: Any) -> bytes:
+        """
+        Метод для получения HMAC ключа колонки и значения.
+        :param key: ключ колонки (мутация и ее параметры)
+        :param value: значение
+        :return: HMAC-SHA256
+        """
+        message = f'{key}\x00{value}'.encode('utf-8', 'surrogateescape')
+        return hmac.new(key=self._hmac_key, msg=message, digestmod=hashlib.sha256).digest()
+
+    def make_deterministic(self, func: Callable[..., Optional[str]], *, key: str) -> Callable[..., Optional[str]]:
+        """
+        Метод для получения мутации, результат которой определяется исходным значением.
+        :param func: функция мутации
+        :param key: ключ колонки (мутация и ее параметры)
+        :return: функция мутации
+        """
+
+        def mutation(**kwargs: Any) -> Optional[str]:
+            self.seed_by_value(key=key, value=kwargs.get('current_value'))
+            return func(**kwargs)
+
+        return mutation
+
+    def make_unique_scoped(
+        self,
+        func: Callable[..., Optional[str]],
+        *,
+        scope: UniqueScope,
+    ) -> Callable[..., Optional[str]]:
+        """
+        Метод для получения мутации, уникальные значения которой проверяются в отдельной области (колонке).
+        :param func: функция мутации
+        :param scope: область уникальности
+        :return: функция мутации
+        """
+
+        def mutation(**kwargs: Any) -> Optional[str]:
+            previous_scope = self._unique_values
+            self._unique_values = scope
+            try:
+                return func(**kwargs)
+            finally:
+                self._unique_values = previous_scope
+
+        return mutation
 
     def clear_unique_values(self) -> None:
         """Метод для сброса уникальных значений."""
         self._unique_values.clear()
 
+    def mutate_batch(self, mutation_name: str, count: int, **kwargs: Any) -> List[str]:
+        """
+        Метод для генерации нескольких значений мутации за один вызов.
+        Целые числа, даты, uuid4, строки по маске и значения пулов генерируются сразу для всего списка
+        (с NumPy, если он установлен), остальные мутации вызываются для каждого значения.
+        :param mutation_name: название мутации
+        :param count: количество значений
+        :param kwargs: параметры мутации
+        :return: список значений
+        """
+        if self.deterministic:
+            msg = 'Batch mutations are not supported in deterministic mode.'
+            raise ValueError(msg)
+
+        if count < 0:
+            msg = 'The number of values must not be negative.'
+            raise ValueError(msg)
+
+        integer_type = mutation_name[len('numeric_') :] if mutation_name.startswith('numeric_') else None
+        if integer_type in self.integer_types:
+            return self._batch_integer(integer_type, count, **kwargs)
+
+        if self.pool_size and mutation_name in self._pool_factories:
+            factory = self._pool_factories[mutation_name]
+            return self._batch_pooled(mutation_name, factory, count, unique=bool(kwargs.get('unique')))
+
+        batch_funcs = {
+            'date': self._batch_date,
+            'uuid4': self._batch_uuid4,
+            'string_by_mask': self._batch_string_by_mask,
+        }
+        if mutation_name in batch_funcs:
+            return batch_funcs[mutation_name](count, **kwargs)
+
+        mutation_func = getattr(self, f'mutation_{mutation_name}', None)
+        if not mutation_func:
+            msg = f'Not found mutation {mutation_name}.'
+            raise ValueError(msg)
+
+        return [mutation_func(**kwargs) for _ in range(count)]
+
+    def _batch_integer(self, integer_type: str, count: int, **kwargs: Any) -> List[str]:
+        """
+        Метод для генерации списка целых чисел.
+        :param integer_type: тип числа
+        :param count: количество значений
+        :param kwargs: параметры мутации numeric_*
+        :return: список чисел
+        """
+        start, end = self._get_integer_range(integer_type, kwargs)
+        if kwargs.get('unique'):
+            return [str(self._unique_integer(start=start, end=end)) for _ in range(count)]
+
+        if self._numpy_random is not None:
+            values = self._numpy_random.integers(start, end, size=count, dtype=numpy.int64, endpoint=True)
+            return list(map(str, values.tolist()))
+
+        randint = self._random.randint
+        return [str(randint(start, end)) for _ in range(count)]
+
+    def _batch_date(self, count: int, **kwargs: Any) -> List[str]:
+        """
+        Метод для генерации списка дат: год, месяц и день выбираются так же, как в mimesis.Datetime.date.
+        :param count: количество значений
+        :param kwargs: параметры мутации date
+        :return: список дат
+        """
+        if kwargs.get('unique'):
+            return [self.mutation_date(**kwargs) for _ in range(count)]
+
+        start: int = kwargs.get('start', self._now.year - 1)
+        end: int = kwargs.get('end', self._now.year)
+        date_format: str = kwargs.get('date_format', '%Y-%m-%d')
+        if self._numpy_random is None:
+            random_value = self._random.random
+            years_count = end - start + 1
+            month_lengths = {
+                year: [0, *(calendar.monthrange(year, month)[1] for month in range(1, 13))]
+                for year in range(start, end + 1)
+            }
+
+            dates = []
+            for _ in range(count):
+                year = start + int(random_value() * years_count)
+                month = 1 + int(random_value() * 12)
+                day = 1 + int(random_value() * month_lengths[year][month])
+                dates.append(datetime.date(year, month, day))
+
+            if date_format == '%Y-%m-%d':
+                return [value.isoformat() for value in dates]
+
+            return [value.strftime(date_format) for value in dates]
+
+        years = self._numpy_random.integers(start, end, size=count, endpoint=True)
+        months = ((years - 1970) * 12 + self._numpy_random.integers(0, 12, size=count)).astype('datetime64[M]')
+        month_starts = months.astype('datetime64[D]')
+        month_days = ((months + 1).astype('datetime64[D]') - month_starts).astype(numpy.int64)
+        days = (self._numpy_random.random(count) * month_days).astype(numpy.int64)
+        date_values = month_starts + days.astype('timedelta64[D]')
+        if date_format == '%Y-%m-%d':
+            return numpy.datetime_as_string(date_values, unit='D').tolist()
+
+        return [value.strftime(date_format) for value in date_values.astype(object)]
+
+    @staticmethod
+    def _batch_uuid4(count: int, **_: Any) -> List[str]:
+        """
+        Метод для генерации списка uuid4 из одного блока случайных байт.
+        :param count: количество значений
+        :param _: параметры мутации - не используются
+        :return: список строк uuid4
+        """
+        data = bytearray(os.urandom(16 * count))
+        data[6::16] = data[6::16].translate(_UUID_VERSION_TABLE)
+        data[8::16] = data[8::16].translate(_UUID_VARIANT_TABLE)
+        hex_data = data.hex()
+        return [
+            f'{hex_data[i : i + 8]}-{hex_data[i + 8 : i + 12]}-{hex_data[i + 12 : i + 16]}-'
+            f'{hex_data[i + 16 : i + 20]}-{hex_data[i + 20 : i + 32]}'
+            for i in range(0, len(hex_data), 32)
+        ]
+
+    def _batch_string_by_mask(self, count: int, **kwargs: Any) -> List[str]:
+        """
+        Метод для генерации списка строк по маске: символы каждой позиции маски выбираются сразу для всего списка.
+        :param count: количество значений
+        :param kwargs: параметры мутации string_by_mask
+        :return: список строк
+        """
+        mask = kwargs['mask']
+        char = kwargs.get('char', '@')
+        digit = kwargs.get('digit', '#')
+        if kwargs.get('unique'):
+            return [self._unique_string_by_mask(mask=mask, char=char, digit=digit) for _ in range(count)]
+
+        if char == digit:
+            msg = 'The same placeholder cannot be used for both numbers and characters'
+            raise ValueError(msg)
+
+        choices = self._random.choices
+        columns = []
+        for symbol in mask:
+            if symbol == char:
+                columns.append(choices(string.ascii_uppercase, k=count))
+            elif symbol == digit:
+                columns.append(choices(string.digits, k=count))
+            else:
+                columns.append(repeat(symbol, count))
+
+        if not columns:
+            return [''] * count
+
+        return [''.join(row) for row in zip(*columns)]
+
+    def _batch_pooled(self, name: str, factory: Callable[[], str], count: int, *, unique: bool) -> List[str]:
+        """
+        Метод для получения списка значений из пула.
+        :param name: название пула
+        :param factory: функция генерации одного значения
+        :param count: количество значений
+        :param unique: выбрать значения, которые еще не встречались
+        :return: список значений
+        """
+        if unique:
+            return [self._pooled_value(name, factory, unique=True) for _ in range(count)]
+
+        pool = self._get_pool(name, factory)
+        pool.draws += count
+        size = len(pool)
+        if self._numpy_random is not None:
+            indexes = self._numpy_random.integers(0, size, size=count).tolist()
+        else:
+            random_value = self._random.random
+            indexes = [int(random_value() * size) for _ in range(count)]
+
+        return [pool[index] for index in indexes]
+
     def _generate_unique_value(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
         """Метод для генерации уникального значения."""
         counter = 0
@@ -67,18 +379,183 @@ class Mutator:
                 raise RecursionError(msg)
 
             value = func(*args, **kwargs)
-            if value not in self._unique_values:
-                self._unique_values.add(value)
+            if self._unique_values.add(value):
                 break
 
             counter += 1
 
         return value
 
-    @staticmethod
-    def _random_int(a: int, b: int) -> int:
+    def _unique_index(self, key: Any, size: int, *, start: Optional[int] = None) -> int:
+        """
+        Метод для получения следующей позиции ключевой перестановки текущей области уникальности.
+        Позиции не повторяются по построению, поэтому повторные попытки генерации не нужны.
+        :param key: ключ последовательности (вид значений и диапазон)
+        :param size: количество возможных значений
+        :param start: начало диапазона целых чисел (в детерминированном режиме исходное число из диапазона
+            используется как позиция перестановки)
+        :return: позиция в отрезке [0, size)
+        """
+        if self.deterministic and self._seed_key is not None:
+            return self._deterministic_unique_index(key, size, start=start)
+
+        sequence = self._unique_values.sequences.get(key)
+        if sequence is None:
+            sequence = iter(FeistelPermutation(size, key=self._random.getrandbits(64)))
+            self._unique_values.sequences[key] = sequence
+
+        try:
+            return next(sequence)
+        except StopIteration:
+            msg = 'All unique values of the range are used!'
+            raise RecursionError(msg) from None
+
+    def _deterministic_unique_index(self, key: Any, size: int, *, start: Optional[int]) -> int:
+        """
+        Метод для получения позиции перестановки по исходному значению детерминированной мутации.
+        Перестановка задается HMAC ключа колонки, а позиция в ней - исходным значением: само число, если это целое
+        из диапазона (тогда разные значения всегда получают разные позиции), иначе HMAC значения. Если позиция уже
+        выдана другому значению (совпадение HMAC по модулю размера), берется следующая.
+        :param key: ключ последовательности (вид значений и диапазон)
+        :param size: количество возможных значений
+        :param start: начало диапазона целых чисел
+        :return: позиция в отрезке [0, size)
+        """
+        permutation_key = (self._seed_key, key)
+        permutation = self._permutations.get(permutation_key)
+        if permutation is None:
+            digest = self._hmac_digest(key=f'permutation\x00{self._seed_key}', value=key)
+            permutation = FeistelPermutation(size, key=int.from_bytes(digest[:8], byteorder='big'))
+            self._permutations[permutation_key] = permutation
+
+        index = -1
+        if start is not None:
+            try:
+                index = int(str(self._seed_value)) - start
+            except ValueError:
+                index = -1
+
+        if not 0 <= index < size:
+            index = self._seed_digest % size
+
+        for _ in range(size):
+            position = permutation[index]
+            if self._unique_values.add(('position', key, position)):
+                return position
+
+            index = index + 1 if index + 1 < size else 0
+
+        msg = 'All unique values of the range are used!'
+        raise RecursionError(msg)
+
+    def _unique_integer(self, *, start: int, end: int) -> int:
+        """
+        Метод для генерации уникального целого числа из отрезка [start, end].
+        :param start: минимальное значение
+        :param end: максимальное значение
+        :return: число
+        """
+        return start + self._unique_index(('integer', start, end), end - start + 1, start=start)
+
+    def _unique_string_by_mask(self, mask: str, char: str = '@', digit: str = '#') -> str:
+        """
+        Метод для генерации уникальной строки по маске: позиция перестановки записывается в маску
+        как число со смешанным основанием (26 для символов, 10 для цифр).
+        :param mask: маска
+        :param char: маска символов
+        :param digit: маска цифр
+        :return: строка
+        """
+        char_code = ord(char)
+        digit_code = ord(digit)
+        if char_code == digit_code:
+            msg = 'The same placeholder cannot be used for both numbers and characters'
+            raise ValueError(msg)
+
+        code = bytearray(mask.encode())
+        # Позиции маски с кодом первого символа и количеством вариантов: A-Z или 0-9
+        placeholders = []
+        for i, p in enumerate(code):
+            if p == char_code:
+                placeholders.append((i, 65, 26))
+            elif p == digit_code:
+                placeholders.append((i, 48, 10))
+
+        index = self._unique_index(('mask', mask, char, digit), math.prod(radix for _, _, radix in placeholders))
+        for i, base, radix in reversed(placeholders):
+            index, offset = divmod(index, radix)
+            code[i] = base + offset
+
+        return code.decode()
+
+    def _get_pool(self, name: str, factory: Callable[[], str]) -> ValuePool:
+        """
+        Метод для получения пула значений: пул генерируется при первом обращении и после pool_refresh выдач.
+        :param name: название пула
+        :param factory: функция генерации одного значения
+        :return: пул значений
+        """
+        pool = self._pools.get(name)
+        if pool is not None and (self.deterministic or not self.pool_refresh or pool.draws < self.pool_refresh):
+            return pool
+
+        generation = pool.generation + 1 if pool is not None else 0
+        if self.deterministic:
+            # Пул зависит только от ключа и локализации, состояние генератора и HMAC текущего значения сохраняются
+            state = self._random.getstate()
+            self._random.seed(int.from_bytes(self._hmac_digest(key='pool', value=name), byteorder='big'))
+            pool = ValuePool.generate(factory, size=self.pool_size, name=name, generation=generation)
+            self._random.setstate(state)
+        else:
+            pool = ValuePool.generate(factory, size=self.pool_size, name=name, generation=generation)
+
+        self._pools[name] = pool
+        return pool
+
+    def _pooled_value(self, name: str, factory: Callable[[], str], *, unique: bool) -> str:
+        """
+        Метод для получения значения из пула.
+        Уникальные значения выбираются без возвращения (по ключевой перестановке индексов пула; в детерминированном
+        режиме позиция определяется исходным значением), после исчерпания пула генерируются обычным способом.
+        :param name: название пула
+        :param factory: функция генерации одного значения
+        :param unique: выбрать значение, которое еще не встречалось
+        :return: значение
+        """
+        pool = self._get_pool(name, factory)
+        pool.draws += 1
+        if not unique:
+            return pool[self._random_int(0, len(pool))]
+
+        while True:
+            try:
+                value = pool[self._unique_index(pool.key, len(pool))]
+            except RecursionError:
+                return self._generate_unique_value(func=factory)
+
+            if self._unique_values.add(value):
+                return value
+
+    def _random_int(self, a: int, b: int) -> int:
         b = b - a
-        return int(random.random() * b) + a  # nosec
+        return int(self._random.random() * b) + a  # nosec
+
+    def _get_integer_range(self, integer_type: str, kwargs: Dict[str, Any]) -> Tuple[int, int]:
+        """
+        Метод для получения границ целого числа из параметров мутации.
+        :param integer_type: тип числа (smallint, integer, bigint, smallserial, serial, bigserial)
+        :param kwargs: параметры мутации
+        :return: минимальное и максимальное значение
+        """
+        min_value = getattr(self, f'min_value_{integer_type}')
+        max_value = getattr(self, f'max_value_{integer_type}')
+        start = kwargs.get('start', min_value)
+        end = kwargs.get('end', max_value)
+        if start < min_value or end > max_value:
+            msg = f'The start and end values must be between {min_value} and {max_value}.'
+            raise ValueError(msg)
+
+        return start, end
 
     def _generate_string_by_mask(self, mask: str, char: str = '@', digit: str = '#') -> str:
         """
@@ -114,6 +591,9 @@ class Mutator:
             unique - сгенерировать уникальный email
         :return: email
         """
+        if self.pool_size:
+            return self._pooled_value('email', self._person.email, unique=bool(kwargs.get('unique')))
+
         if kwargs.get('unique'):
             return self._generate_unique_value(func=self._person.email)
 
@@ -146,18 +626,15 @@ class Mutator:
         :return: ФИО
         """
         if kwargs.get('unique'):
-            while True:
-                if self._is_russian_locale:
-                    value = f'{self._person.full_name(reverse=True)} {self._russian_provider.patronymic()}'
-                else:
-                    value = self._person.full_name(reverse=True)
-
-                if not set(value) & self._unique_values:
-                    self._unique_values.add(value)
-                    break
+            return self._generate_unique_value(func=self._full_name)
 
-            return value
+        return self._full_name()
 
+    def _full_name(self) -> str:
+        """
+        Метод для генерации ФИО с отчеством для русской локализации.
+        :return: ФИО
+        """
         if self._is_russian_locale:
             return f'{self._person.full_name(reverse=True)} {self._russian_provider.patronymic()}'
 
@@ -170,6 +647,9 @@ class Mutator:
             unique - сгенерировать уникальное имя
         :return: имя
         """
+        if self.pool_size:
+            return self._pooled_value('first_name', self._person.name, unique=bool(kwargs.get('unique')))
+
         if kwargs.get('unique'):
             return self._generate_unique_value(func=self._person.name)
 
@@ -198,6 +678,9 @@ class Mutator:
             unique - сгенерировать уникальную фамилию
         :return: фамилия
         """
+        if self.pool_size:
+            return self._pooled_value('last_name', self._person.surname, unique=bool(kwargs.get('unique')))
+
         if kwargs.get('unique'):
             return self._generate_unique_value(func=self._person.surname)
 
@@ -234,6 +717,9 @@ class Mutator:
             unique - сгенерировать уникальный адрес
         :return: адрес
         """
+        if self.pool_size:
+            return self._pooled_value('address', self._address.address, unique=bool(kwargs.get('unique')))
+
         if kwargs.get('unique'):
             return self._generate_unique_value(func=self._address.address)
 
@@ -295,8 +781,7 @@ class Mutator:
 
         return self._internet.ip_v6()
 
-    @staticmethod
-    def mutation_random_choice(**kwargs: List[Any]) -> str:
+    def mutation_random_choice(self, **kwargs: List[Any]) -> str:
         """
         Метод для формирования случайного значения из списка.
         :param kwargs:
@@ -308,7 +793,7 @@ class Mutator:
             msg = 'Key choices not found!'
             raise ValueError(msg)
 
-        return str(random.choice(seq=choices))  # nosec
+        return str(self._random.choice(seq=choices))  # nosec
 
     def mutation_numeric_smallint(self, **kwargs: int) -> str:
         """
@@ -319,14 +804,10 @@ class Mutator:
             unique - сгенерировать уникальное значение
         :return: случайное значение в пределах [start, end]
         """
-        start = kwargs.get('start', self.min_value_smallint)
-        end = kwargs.get('end', self.max_value_smallint)
-        if start < self.min_value_smallint or end > self.max_value_smallint:
-            msg = f'The start and end values must be between {self.min_value_smallint} and {self.max_value_smallint}.'
-            raise ValueError(msg)
+        start, end = self._get_integer_range('smallint', kwargs)
 
         if kwargs.get('unique'):
-            return str(self._generate_unique_value(func=self._numeric.integer_number, start=start, end=end))
+            return str(self._unique_integer(start=start, end=end))
 
         return str(self._numeric.integer_number(start=start, end=end))
 
@@ -339,14 +820,10 @@ class Mutator:
             unique - сгенерировать уникальное значение
         :return: случайное значение в пределах [start, end]
         """
-        start = kwargs.get('start', self.min_value_integer)
-        end = kwargs.get('end', self.max_value_integer)
-        if start < self.min_value_integer or end > self.max_value_integer:
-            msg = f'The start and end values must be between {self.min_value_integer} and {self.max_value_integer}.'
-            raise ValueError(msg)
+        start, end = self._get_integer_range('integer', kwargs)
 
         if kwargs.get('unique'):
-            return str(self._generate_unique_value(func=self._numeric.integer_number, start=start, end=end))
+            return str(self._unique_integer(start=start, end=end))
 
         return str(self._numeric.integer_number(start=start, end=end))
 
@@ -359,14 +836,10 @@ class Mutator:
             unique - сгенерировать уникальное значение
         :return: случайное значение в пределах [start, end]
         """
-        start = kwargs.get('start', self.min_value_bigint)
-        end = kwargs.get('end', self.max_value_bigint)
-        if start < self.min_value_bigint or end > self.max_value_bigint:
-            msg = f'The start and end values must be between {self.min_value_bigint} and {self.max_value_bigint}.'
-            raise ValueError(msg)
+        start, end = self._get_integer_range('bigint', kwargs)
 
         if kwargs.get('unique'):
-            return str(self._generate_unique_value(func=self._numeric.integer_number, start=start, end=end))
+            return str(self._unique_integer(start=start, end=end))
 
         return str(self._numeric.integer_number(start=start, end=end))
 
@@ -450,17 +923,10 @@ class Mutator:
             unique - сгенерировать уникальное значение
         :return: случайное значение в пределах [start, end]
         """
-        start = kwargs.get('start', self.min_value_smallserial)
-        end = kwargs.get('end', self.max_value_smallserial)
-        if start < self.min_value_smallserial or end > self.max_value_smallserial:
-            msg = (
-                f'The start and end values must be between {self.min_value_smallserial} '
-                f'and {self.max_value_smallserial}.'
-            )
-            raise ValueError(msg)
+        start, end = self._get_integer_range('smallserial', kwargs)
 
         if kwargs.get('unique'):
-            return str(self._generate_unique_value(func=self._numeric.integer_number, start=start, end=end))
+            return str(self._unique_integer(start=start, end=end))
 
         return str(self._numeric.integer_number(start=start, end=end))
 
@@ -473,14 +939,10 @@ class Mutator:
             unique - сгенерировать уникальное значение
         :return: случайное значение в пределах [start, end]
         """
-        start = kwargs.get('start', self.min_value_serial)
-        end = kwargs.get('end', self.max_value_serial)
-        if start < self.min_value_serial or end > self.max_value_serial:
-            msg = f'The start and end values must be between {self.min_value_serial} and {self.max_value_serial}.'
-            raise ValueError(msg)
+        start, end = self._get_integer_range('serial', kwargs)
 
         if kwargs.get('unique'):
-            return str(self._generate_unique_value(func=self._numeric.integer_number, start=start, end=end))
+            return str(self._unique_integer(start=start, end=end))
 
         return str(self._numeric.integer_number(start=start, end=end))
 
@@ -493,14 +955,10 @@ class Mutator:
             unique - сгенерировать уникальное значение
         :return: случайное значение в пределах [start, end]
         """
-        start = kwargs.get('start', self.min_value_bigserial)
-        end = kwargs.get('end', self.max_value_bigserial)
-        if start < self.min_value_bigserial or end > self.max_value_bigserial:
-            msg = f'The start and end values must be between {self.min_value_bigserial} and {self.max_value_bigserial}.'
-            raise ValueError(msg)
+        start, end = self._get_integer_range('bigserial', kwargs)
 
         if kwargs.get('unique'):
-            return str(self._generate_unique_value(func=self._numeric.integer_number, start=start, end=end))
+            return str(self._unique_integer(start=start, end=end))
 
         return str(self._numeric.integer_number(start=start, end=end))
 
@@ -517,17 +975,19 @@ class Mutator:
         char = kwargs.get('char', '@')
         digit = kwargs.get('digit', '#')
         if kwargs.get('unique'):
-            return self._generate_unique_value(func=self._generate_string_by_mask, mask=mask, char=char, digit=digit)
+            return self._unique_string_by_mask(mask=mask, char=char, digit=digit)
 
         return self._generate_string_by_mask(mask=mask, char=char, digit=digit)
 
-    @staticmethod
-    def mutation_uuid4(**_: Any) -> str:
+    def mutation_uuid4(self, **_: Any) -> str:
         """
         Метод для формирования uuid4
         :param kwargs: параметры мутации - не используются
         :return: строка uuid4
         """
+        if self.deterministic:
+            return str(uuid.UUID(int=self._random.getrandbits(128), version=4))
+
         return str(uuid.uuid4())
 
     def mutation_uuid5_by_source_value(self, **kwargs: Any) -> str:
@@ -580,20 +1040,12 @@ class Mutator:
             msg_obfuscated_numbers_count = 'Argument "obfuscated_numbers_count" not found'
             raise ValueError(msg_obfuscated_numbers_count)
 
-        if not self._secret_key:
-            msg_secret_key = 'Environment variable SECRET_KEY not set'  # nosec B105
-            raise ValueError(msg_secret_key)
-
-        if not self._secret_key_nonce:
-            msg_secret_key_nonce = 'Environment variable SECRET_KEY_NONCE not set'  # nosec B105
-            raise ValueError(msg_secret_key_nonce)
-
         digits: str = ''.join([digit for digit in original_phone if digit.isdigit()])
         not_obfuscated_digits: str = digits[:-obfuscated_numbers_count]
 
         # Создаем seed на основе ключа с помощью HMAC для большей стойкости
         seed: bytes = hmac.new(
-            key=f'{self._secret_key_nonce}{self._secret_key}'.encode(),
+            key=self._get_hmac_key(),
             msg=b'digits_permutation',
             digestmod=hashlib.sha256,
         ).digest()
@@ -1,23 +1,49 @@
 import datetime
 import glob
 import io
+import mmap
 import os
+import queue
+import random
+import shutil
 import struct
 import sys
 import tempfile
+import threading
 import time
 import zlib
 from abc import ABCMeta, abstractmethod
-from contextlib import suppress
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, suppress
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import BinaryIO, Iterator, Optional, Union
+from itertools import islice
+from typing import Any, AnyStr, BinaryIO, Callable, Iterator, Optional, Union
 
+from mimesis.random import random as mimesis_random
+from typing_extensions import Protocol
+
+from pg_stage.compression import Codec, Compressor, ParallelZlibCompressor, get_codec
+from pg_stage.encoding import DECODE_ERRORS
 from pg_stage.obfuscators.plain import PlainObfuscator
+from pg_stage.streams import WriteStats
 
 Version = tuple[int, int, int]
 DumpId = int
 Offset = int
+# Вход с произвольным доступом: файл с поддержкой seek или отображение файла в память
+SeekableInput = Union[BinaryIO, mmap.mmap]
+
+
+class OutputStream(Protocol):
+    """Выходной поток, в который данные только дописываются (файл, stdout или CountingWriter)."""
+
+    def write(self, data: bytes, /) -> int:
+        """Запись данных."""
+
+    def flush(self) -> None:
+        """Сброс буфера потока."""
 
 
 class PostgreSQLVersions:
@@ -50,6 +76,8 @@ class Constants:
 
     MAGIC_HEADER = b'PGDMP'
     CUSTOM_FORMAT = 1
+    TAR_FORMAT = 3
+    DIRECTORY_FORMAT = 5
     ZLIB_CHUNK_SIZE = 1024 * 1024  # 1MB - увеличен для уменьшения системных вызовов
     DEFAULT_BUFFER_SIZE = 2 * 1024 * 1024  # 2MB для чтения блоков
     MAX_CHUNK_SIZE = 50 * 1024 * 1024
@@ -59,6 +87,9 @@ class Constants:
     DEFAULT_TMP_DIR = os.getcwd()
     TMP_FILE_PREFIX = 'pg_dump_'
     LINE_BATCH_SIZE = 1000  # Количество строк для батчинга при записи
+    PIPELINE_QUEUE_SIZE = 8  # Количество чанков в очереди между стадиями конвейера
+    PIPELINE_POLL_INTERVAL = 0.1  # Интервал проверки остановки конвейера (секунды)
+    WORKER_IN_FLIGHT_FACTOR = 2  # Количество блоков в обработке на один процесс пула
 
 
 class PgDumpError(Exception):
@@ -72,6 +103,7 @@ class CompressionMethod(Enum):
     RAW = 'raw'
     ZLIB = 'zlib'
     LZ4 = 'lz4'
+    ZSTD = 'zstd'
 
     def __str__(self) -> str:
         return self.value
@@ -99,6 +131,7 @@ class Header:
     create_date: datetime.datetime
     int_size: int = 4
     offset_size: int = 8
+    archive_format: int = Constants.CUSTOM_FORMAT
 
 
 @dataclass(frozen=True)
@@ -123,6 +156,8 @@ class TocEntry:
     data_state: int = 0
     offset: Offset = 0
     dependencies: list[DumpId] = field(default_factory=list)
+    offset_position: Optional[Offset] = None  # позиция признака смещения в файле (если поток поддерживает tell)
+    filename: Optional[str] = None  # файл с данными записи (форматы directory и tar)
 
 
 @dataclass(frozen=True)
@@ -139,6 +174,13 @@ class Dump:
         """
         return (entry for entry in self.toc_entries if entry.desc == 'TABLE DATA')
 
+    def get_encoding_entry(self) -> Optional[TocEntry]:
+        """
+        Получить запись с кодировкой дампа.
+        :return: запись ENCODING или None
+        """
+        return next((entry for entry in self.toc_entries if entry.desc == 'ENCODING'), None)
+
     def get_comment_entries(self) -> Iterator[TocEntry]:
         """
         Получить все записи комментариев.
@@ -155,14 +197,33 @@ class Dump:
         return next((entry for entry in self.toc_entries if entry.dump_id == dump_id), None)
 
 
+@dataclass(frozen=True)
+class BlockOptions:
+    """Параметры обработки сжатых блоков данных."""
+
+    use_temp_files: bool = False  # обработка через временные файлы (резервный вариант)
+    use_threads: bool = False  # распаковка и сжатие в отдельных потоках параллельно с мутацией
+    compression_threads: int = 0  # количество потоков параллельного сжатия zlib (0 или 1 - без пула потоков)
+    output_compression: Optional[CompressionMethod] = None  # метод сжатия результата (None - как во входном дампе)
+    compression_level: Optional[int] = None  # уровень сжатия результата (None - по умолчанию для метода)
+
+
 class DataParser(metaclass=ABCMeta):
     """Протокол для реализации обработчиков данных."""
 
     @abstractmethod
-    def parse(self, data: Union[str, bytes]) -> Union[str, bytes]:
+    def parse(self, data: AnyStr) -> AnyStr:
         """
         Обработать данные и вернуть модифицированную версию.
         :param data: исходные данные (строка или байты)
+        :return: обработанные данные того же типа
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def flush(self) -> bytes:
+        """
+        Обработать данные, оставшиеся в буфере после последнего вызова parse.
         :return: обработанные данные
         """
         raise NotImplementedError()
@@ -171,19 +232,55 @@ class DataParser(metaclass=ABCMeta):
 class PgStageParser(DataParser):
     """Процессор обфускации из библиотеки pg_stage с оптимизацией для больших данных."""
 
-    def __init__(self, parser):
+    def __init__(self, parser, bytes_parser=None, pass_through_checker=None, delete_checker=None):
         """
         Инициализация процессора обфускации.
         :param parser: функция парсинга из обфускатора
+        :param bytes_parser: функция парсинга строк в байтах (в кодировке дампа) из обфускатора
+        :param pass_through_checker: функция проверки по команде COPY, что данные таблицы не изменяются
+        :param delete_checker: функция проверки по команде COPY, что данные таблицы удаляются
         """
         self.parser = parser
+        self.bytes_parser = bytes_parser or self._decoding_parser
+        self.pass_through_checker = pass_through_checker
+        self.delete_checker = delete_checker
         self._line_buffer = bytearray()
 
-    def parse(self, data: Union[str, bytes]) -> Union[str, bytes]:
+    @classmethod
+    def from_obfuscator(cls, obfuscator: PlainObfuscator) -> 'PgStageParser':
+        """
+        Создание процессора для обфускатора pg_stage.
+        :param obfuscator: обфускатор
+        :return: процессор обфускации
+        """
+        return cls(
+            parser=obfuscator._parse_line,
+            bytes_parser=obfuscator._parse_line_bytes,
+            pass_through_checker=obfuscator._is_copy_pass_through,
+            delete_checker=obfuscator._is_copy_deleted,
+        )
+
+    def _decoding_parser(self, *, line: bytes) -> Optional[bytes]:
+        """
+        Парсинг строки в байтах через строковый парсер (для обфускаторов без поддержки байтов).
+        :param line: строка в байтах
+        :return: обработанная строка или None, если строку нужно удалить
+        """
+        text_line = line.decode('utf-8', DECODE_ERRORS)
+        processed_line = self.parser(line=text_line)
+        if processed_line is None:
+            return None
+
+        if processed_line is text_line:
+            return line
+
+        return processed_line.encode('utf-8', DECODE_ERRORS)
+
+    def parse(self, data: AnyStr) -> AnyStr:
         """
         Применить замены текста к данным (оптимизированная версия для потоковой обработки).
         :param data: исходные данные (строка или байты)
-        :return: обработанные данные
+        :return: обработанные данные того же типа
         """
         if not data:
             return data
@@ -196,57 +293,69 @@ class PgStageParser(DataParser):
     def _parse_bytes_streaming(self, data: bytes) -> bytes:
         """
         Потоковая обработка байтов построчно без загрузки всего в память.
-        Оптимизировано: использует bytearray для эффективной конкатенации.
+        Строки не декодируются целиком: декодирование полей выполняет парсер в кодировке дампа.
         :param data: байты для обработки
         :return: обработанные байты
         """
         self._line_buffer.extend(data)
-        
+
         last_newline = self._line_buffer.rfind(b'\n')
-        
+
         if last_newline == -1:
             return b''
-        
-        complete_data = bytes(self._line_buffer[:last_newline + 1])
-        del self._line_buffer[:last_newline + 1]
-        
-        processed_result = bytearray()
-        start = 0
-        
-        while True:
-            newline_pos = complete_data.find(b'\n', start)
-            if newline_pos == -1:
-                break
-            
-            line_bytes = complete_data[start:newline_pos]
-            start = newline_pos + 1
-            
+
+        complete_data = bytes(self._line_buffer[: last_newline + 1])
+        del self._line_buffer[: last_newline + 1]
+
+        processed_lines = []
+        for line_bytes in complete_data.split(b'\n')[:-1]:
             if not line_bytes:
-                processed_result.extend(b'\n')
-                continue
-            
-            try:
-                line = line_bytes.decode('utf-8')
-            except UnicodeDecodeError:
-                processed_result.extend(line_bytes)
-                processed_result.extend(b'\n')
+                processed_lines.append(line_bytes)
                 continue
-            
-            processed_line = self.parser(line=line)
-            
-            if isinstance(processed_line, str):
-                if processed_line != line:
-                    processed_result.extend(processed_line.encode('utf-8'))
-                    processed_result.extend(b'\n')
-                else:
-                    processed_result.extend(line_bytes)
-                    processed_result.extend(b'\n')
-            else:
-                processed_result.extend(line_bytes)
-                processed_result.extend(b'\n')
-        
-        return bytes(processed_result)
-    
+
+            processed_line = self.bytes_parser(line=line_bytes)
+            if processed_line is not None:
+                processed_lines.append(processed_line)
+
+        if not processed_lines:
+            return b''
+
+        processed_lines.append(b'')
+        return b'\n'.join(processed_lines)
+
+    def is_pass_through(self, copy_stmt: Optional[str]) -> bool:
+        """
+        Проверка, что данные таблицы не изменяются (нет правил обфускации и удаления).
+        :param copy_stmt: команда COPY блока данных
+        :return: флаг копирования данных без обработки
+        """
+        if not copy_stmt or self.pass_through_checker is None:
+            return False
+
+        return bool(self.pass_through_checker(copy_line=copy_stmt))
+
+    def is_deleted(self, copy_stmt: Optional[str]) -> bool:
+        """
+        Проверка, что данные таблицы удаляются.
+        :param copy_stmt: команда COPY блока данных
+        :return: флаг удаления данных таблицы
+        """
+        if not copy_stmt or self.delete_checker is None:
+            return False
+
+        return bool(self.delete_checker(copy_line=copy_stmt))
+
+    def start_block(self, copy_stmt: Optional[str]) -> None:
+        """
+        Подготовить парсер к обработке нового блока данных.
+        В custom формате нет терминатора `\\.`, поэтому состояние предыдущей таблицы сбрасывается явно.
+        :param copy_stmt: команда COPY блока данных
+        """
+        self._line_buffer.clear()
+        self.parser(line='\\.')
+        if copy_stmt:
+            self.parser(line=copy_stmt)
+
     def flush(self) -> bytes:
         """
         Обработать оставшиеся данные в буфере.
@@ -254,19 +363,10 @@ class PgStageParser(DataParser):
         """
         if not self._line_buffer:
             return b''
-        
-        try:
-            line = bytes(self._line_buffer).decode('utf-8')
-            processed_line = self.parser(line=line)
-            if isinstance(processed_line, str) and processed_line != line:
-                result = processed_line.encode('utf-8')
-            else:
-                result = bytes(self._line_buffer)
-        except UnicodeDecodeError:
-            result = bytes(self._line_buffer)
-        
+
+        result = self.bytes_parser(line=bytes(self._line_buffer))
         self._line_buffer.clear()
-        return result
+        return result or b''
 
 
 class BufferedStreamReader:
@@ -335,6 +435,10 @@ class BufferedStreamReader:
         return bytes(data)
 
 
+# Поток, из которого читается дамп: файл, поток с копированием заголовка или отображение файла в память
+InputStream = Union[BinaryIO, BufferedStreamReader, mmap.mmap]
+
+
 class DumpIO:
     """Утилиты бинарного I/O для формата дампов PostgreSQL."""
 
@@ -351,7 +455,7 @@ class DumpIO:
         self._int_unpack = struct.Struct(f'B{int_size}B').unpack
         self._offset_unpack = struct.Struct(f'{offset_size}B').unpack
 
-    def read_byte(self, stream: Union[BinaryIO, BufferedStreamReader]) -> int:
+    def read_byte(self, stream: InputStream) -> int:
         """
         Чтение одного байта.
         :param stream: поток для чтения
@@ -363,7 +467,7 @@ class DumpIO:
             raise PgDumpError(message)
         return struct.unpack('B', data)[0]
 
-    def read_int(self, stream: Union[BinaryIO, BufferedStreamReader]) -> int:
+    def read_int(self, stream: InputStream) -> int:
         """
         Чтение знакового целого числа с переменным размером.
         :param stream: поток для чтения
@@ -379,7 +483,7 @@ class DumpIO:
         value = sum(b << (i * 8) for i, b in enumerate(unpacked[1:]) if b != 0)
         return -value if sign else value
 
-    def read_string(self, stream: Union[BinaryIO, BufferedStreamReader]) -> str:
+    def read_string(self, stream: InputStream) -> str:
         """
         Чтение строки UTF-8 с префиксом длины.
         :param stream: поток для чтения
@@ -394,13 +498,10 @@ class DumpIO:
             message = f'Expected {length} bytes, got {len(data)}'
             raise PgDumpError(message)
 
-        try:
-            return data.decode('utf-8')
-        except UnicodeDecodeError as error:
-            message = f'Invalid UTF-8 string: {error}'
-            raise PgDumpError(message) from error
+        # Строки TOC хранятся в кодировке дампа, невалидные для UTF-8 байты сохраняются без потерь
+        return data.decode('utf-8', DECODE_ERRORS)
 
-    def read_offset(self, stream: Union[BinaryIO, BufferedStreamReader]) -> Offset:
+    def read_offset(self, stream: InputStream) -> Offset:
         """
         Чтение значения смещения.
         :param stream: поток для чтения
@@ -412,6 +513,15 @@ class DumpIO:
             offset |= byte_value << (i * 8)
         return offset
 
+    def write_offset(self, value: Offset, data_state: int = OffsetPosition.SET) -> bytes:
+        """
+        Запись признака и значения смещения.
+        :param value: значение смещения
+        :param data_state: признак установленного смещения
+        :return: байты для записи
+        """
+        return bytes([data_state]) + value.to_bytes(self.offset_size, 'little')
+
     def write_int(self, value: int) -> bytes:
         """
         Запись знакового целого числа.
@@ -433,14 +543,25 @@ class DumpIO:
 class HeaderParser:
     """Парсер заголовков файлов дампов PostgreSQL."""
 
-    def __init__(self, dio: DumpIO):
+    # Значения pg_compress_algorithm в заголовке архивов версии 1.15 и выше
+    COMPRESSION_ALGORITHMS = {
+        0: CompressionMethod.NONE,
+        1: CompressionMethod.ZLIB,
+        2: CompressionMethod.LZ4,
+        3: CompressionMethod.ZSTD,
+    }
+    COMPRESSION_POSITION = len(Constants.MAGIC_HEADER) + 6  # после версии, размеров int и offset и формата
+
+    def __init__(self, dio: DumpIO, archive_format: int = Constants.CUSTOM_FORMAT):
         """
         Инициализация парсера.
         :param dio: объект для работы с бинарным I/O
+        :param archive_format: ожидаемый формат архива
         """
         self.dio = dio
+        self.archive_format = archive_format
 
-    def parse(self, stream: Union[BinaryIO, BufferedStreamReader]) -> Header:
+    def parse(self, stream: InputStream) -> Header:
         """
         Парсинг заголовка файла дампа.
         :param stream: поток для чтения
@@ -461,7 +582,7 @@ class HeaderParser:
         self.dio.offset_size = offset_size
 
         format_byte = self.dio.read_byte(stream)
-        if format_byte != Constants.CUSTOM_FORMAT:
+        if format_byte != self.archive_format:
             message = f'Unsupported format: {format_byte}'
             raise PgDumpError(message)
 
@@ -482,6 +603,7 @@ class HeaderParser:
             create_date=create_date,
             int_size=int_size,
             offset_size=offset_size,
+            archive_format=format_byte,
         )
 
     def _validate_version(self, version: Version) -> None:
@@ -494,7 +616,7 @@ class HeaderParser:
             message = f'Unsupported version: {version_str}'
             raise PgDumpError(message)
 
-    def _parse_compression(self, stream: Union[BinaryIO, BufferedStreamReader], version: Version) -> CompressionMethod:
+    def _parse_compression(self, stream: InputStream, version: Version) -> CompressionMethod:
         """
         Парсинг метода сжатия в зависимости от версии.
         :param stream: поток для чтения
@@ -503,13 +625,7 @@ class HeaderParser:
         """
         if version >= PostgreSQLVersions.V1_15:
             compression_byte = self.dio.read_byte(stream)
-            compression_map = {
-                0: CompressionMethod.NONE,
-                1: CompressionMethod.RAW,
-                2: CompressionMethod.LZ4,
-                3: CompressionMethod.ZLIB,
-            }
-            compression_method = compression_map.get(compression_byte)
+            compression_method = self.COMPRESSION_ALGORITHMS.get(compression_byte)
             if compression_method is None:
                 message = f'Unknown compression method: {compression_byte}'
                 raise PgDumpError(message)
@@ -527,7 +643,7 @@ class HeaderParser:
 
         return compression_method
 
-    def _parse_date(self, stream: Union[BinaryIO, BufferedStreamReader]) -> datetime.datetime:
+    def _parse_date(self, stream: InputStream) -> datetime.datetime:
         """
         Парсинг даты создания из дампа.
         :param stream: поток для чтения
@@ -551,14 +667,16 @@ class HeaderParser:
 class TocParser:
     """Парсер записей оглавления (Table of Contents)."""
 
-    def __init__(self, dio: DumpIO):
+    def __init__(self, dio: DumpIO, archive_format: int = Constants.CUSTOM_FORMAT):
         """
         Инициализация парсера TOC.
         :param dio: объект для работы с бинарным I/O
+        :param archive_format: формат архива (определяет дополнительные поля записи)
         """
         self.dio = dio
+        self.archive_format = archive_format
 
-    def parse(self, stream: Union[BinaryIO, BufferedStreamReader], version: Version) -> list[TocEntry]:
+    def parse(self, stream: InputStream, version: Version) -> list[TocEntry]:
         """
         Парсинг всех записей TOC.
         :param stream: поток для чтения
@@ -568,7 +686,7 @@ class TocParser:
         num_entries = self.dio.read_int(stream)
         return [self._parse_entry(stream, version) for _ in range(num_entries)]
 
-    def _parse_entry(self, stream: Union[BinaryIO, BufferedStreamReader], version: Version) -> TocEntry:
+    def _parse_entry(self, stream: InputStream, version: Version) -> TocEntry:
         """
         Парсинг одной записи TOC.
         :param stream: поток для чтения
@@ -601,8 +719,18 @@ class TocParser:
 
         dependencies = self._parse_dependencies(stream)
 
-        data_state = self.dio.read_byte(stream)
-        offset = self.dio.read_offset(stream)
+        offset_position = None
+        data_state = 0
+        offset = 0
+        filename = None
+        if self.archive_format == Constants.CUSTOM_FORMAT:
+            tell = getattr(stream, 'tell', None)
+            offset_position = tell() if tell else None
+            data_state = self.dio.read_byte(stream)
+            offset = self.dio.read_offset(stream)
+        else:
+            # В форматах directory и tar вместо смещения хранится имя файла с данными
+            filename = self.dio.read_string(stream) or None
 
         return TocEntry(
             dump_id=dump_id,
@@ -623,6 +751,8 @@ class TocParser:
             table_oid=table_oid or None,
             oid=oid or None,
             dependencies=dependencies,
+            offset_position=offset_position,
+            filename=filename,
         )
 
     def _parse_section(self, section_idx: int) -> SectionType:
@@ -639,7 +769,7 @@ class TocParser:
         }
         return section_map.get(section_idx, SectionType.NONE)
 
-    def _parse_dependencies(self, stream: Union[BinaryIO, BufferedStreamReader]) -> list[DumpId]:
+    def _parse_dependencies(self, stream: InputStream) -> list[DumpId]:
         """
         Парсинг списка зависимостей.
         :param stream: поток для чтения
@@ -694,22 +824,160 @@ class StreamingLineBuffer:
         self._buffer.clear()
 
 
+class CompressedChunkWriter:
+    """Сжатие данных блока и запись их чанками с префиксом длины."""
+
+    def __init__(self, dio: DumpIO, output_stream: OutputStream, compressor: Optional[Compressor] = None):
+        """
+        Инициализация записи.
+        :param dio: объект для работы с бинарным I/O
+        :param output_stream: выходной поток
+        :param compressor: упаковщик (по умолчанию zlib)
+        """
+        self.dio = dio
+        self.output_stream = output_stream
+        self._compressor = compressor or get_codec(CompressionMethod.ZLIB.value).create_compressor(
+            Constants.COMPRESSION_LEVEL,
+        )
+        self._buffer = bytearray()
+
+    def write(self, data: bytes) -> None:
+        """
+        Сжатие данных и запись чанка, когда он достаточно заполнен.
+        :param data: данные для сжатия
+        """
+        if data:
+            self._buffer.extend(self._compressor.compress(data))
+
+        if len(self._buffer) >= Constants.ZLIB_CHUNK_SIZE:
+            self._write_chunk()
+
+    def close(self) -> None:
+        """Завершение сжатия, запись последнего чанка и терминатора блока."""
+        self._buffer.extend(self._compressor.flush())
+        self._write_chunk()
+        self.output_stream.write(self.dio.write_int(0))
+
+    def _write_chunk(self) -> None:
+        """Запись накопленных сжатых данных одним чанком."""
+        if self._buffer:
+            self.output_stream.write(self.dio.write_int(len(self._buffer)))
+            self.output_stream.write(self._buffer)
+            self._buffer.clear()
+
+
+class BlockPipeline:
+    """
+    Конвейер из потоков, связанных очередями ограниченного размера.
+    Ошибка в любой стадии останавливает конвейер и передается в вызывающий поток.
+    """
+
+    def __init__(self) -> None:
+        """Инициализация конвейера."""
+        self._stop = threading.Event()
+        self._errors: list[BaseException] = []
+
+    @property
+    def is_stopped(self) -> bool:
+        """Конвейер остановлен из-за ошибки."""
+        return self._stop.is_set()
+
+    @staticmethod
+    def create_queue() -> queue.Queue:
+        """
+        Создание очереди между стадиями.
+        :return: очередь ограниченного размера
+        """
+        return queue.Queue(maxsize=Constants.PIPELINE_QUEUE_SIZE)
+
+    def put(self, target_queue: queue.Queue, item: Optional[bytes]) -> bool:
+        """
+        Передача данных следующей стадии.
+        :param target_queue: очередь следующей стадии
+        :param item: данные (None - окончание данных)
+        :return: False, если конвейер остановлен
+        """
+        while not self._stop.is_set():
+            try:
+                target_queue.put(item, timeout=Constants.PIPELINE_POLL_INTERVAL)
+            except queue.Full:
+                continue
+
+            return True
+
+        return False
+
+    def get(self, source_queue: queue.Queue) -> Optional[bytes]:
+        """
+        Получение данных от предыдущей стадии.
+        :param source_queue: очередь предыдущей стадии
+        :return: данные или None при окончании данных или остановке конвейера
+        """
+        while not self._stop.is_set():
+            try:
+                return source_queue.get(timeout=Constants.PIPELINE_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+
+        return None
+
+    def _run_stage(self, stage: Callable[[], None]) -> None:
+        """
+        Выполнение стадии с перехватом ошибок.
+        :param stage: функция стадии
+        """
+        try:
+            stage()
+        except BaseException as error:  # noqa: BLE001
+            self._errors.append(error)
+            self._stop.set()
+
+    @contextmanager
+    def run(self, *stages: Callable[[], None]) -> Iterator[None]:
+        """
+        Запуск стадий в отдельных потоках на время выполнения стадии вызывающего потока.
+        :param stages: функции стадий
+        """
+        threads = [threading.Thread(target=self._run_stage, args=(stage,), daemon=True) for stage in stages]
+        for thread in threads:
+            thread.start()
+
+        try:
+            yield
+        except BaseException:
+            self._stop.set()
+            raise
+        finally:
+            for thread in threads:
+                thread.join()
+
+        if self._errors:
+            error = self._errors[0]
+            if isinstance(error, PgDumpError):
+                raise error
+
+            message = f'Pipeline stage error: {error}'
+            raise PgDumpError(message) from error
+
+
 class DataBlockProcessor:
     """Обработчик блоков данных с поддержкой сжатия и потоковой обработки."""
 
-    def __init__(self, dio: DumpIO, processor: DataParser):
+    def __init__(self, dio: DumpIO, processor: DataParser, options: Optional[BlockOptions] = None):
         """
         Инициализация процессора блоков данных.
         :param dio: объект для работы с бинарным I/O
         :param processor: процессор данных
+        :param options: параметры обработки сжатых блоков
         """
         self.dio = dio
         self.processor = processor
+        self.options = options or BlockOptions()
 
     def process_block(
         self,
-        input_stream: Union[BinaryIO, BufferedStreamReader],
-        output_stream: BinaryIO,
+        input_stream: InputStream,
+        output_stream: OutputStream,
         dump_id: DumpId,
         compression: CompressionMethod,
     ) -> None:
@@ -720,19 +988,284 @@ class DataBlockProcessor:
         :param dump_id: ID записи дампа
         :param compression: метод сжатия
         """
-        if compression in (CompressionMethod.ZLIB, CompressionMethod.RAW):
+        output_compression = self.options.output_compression or compression
+        if compression == CompressionMethod.NONE and output_compression == CompressionMethod.NONE:
+            self._process_uncompressed_block(input_stream, output_stream, dump_id)
+            return
+
+        input_codec = self._get_codec(compression)
+        output_codec = self._get_codec(output_compression)
+        if self.options.use_temp_files and input_codec.name == output_codec.name == CompressionMethod.ZLIB.value:
             self._process_compressed_block(input_stream, output_stream, dump_id)
+        elif self.options.use_threads:
+            self._process_compressed_block_pipelined(input_stream, output_stream, dump_id, input_codec, output_codec)
         else:
-            self._process_uncompressed_block(input_stream, output_stream, dump_id)
+            self._process_compressed_block_streaming(input_stream, output_stream, dump_id, input_codec, output_codec)
+
+    def is_recoding(self, compression: CompressionMethod) -> bool:
+        """
+        Проверка, меняется ли метод сжатия блоков в результате.
+        :param compression: метод сжатия входного дампа
+        :return: флаг смены метода сжатия
+        """
+        output_compression = self.options.output_compression or compression
+        return self._get_codec(output_compression).name != self._get_codec(compression).name
+
+    def recode_block(
+        self,
+        input_stream: InputStream,
+        output_stream: OutputStream,
+        dump_id: DumpId,
+        compression: CompressionMethod,
+    ) -> None:
+        """
+        Перекодирование блока данных в метод сжатия результата без обработки строк.
+        :param input_stream: входной поток
+        :param output_stream: выходной поток
+        :param dump_id: ID записи дампа
+        :param compression: метод сжатия входного дампа
+        """
+        output_codec = self._get_codec(self.options.output_compression or compression)
+        output_stream.write(BlockType.DATA)
+        output_stream.write(self.dio.write_int(dump_id))
+
+        writer = CompressedChunkWriter(self.dio, output_stream, self._create_compressor(output_codec))
+        for data in self._iter_decompressed(input_stream, self._get_codec(compression)):
+            writer.write(data)
+
+        writer.close()
+
+    def skip_block(
+        self,
+        input_stream: InputStream,
+        output_stream: OutputStream,
+        dump_id: DumpId,
+        compression: CompressionMethod,
+    ) -> None:
+        """
+        Пропуск данных удаляемой таблицы без распаковки и запись пустого блока данных.
+        :param input_stream: входной поток
+        :param output_stream: выходной поток
+        :param dump_id: ID записи дампа
+        :param compression: метод сжатия входного дампа
+        """
+        while True:
+            size = self.dio.read_int(input_stream)
+            if size <= 0:
+                break
+
+            while size > 0:
+                skipped = len(input_stream.read(min(size, Constants.DEFAULT_BUFFER_SIZE)))
+                if not skipped:
+                    message = f'Unexpected EOF while skipping block data, {size} bytes remaining'
+                    raise PgDumpError(message)
+
+                size -= skipped
+
+        self.write_empty_block(output_stream, dump_id, compression)
+
+    def write_empty_block(self, output_stream: OutputStream, dump_id: DumpId, compression: CompressionMethod) -> None:
+        """
+        Запись блока данных без строк: пустой поток в методе сжатия результата и терминатор.
+        :param output_stream: выходной поток
+        :param dump_id: ID записи дампа
+        :param compression: метод сжатия входного дампа
+        """
+        output_codec = self._get_codec(self.options.output_compression or compression)
+        output_stream.write(BlockType.DATA)
+        output_stream.write(self.dio.write_int(dump_id))
+        CompressedChunkWriter(self.dio, output_stream, output_codec.create_compressor()).close()
+
+    @staticmethod
+    def _get_codec(compression: CompressionMethod) -> Codec:
+        """
+        Получение кодека для метода сжатия блоков.
+        :param compression: метод сжатия
+        :return: кодек
+        """
+        name = CompressionMethod.ZLIB.value if compression == CompressionMethod.RAW else compression.value
+        try:
+            return get_codec(name)
+        except ValueError as error:
+            raise PgDumpError(str(error)) from error
+
+    def _create_compressor(self, codec: Codec) -> Compressor:
+        """
+        Создание упаковщика для записи блока.
+        :param codec: кодек сжатия блока
+        :return: упаковщик
+        """
+        level = self.options.compression_level
+        if codec.name != CompressionMethod.ZLIB.value:
+            return codec.create_compressor(level)
+
+        level = Constants.COMPRESSION_LEVEL if level is None else level
+        if self.options.compression_threads > 1:
+            return ParallelZlibCompressor(level, threads=self.options.compression_threads)
+
+        return codec.create_compressor(level)
+
+    def _read_chunks(self, input_stream: InputStream) -> Iterator[bytes]:
+        """
+        Чтение чанков блока данных до терминатора (чанка нулевой длины).
+        :param input_stream: входной поток
+        :return: итератор данных чанков
+        """
+        while True:
+            try:
+                chunk_size = self.dio.read_int(input_stream)
+            except Exception as error:
+                message = f'Error reading chunk size: {error}'
+                raise PgDumpError(message) from error
+
+            if chunk_size <= 0:
+                return
+
+            if chunk_size > Constants.MAX_CHUNK_SIZE:
+                message = f'Chunk size too large: {chunk_size}'
+                raise PgDumpError(message)
+
+            data = input_stream.read(chunk_size)
+            if len(data) != chunk_size:
+                message = f'Expected {chunk_size} bytes, got {len(data)}'
+                raise PgDumpError(message)
+
+            yield data
+
+    def _flush_processor(self) -> bytes:
+        """
+        Обработка данных, оставшихся в буфере процессора.
+        :return: обработанные данные
+        """
+        if not hasattr(self.processor, 'flush'):
+            return b''
+
+        remaining = self.processor.flush()
+        if isinstance(remaining, str):
+            return remaining.encode('utf-8')
+
+        return remaining or b''
+
+    def _iter_decompressed(
+        self,
+        input_stream: InputStream,
+        codec: Codec,
+    ) -> Iterator[bytes]:
+        """
+        Потоковая распаковка чанков сжатого блока данных.
+        :param input_stream: входной поток
+        :param codec: кодек сжатия блока
+        :return: итератор распакованных данных
+        """
+        decompressor = codec.create_decompressor()
+        try:
+            for chunk in self._read_chunks(input_stream):
+                yield from decompressor.decompress(chunk)
+
+            final_data = decompressor.flush()
+        except (zlib.error, ValueError, RuntimeError) as error:
+            message = f'Decompression error: {error}'
+            raise PgDumpError(message) from error
+
+        if final_data:
+            yield final_data
+
+    def _process_compressed_block_streaming(
+        self,
+        input_stream: InputStream,
+        output_stream: OutputStream,
+        dump_id: DumpId,
+        input_codec: Codec,
+        output_codec: Codec,
+    ) -> None:
+        """
+        Потоковая обработка сжатого блока данных без временных файлов.
+        Каждый чанк распаковывается, разбивается на строки, обрабатывается и сразу сжимается;
+        в памяти находятся только текущий чанк, незавершенная строка и несброшенный результат сжатия.
+        :param input_stream: входной поток
+        :param output_stream: выходной поток
+        :param dump_id: ID записи дампа
+        :param input_codec: кодек сжатия входного блока
+        :param output_codec: кодек сжатия результата
+        """
+        output_stream.write(BlockType.DATA)
+        output_stream.write(self.dio.write_int(dump_id))
+
+        writer = CompressedChunkWriter(self.dio, output_stream, self._create_compressor(output_codec))
+        for data in self._iter_decompressed(input_stream, input_codec):
+            writer.write(self._process_single_line(data))
+
+        writer.write(self._flush_processor())
+        writer.close()
+        output_stream.flush()
+
+    def _process_compressed_block_pipelined(
+        self,
+        input_stream: InputStream,
+        output_stream: OutputStream,
+        dump_id: DumpId,
+        input_codec: Codec,
+        output_codec: Codec,
+    ) -> None:
+        """
+        Конвейерная обработка сжатого блока данных.
+        Распаковка и сжатие с записью выполняются в отдельных потоках и связаны с мутацией строк
+        очередями ограниченного размера; zlib освобождает GIL, поэтому сжатие идет одновременно с мутацией.
+        :param input_stream: входной поток
+        :param output_stream: выходной поток
+        :param dump_id: ID записи дампа
+        :param input_codec: кодек сжатия входного блока
+        :param output_codec: кодек сжатия результата
+        """
+        output_stream.write(BlockType.DATA)
+        output_stream.write(self.dio.write_int(dump_id))
+
+        pipeline = BlockPipeline()
+        decompressed_queue = pipeline.create_queue()
+        processed_queue = pipeline.create_queue()
+        writer = CompressedChunkWriter(self.dio, output_stream, self._create_compressor(output_codec))
+
+        def decompress() -> None:
+            """Стадия распаковки."""
+            for data in self._iter_decompressed(input_stream, input_codec):
+                if not pipeline.put(decompressed_queue, data):
+                    return
+
+            pipeline.put(decompressed_queue, None)
+
+        def compress_and_write() -> None:
+            """Стадия сжатия и записи."""
+            while True:
+                data = pipeline.get(processed_queue)
+                if data is None:
+                    break
+
+                writer.write(data)
+
+            if not pipeline.is_stopped:
+                writer.close()
+
+        with pipeline.run(decompress, compress_and_write):
+            while True:
+                data = pipeline.get(decompressed_queue)
+                if data is None:
+                    break
+
+                pipeline.put(processed_queue, self._process_single_line(data))
+
+            pipeline.put(processed_queue, self._flush_processor())
+            pipeline.put(processed_queue, None)
+
+        output_stream.flush()
 
     def _process_compressed_block(
         self,
-        input_stream: Union[BinaryIO, BufferedStreamReader],
-        output_stream: BinaryIO,
+        input_stream: InputStream,
+        output_stream: OutputStream,
         dump_id: DumpId,
     ) -> None:
         """
-        Потоковая обработка сжатого блока данных ZLIB без загрузки в память.
+        Обработка сжатого блока данных ZLIB через временные файлы (резервный вариант).
         :param input_stream: входной поток
         :param output_stream: выходной поток
         :param dump_id: ID записи дампа
@@ -761,7 +1294,7 @@ class DataBlockProcessor:
                         except (OSError, PermissionError) as error:
                             time.sleep(0.1)
 
-    def _stream_decompress(self, input_stream: Union[BinaryIO, BufferedStreamReader], output_fd: int) -> None:
+    def _stream_decompress(self, input_stream: InputStream, output_fd: int) -> None:
         """
         Потоковая декомпрессия данных с оптимизацией для больших блоков.
         :param input_stream: входной поток
@@ -811,9 +1344,6 @@ class DataBlockProcessor:
                     message = f'Decompression error: {error}'
                     raise PgDumpError(message) from error
 
-                if chunk_size < Constants.ZLIB_CHUNK_SIZE:
-                    break
-
             try:
                 final_data = decompressor.flush()
                 if final_data:
@@ -861,23 +1391,14 @@ class DataBlockProcessor:
         """
         if not line_bytes:
             return b''
-        
-        has_newline = line_bytes.endswith(b'\n')
-        if has_newline:
-            line_bytes = line_bytes[:-1]
-        
-        try:
-            processed = self.processor.parse(line_bytes)
-            if isinstance(processed, bytes):
-                result = processed
-            elif isinstance(processed, str):
-                result = processed.encode('utf-8')
-            else:
-                result = line_bytes
-        except Exception:
-            result = line_bytes
-        
-        return result + (b'\n' if has_newline else b'')
+
+        # Строка передается вместе с переводом строки, чтобы парсер сразу обработал ее целиком;
+        # последняя строка без перевода строки будет обработана при вызове flush
+        processed = self.processor.parse(line_bytes)
+        if isinstance(processed, str):
+            return processed.encode('utf-8')
+
+        return processed
 
     def _process_data_chunk(self, data: bytes) -> bytes:
         """
@@ -894,14 +1415,14 @@ class DataBlockProcessor:
             message = f'Processing error: {error}'
             raise PgDumpError(message) from error
 
-    def _stream_compress_and_write(self, input_path: str, output_stream: BinaryIO, dump_id: DumpId) -> None:
+    def _stream_compress_and_write(self, input_path: str, output_stream: OutputStream, dump_id: DumpId) -> None:
         """
         Потоковая компрессия и запись результата.
         :param input_path: путь к файлу с обработанными данными
         :param output_stream: выходной поток
         :param dump_id: ID записи дампа
         """
-        compressor = zlib.compressobj(level=Constants.COMPRESSION_LEVEL)
+        compressor = self._create_compressor(get_codec(CompressionMethod.ZLIB.value))
 
         output_stream.write(BlockType.DATA)
         output_stream.write(self.dio.write_int(dump_id))
@@ -922,12 +1443,13 @@ class DataBlockProcessor:
             output_stream.write(self.dio.write_int(len(final_compressed)))
             output_stream.write(final_compressed)
 
+        output_stream.write(self.dio.write_int(0))
         output_stream.flush()
 
     def _process_uncompressed_block(
         self,
-        input_stream: Union[BinaryIO, BufferedStreamReader],
-        output_stream: BinaryIO,
+        input_stream: InputStream,
+        output_stream: OutputStream,
         dump_id: DumpId,
     ) -> None:
         """
@@ -992,18 +1514,18 @@ class DataBlockProcessor:
                 output_batch.extend(processed_data)
 
         if hasattr(self.processor, 'flush'):
-            remaining = self.processor.flush()
-            if remaining:
-                if isinstance(remaining, str):
-                    remaining = remaining.encode('utf-8')
-                output_batch.extend(remaining)
+            flushed = self.processor.flush()
+            if flushed:
+                if isinstance(flushed, str):
+                    flushed = flushed.encode('utf-8')
+                output_batch.extend(flushed)
 
         write_batch()
 
         output_stream.write(self.dio.write_int(0))
         output_stream.flush()
 
-    def _write_data_block(self, output_stream: BinaryIO, dump_id: DumpId, data: bytes) -> None:
+    def _write_data_block(self, output_stream: OutputStream, dump_id: DumpId, data: bytes) -> None:
         """
         Запись обработанного блока данных в выходной поток.
         :param output_stream: выходной поток
@@ -1020,29 +1542,54 @@ class DataBlockProcessor:
 class DumpProcessor:
     """Главный процессор дампов PostgreSQL с оптимизированной обработкой."""
 
-    def __init__(self, data_parser: DataParser):
+    def __init__(
+        self,
+        data_parser: DataParser,
+        archive_format: int = Constants.CUSTOM_FORMAT,
+        *,
+        options: Optional[BlockOptions] = None,
+    ):
         """
         Инициализация процессора дампов.
         :param data_parser: обработчик данных
+        :param archive_format: формат архива
+        :param options: параметры обработки сжатых блоков
         """
         self.data_parser = data_parser
+        self.archive_format = archive_format
+        self.options = options or BlockOptions()
         self.dio = DumpIO()
 
-    def process_stream(self, input_stream: BinaryIO, output_stream: BinaryIO) -> None:
+    def _create_block_processor(self) -> DataBlockProcessor:
+        """
+        Создание обработчика блоков данных.
+        :return: обработчик блоков данных
+        """
+        return DataBlockProcessor(self.dio, self.data_parser, self.options)
+
+    def process_stream(self, input_stream: BinaryIO, output_stream: BinaryIO) -> int:
         """
         Обработка дампа из входного потока в выходной поток.
         :param input_stream: входной поток
         :param output_stream: выходной поток
+        :return: количество записанных байт
         """
-        buffered_stream = BufferedStreamReader(input_stream, output_stream)
+        header_stream = io.BytesIO()
+        buffered_stream = BufferedStreamReader(input_stream, header_stream)
 
         buffered_stream.bypass_on()
         dump = self._parse_header_and_toc(buffered_stream)
         buffered_stream.bypass_off()
 
-        self._process_data_blocks(buffered_stream, output_stream, dump)
+        header = bytearray(header_stream.getbuffer())
+        self._patch_compression(header, dump)
+        written = CountingWriter(output_stream)
+        written.write(header)
+
+        self._process_data_blocks(buffered_stream, written, dump)
+        return written.position
 
-    def _parse_header_and_toc(self, input_stream: Union[BinaryIO, BufferedStreamReader]) -> Dump:
+    def _parse_header_and_toc(self, input_stream: InputStream) -> Dump:
         """
         Парсинг заголовка и TOC без перехвата исключений.
         BufferedStreamReader автоматически читает данные порциями из потока,
@@ -1050,20 +1597,44 @@ class DumpProcessor:
         :param input_stream: входной поток (должен быть BufferedStreamReader)
         :return: объект дампа
         """
-        header_parser = HeaderParser(self.dio)
+        header_parser = HeaderParser(self.dio, self.archive_format)
         header = header_parser.parse(input_stream)
 
-        toc_parser = TocParser(self.dio)
+        toc_parser = TocParser(self.dio, self.archive_format)
         toc_entries = toc_parser.parse(input_stream, header.version)
 
         dump = Dump(header=header, toc_entries=toc_entries)
 
         return dump
 
+    def _patch_compression(self, header: bytearray, dump: Dump) -> None:
+        """
+        Перезапись метода сжатия в байтах заголовка, если сжатие результата отличается от входного дампа.
+        :param header: байты заголовка и TOC
+        :param dump: объект дампа
+        """
+        output_compression = self.options.output_compression
+        if output_compression is None:
+            return
+
+        position = HeaderParser.COMPRESSION_POSITION
+        if dump.header.version >= PostgreSQLVersions.V1_15:
+            codes = {method: code for code, method in HeaderParser.COMPRESSION_ALGORITHMS.items()}
+            header[position] = codes[output_compression]
+            return
+
+        if output_compression not in (CompressionMethod.NONE, CompressionMethod.ZLIB):
+            message = f'Output compression {output_compression} requires archive version 1.15 or newer'
+            raise PgDumpError(message)
+
+        # До версии 1.15 в заголовке хранится уровень сжатия zlib: 0 - без сжатия, -1 - уровень по умолчанию
+        level = 0 if output_compression == CompressionMethod.NONE else self.options.compression_level or -1
+        header[position : position + 1 + self.dio.int_size] = self.dio.write_int(level)
+
     def _process_data_blocks(
         self,
-        input_stream: Union[BinaryIO, BufferedStreamReader],
-        output_stream: BinaryIO,
+        input_stream: InputStream,
+        output_stream: OutputStream,
         dump: Dump,
     ) -> None:
         """
@@ -1072,16 +1643,11 @@ class DumpProcessor:
         :param output_stream: выходной поток
         :param dump: объект дампа
         """
-        dump_comments = {entry.defn for entry in dump.get_comment_entries() if entry.defn}
-        for comment in dump_comments:
-            with suppress(Exception):
-                self.data_parser.parse(comment)
+        self._load_rules(dump)
 
-        table_data_entries = list(dump.get_table_data_entries())
-        dump_copy_stmts = {entry.dump_id: entry.copy_stmt for entry in table_data_entries if entry.copy_stmt}
-        dump_ids = {entry.dump_id for entry in table_data_entries}
+        dump_ids = {entry.dump_id for entry in dump.get_table_data_entries()}
 
-        processor = DataBlockProcessor(self.dio, self.data_parser)
+        processor = self._create_block_processor()
 
         while True:
             try:
@@ -1092,25 +1658,19 @@ class DumpProcessor:
                 if block_type == BlockType.DATA:
                     dump_id = self.dio.read_int(input_stream)
 
-                    if dump_id in dump_ids:
-                        copy_stmt = dump_copy_stmts.get(dump_id)
-                        if copy_stmt:
-                            with suppress(Exception):
-                                self.data_parser.parse(copy_stmt)
-
-                        try:
-                            processor.process_block(
-                                input_stream,
-                                output_stream,
-                                dump_id,
-                                dump.header.compression_method,
-                            )
-                        except Exception as error:
-                            message = f'Error processing data block {dump_id}: {error}'
-                            raise PgDumpError(message) from error
+                    entry = dump.get_entry_by_id(dump_id) if dump_id in dump_ids else None
+                    if entry is not None and self._is_deleted_entry(entry):
+                        processor.skip_block(input_stream, output_stream, dump_id, dump.header.compression_method)
+                    elif entry is not None and not self._is_pass_through_entry(entry):
+                        self._process_table_block(processor, input_stream, output_stream, dump_id, dump)
+                    elif processor.is_recoding(dump.header.compression_method):
+                        processor.recode_block(input_stream, output_stream, dump_id, dump.header.compression_method)
                     else:
                         self._pass_through_block(input_stream, output_stream, block_type, dump_id)
 
+                elif block_type == BlockType.BLOBS and processor.is_recoding(dump.header.compression_method):
+                    message = 'Changing compression of dumps with large objects is not supported'
+                    raise PgDumpError(message)
                 elif block_type == BlockType.END:
                     output_stream.write(block_type)
                     output_stream.flush()
@@ -1122,15 +1682,87 @@ class DumpProcessor:
                 message = f'Error reading block: {error}'
                 raise PgDumpError(message) from error
 
+    def _load_rules(self, dump: Dump) -> None:
+        """
+        Передача обработчику данных кодировки и комментариев с правилами обфускации из TOC.
+        :param dump: объект дампа
+        """
+        encoding_entry = dump.get_encoding_entry()
+        if encoding_entry and encoding_entry.defn:
+            self.data_parser.parse(encoding_entry.defn)
+
+        dump_comments = {entry.defn for entry in dump.get_comment_entries() if entry.defn}
+        for comment in dump_comments:
+            with suppress(Exception):
+                self.data_parser.parse(comment)
+
+    def _process_table_block(
+        self,
+        processor: 'DataBlockProcessor',
+        input_stream: InputStream,
+        output_stream: OutputStream,
+        dump_id: DumpId,
+        dump: Dump,
+    ) -> None:
+        """
+        Обработка блока данных таблицы, заголовок которого (тип и ID) уже прочитан.
+        :param processor: обработчик блоков данных
+        :param input_stream: входной поток
+        :param output_stream: выходной поток
+        :param dump_id: ID записи дампа
+        :param dump: объект дампа
+        """
+        entry = dump.get_entry_by_id(dump_id)
+        self._start_block(entry.copy_stmt if entry else None)
+
+        try:
+            processor.process_block(input_stream, output_stream, dump_id, dump.header.compression_method)
+        except Exception as error:
+            message = f'Error processing data block {dump_id}: {error}'
+            raise PgDumpError(message) from error
+
+    def _is_pass_through_entry(self, entry: Optional[TocEntry]) -> bool:
+        """
+        Проверка по TOC и правилам из комментариев, что данные таблицы копируются без обработки.
+        :param entry: запись TOC с данными таблицы
+        :return: флаг копирования данных без обработки
+        """
+        if entry is None or not isinstance(self.data_parser, PgStageParser):
+            return False
+
+        return self.data_parser.is_pass_through(entry.copy_stmt)
+
+    def _is_deleted_entry(self, entry: Optional[TocEntry]) -> bool:
+        """
+        Проверка по TOC и правилам из комментариев, что данные таблицы удаляются.
+        :param entry: запись TOC с данными таблицы
+        :return: флаг удаления данных таблицы
+        """
+        if entry is None or not isinstance(self.data_parser, PgStageParser):
+            return False
+
+        return self.data_parser.is_deleted(entry.copy_stmt)
+
+    def _start_block(self, copy_stmt: Optional[str]) -> None:
+        """
+        Подготовка обработчика данных к новому блоку.
+        :param copy_stmt: команда COPY блока данных
+        """
+        if isinstance(self.data_parser, PgStageParser):
+            self.data_parser.start_block(copy_stmt)
+        elif copy_stmt:
+            with suppress(Exception):
+                self.data_parser.parse(copy_stmt)
+
     def _pass_through_block(
         self,
-        input_stream: Union[BinaryIO, BufferedStreamReader],
-        output_stream: BinaryIO,
+        input_stream: InputStream,
+        output_stream: OutputStream,
         block_type: bytes,
         dump_id: DumpId,
     ) -> None:
         """
-        Передача блока без обработки с оптимизацией для больших блоков.
+        Передача блока без обработки: чанки (в том числе сжатые) копируются без распаковки.
         :param input_stream: входной поток
         :param output_stream: выходной поток
         :param block_type: тип блока
@@ -1139,13 +1771,416 @@ class DumpProcessor:
         output_stream.write(block_type)
         output_stream.write(self.dio.write_int(dump_id))
 
-        size = self.dio.read_int(input_stream)
-        output_stream.write(self.dio.write_int(size))
+        while True:
+            size = self.dio.read_int(input_stream)
+            output_stream.write(self.dio.write_int(size))
+            if size <= 0:
+                break
+
+            remaining = size
+            while remaining > 0:
+                chunk = input_stream.read(min(remaining, Constants.DEFAULT_BUFFER_SIZE))
+                if not chunk:
+                    message = f'Unexpected EOF while copying block data, {remaining} bytes remaining'
+                    raise PgDumpError(message)
+
+                output_stream.write(chunk)
+                remaining -= len(chunk)
+
+        output_stream.flush()
+
+
+@dataclass(frozen=True)
+class BlockSegment:
+    """Расположение блока данных во входном файле."""
+
+    dump_id: Optional[DumpId]
+    start: Offset
+    end: Offset
+    is_table_data: bool
+
+
+class SeekableDumpProcessor(DumpProcessor):
+    """
+    Процессор дампов для входных файлов с произвольным доступом.
+    Блоки данных таблиц обрабатываются пулом процессов, результаты записываются в исходном порядке,
+    а смещения блоков в TOC пересчитываются под выходной файл.
+    """
+
+    def __init__(
+        self,
+        data_parser: DataParser,
+        input_path: Optional[str] = None,
+        workers: int = 0,
+        is_parallel_safe: Optional[Callable[..., bool]] = None,
+        *,
+        options: Optional[BlockOptions] = None,
+        worker_kwargs: Optional[dict] = None,
+    ):
+        """
+        Инициализация процессора.
+        :param data_parser: обработчик данных
+        :param input_path: путь к файлу дампа (нужен процессам пула)
+        :param workers: количество процессов (0 - обработка в текущем процессе)
+        :param is_parallel_safe: функция проверки по команде COPY, можно ли обработать таблицу в процессе пула
+        :param options: параметры обработки сжатых блоков
+        :param worker_kwargs: параметры обфускатора для процессов пула
+        """
+        super().__init__(data_parser, options=options)
+        self.input_path = input_path
+        self.workers = workers if input_path else 0
+        self.is_parallel_safe = is_parallel_safe
+        self.worker_kwargs = worker_kwargs or {}
+
+    def _is_worker_segment(self, segment: BlockSegment, dump: Dump) -> bool:
+        """
+        Проверка, можно ли обработать блок данных таблицы в процессе пула.
+        Таблицы со связями и уникальными значениями обрабатываются в текущем процессе, чтобы состояние было общим.
+        :param segment: сегмент входного файла
+        :param dump: объект дампа
+        :return: флаг обработки в процессе пула
+        """
+        if not segment.is_table_data or segment.dump_id is None:
+            return False
+
+        entry = dump.get_entry_by_id(segment.dump_id)
+        if self._is_pass_through_entry(entry) or self._is_deleted_entry(entry):
+            return False
+
+        if self.is_parallel_safe is None:
+            return True
+
+        return bool(entry and entry.copy_stmt and self.is_parallel_safe(copy_line=entry.copy_stmt))
+
+    def process_file(self, input_stream: SeekableInput, output_stream: BinaryIO) -> int:
+        """
+        Обработка дампа из файла в выходной поток.
+        Если в TOC заданы смещения блоков, блоки находятся по ним, иначе файл просматривается последовательно.
+        :param input_stream: входной поток с поддержкой seek или отображение файла в память
+        :param output_stream: выходной поток
+        :return: количество записанных байт
+        """
+        dump = self._parse_header_and_toc(input_stream)
+        toc_end = input_stream.tell()
+        segments = self._segments_from_offsets(input_stream, toc_end, dump)
+        if segments is None:
+            segments = self._scan_segments(input_stream, toc_end, dump)
+
+        self._load_rules(dump)
+
+        input_stream.seek(0)
+        header = bytearray(input_stream.read(toc_end))
+        self._patch_compression(header, dump)
+        is_output_seekable = self._is_seekable(output_stream)
+        base_position = output_stream.tell() if is_output_seekable else 0
+        if not is_output_seekable:
+            # Смещения блоков изменятся, а вернуться к TOC в потоке нельзя, поэтому смещения сбрасываются
+            self._patch_offsets(header, dump, {}, data_state=OffsetPosition.NOT_SET)
+
+        output_stream.write(header)
+        written = CountingWriter(output_stream, position=len(header))
+        output_offsets = self._write_segments(input_stream, written, segments, dump)
+
+        if is_output_seekable:
+            self._patch_offsets(header, dump, output_offsets, data_state=OffsetPosition.SET)
+            end_position = output_stream.tell()
+            output_stream.seek(base_position)
+            output_stream.write(header)
+            output_stream.seek(end_position)
+
+        output_stream.flush()
+        return written.position
+
+    @staticmethod
+    def _is_seekable(stream: BinaryIO) -> bool:
+        """
+        Проверка возможности произвольного доступа к потоку.
+        :param stream: поток
+        :return: флаг поддержки seek
+        """
+        try:
+            return stream.seekable()
+        except (AttributeError, ValueError, OSError):
+            return False
+
+    def _skip_chunks(self, input_stream: SeekableInput) -> None:
+        """
+        Пропуск данных блока (последовательность чанков с длиной) без чтения содержимого.
+        :param input_stream: входной поток
+        """
+        while True:
+            size = self.dio.read_int(input_stream)
+            if size <= 0:
+                break
+
+            try:
+                input_stream.seek(size, os.SEEK_CUR)
+            except ValueError as error:
+                # Отображение файла в память не позволяет перейти за конец обрезанного файла
+                message = 'Unexpected EOF while skipping block data'
+                raise PgDumpError(message) from error
+
+    def _scan_segments(self, input_stream: SeekableInput, toc_end: Offset, dump: Dump) -> list[BlockSegment]:
+        """
+        Поиск расположения блоков данных в файле.
+        Блоки неизвестного типа и все, что после них, передаются одним сегментом без изменений.
+        :param input_stream: входной поток
+        :param toc_end: позиция окончания TOC
+        :param dump: объект дампа
+        :return: список сегментов файла
+        """
+        table_data_ids = {entry.dump_id for entry in dump.get_table_data_entries()}
+        segments = []
+        input_stream.seek(toc_end)
+        while True:
+            start = input_stream.tell()
+            block_type = input_stream.read(1)
+            if not block_type:
+                break
+
+            if block_type != BlockType.DATA:
+                input_stream.seek(0, os.SEEK_END)
+                segments.append(BlockSegment(dump_id=None, start=start, end=input_stream.tell(), is_table_data=False))
+                break
+
+            dump_id = self.dio.read_int(input_stream)
+            self._skip_chunks(input_stream)
+            segments.append(
+                BlockSegment(
+                    dump_id=dump_id,
+                    start=start,
+                    end=input_stream.tell(),
+                    is_table_data=dump_id in table_data_ids,
+                ),
+            )
+
+        return segments
+
+    def _read_block_end(self, input_stream: SeekableInput, start: Offset, dump_id: DumpId) -> Optional[Offset]:
+        """
+        Проверка блока данных по смещению из TOC и поиск его окончания.
+        :param input_stream: входной поток
+        :param start: смещение блока
+        :param dump_id: ID записи дампа, которой должен принадлежать блок
+        :return: позиция окончания блока или None, если по смещению нет ожидаемого блока
+        """
+        try:
+            # Переход за конец отображения файла в память вызывает ValueError
+            input_stream.seek(start)
+            if input_stream.read(1) != BlockType.DATA:
+                return None
+
+            if self.dio.read_int(input_stream) != dump_id:
+                return None
+
+            self._skip_chunks(input_stream)
+        except (PgDumpError, ValueError):
+            return None
+
+        return input_stream.tell()
+
+    def _segments_from_offsets(
+        self,
+        input_stream: SeekableInput,
+        toc_end: Offset,
+        dump: Dump,
+    ) -> Optional[list[BlockSegment]]:
+        """
+        Построение сегментов файла по смещениям блоков из TOC без последовательного чтения данных.
+        Участки между блоками, на которые не ссылается TOC, передаются без изменений.
+        :param input_stream: входной поток
+        :param toc_end: позиция окончания TOC
+        :param dump: объект дампа
+        :return: список сегментов файла или None, если смещения в TOC не заданы или не согласованы
+        """
+        entries = [entry for entry in dump.toc_entries if entry.data_state == OffsetPosition.SET]
+        if not entries or any(entry.data_state != OffsetPosition.SET for entry in dump.get_table_data_entries()):
+            return None
+
+        input_stream.seek(0, os.SEEK_END)
+        file_size = input_stream.tell()
+        segments = []
+        position = toc_end
+        for entry in sorted(entries, key=lambda item: item.offset):
+            if entry.offset < position:
+                return None
+
+            end = self._read_block_end(input_stream, entry.offset, entry.dump_id)
+            if end is None:
+                return None
+
+            if entry.offset > position:
+                segments.append(BlockSegment(dump_id=None, start=position, end=entry.offset, is_table_data=False))
+
+            segments.append(
+                BlockSegment(
+                    dump_id=entry.dump_id,
+                    start=entry.offset,
+                    end=end,
+                    is_table_data=entry.desc == 'TABLE DATA',
+                ),
+            )
+            position = end
+
+        if position < file_size:
+            segments.append(BlockSegment(dump_id=None, start=position, end=file_size, is_table_data=False))
+
+        return segments
+
+    def _patch_offsets(
+        self,
+        header: bytearray,
+        dump: Dump,
+        output_offsets: dict[Offset, Offset],
+        data_state: int,
+    ) -> None:
+        """
+        Перезапись смещений блоков данных в байтах заголовка и TOC.
+        :param header: байты заголовка и TOC
+        :param dump: объект дампа
+        :param output_offsets: соответствие смещений блоков во входном и выходном файлах
+        :param data_state: признак установленного смещения
+        """
+        size = 1 + self.dio.offset_size
+        for entry in dump.toc_entries:
+            if entry.offset_position is None or entry.data_state != OffsetPosition.SET:
+                continue
+
+            if data_state == OffsetPosition.SET:
+                offset = output_offsets.get(entry.offset)
+                if offset is None:
+                    continue
+            else:
+                offset = 0
+
+            header[entry.offset_position : entry.offset_position + size] = self.dio.write_offset(offset, data_state)
+
+    def _write_segments(
+        self,
+        input_stream: SeekableInput,
+        output_stream: 'CountingWriter',
+        segments: list[BlockSegment],
+        dump: Dump,
+    ) -> dict[Offset, Offset]:
+        """
+        Запись сегментов в выходной поток с обработкой блоков данных таблиц.
+        :param input_stream: входной поток
+        :param output_stream: выходной поток
+        :param segments: сегменты входного файла
+        :param dump: объект дампа
+        :return: соответствие смещений блоков во входном и выходном файлах
+        """
+        output_offsets: dict[Offset, Offset] = {}
+        processor = self._create_block_processor()
+        executor = None
+        if self.workers > 0:
+            executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_block_worker,
+                initargs=(self.input_path, self.worker_kwargs),
+            )
+
+        try:
+            in_flight: deque = deque()
+            worker_segments = {
+                segment.start for segment in segments if executor and self._is_worker_segment(segment, dump)
+            }
+            table_segments = iter([segment for segment in segments if segment.start in worker_segments])
+            if executor is not None:
+                for segment in islice(table_segments, Constants.WORKER_IN_FLIGHT_FACTOR * self.workers):
+                    in_flight.append(executor.submit(_process_block_to_spool, segment.start))
+
+            is_recoding = processor.is_recoding(dump.header.compression_method)
+            for segment in segments:
+                output_offsets[segment.start] = output_stream.position
+                entry = dump.get_entry_by_id(segment.dump_id) if segment.is_table_data and segment.dump_id else None
+                if entry is not None and self._is_deleted_entry(entry):
+                    # Сжатые данные удаляемой таблицы не читаются: блок заменяется пустым
+                    processor.write_empty_block(output_stream, entry.dump_id, dump.header.compression_method)
+                    continue
+
+                is_pass_through = not segment.is_table_data or (
+                    segment.start not in worker_segments and self._is_pass_through_entry(entry)
+                )
+                if is_pass_through and is_recoding:
+                    self._recode_segment(processor, input_stream, output_stream, segment, dump)
+                    continue
+
+                if is_pass_through:
+                    self._copy_range(input_stream, output_stream, segment.start, segment.end)
+                    continue
+
+                if segment.start not in worker_segments:
+                    input_stream.seek(segment.start + 1)
+                    dump_id = self.dio.read_int(input_stream)
+                    self._process_table_block(processor, input_stream, output_stream, dump_id, dump)
+                    continue
+
+                spool_path = in_flight.popleft().result()
+                next_segment = next(table_segments, None)
+                if next_segment is not None and executor is not None:
+                    in_flight.append(executor.submit(_process_block_to_spool, next_segment.start))
+
+                try:
+                    with open(spool_path, 'rb') as spool:
+                        shutil.copyfileobj(spool, output_stream, Constants.DEFAULT_BUFFER_SIZE)
+                finally:
+                    os.unlink(spool_path)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        return output_offsets
+
+    def _recode_segment(
+        self,
+        processor: DataBlockProcessor,
+        input_stream: SeekableInput,
+        output_stream: 'CountingWriter',
+        segment: BlockSegment,
+        dump: Dump,
+    ) -> None:
+        """
+        Перекодирование сегмента, который не требует обработки строк, в метод сжатия результата.
+        :param processor: обработчик блоков данных
+        :param input_stream: входной поток
+        :param output_stream: выходной поток
+        :param segment: сегмент входного файла
+        :param dump: объект дампа
+        """
+        input_stream.seek(segment.start)
+        block_type = input_stream.read(1)
+        if segment.dump_id is None:
+            if block_type == BlockType.BLOBS:
+                message = 'Changing compression of dumps with large objects is not supported'
+                raise PgDumpError(message)
+
+            self._copy_range(input_stream, output_stream, segment.start, segment.end)
+            return
+
+        input_stream.seek(segment.start + 1)
+        dump_id = self.dio.read_int(input_stream)
+        processor.recode_block(input_stream, output_stream, dump_id, dump.header.compression_method)
 
-        remaining = size
+    @staticmethod
+    def _copy_range(input_stream: SeekableInput, output_stream: 'CountingWriter', start: Offset, end: Offset) -> None:
+        """
+        Копирование диапазона байтов входного файла без обработки.
+        :param input_stream: входной поток
+        :param output_stream: выходной поток
+        :param start: начало диапазона
+        :param end: конец диапазона
+        """
+        if isinstance(input_stream, mmap.mmap):
+            # Участок передается срезом отображения файла без копирования в память процесса
+            with memoryview(input_stream) as view, view[start:end] as data:
+                output_stream.write(data)
+            return
+
+        input_stream.seek(start)
+        remaining = end - start
         while remaining > 0:
-            chunk_size = min(remaining, Constants.DEFAULT_BUFFER_SIZE)
-            chunk = input_stream.read(chunk_size)
+            chunk = input_stream.read(min(remaining, Constants.DEFAULT_BUFFER_SIZE))
             if not chunk:
                 message = f'Unexpected EOF while copying block data, {remaining} bytes remaining'
                 raise PgDumpError(message)
@@ -1153,12 +2188,176 @@ class DumpProcessor:
             output_stream.write(chunk)
             remaining -= len(chunk)
 
-        output_stream.flush()
+    def process_spool_block(self, input_stream: SeekableInput, start: Offset, dump: Dump) -> str:
+        """
+        Обработка одного блока данных таблицы во временный файл (выполняется в процессе пула).
+        :param input_stream: входной поток
+        :param start: позиция блока в файле
+        :param dump: объект дампа
+        :return: путь к временному файлу с обработанным блоком
+        """
+        input_stream.seek(start + 1)
+        dump_id = self.dio.read_int(input_stream)
+        spool_fd, spool_path = tempfile.mkstemp(
+            prefix=f'{Constants.TMP_FILE_PREFIX}block_',
+            dir=Constants.DEFAULT_TMP_DIR,
+        )
+        try:
+            with os.fdopen(spool_fd, 'wb', buffering=Constants.COMPRESSION_BUFFER_SIZE) as spool:
+                processor = self._create_block_processor()
+                self._process_table_block(processor, input_stream, spool, dump_id, dump)
+        except BaseException:
+            os.unlink(spool_path)
+            raise
+
+        return spool_path
+
+
+class CountingWriter:
+    """Обертка над выходным потоком, которая считает позицию записи."""
+
+    def __init__(self, stream: BinaryIO, position: int = 0):
+        """
+        :param stream: выходной поток
+        :param position: начальная позиция
+        """
+        self._stream = stream
+        self.position = position
+
+    def write(self, data: bytes) -> int:
+        """
+        Запись данных.
+        :param data: данные
+        :return: количество записанных байт
+        """
+        self._stream.write(data)
+        self.position += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        """Сброс буфера потока."""
+        self._stream.flush()
+
+
+def _map_file(input_file: BinaryIO) -> mmap.mmap:
+    """
+    Отображение файла дампа в память только для чтения.
+    :param input_file: открытый файл дампа
+    :return: отображение файла
+    """
+    if os.fstat(input_file.fileno()).st_size == 0:
+        message = 'Dump file is empty'
+        raise PgDumpError(message)
+
+    return mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+_block_worker: Optional[tuple[SeekableDumpProcessor, mmap.mmap, Dump]] = None
+
+
+def _init_block_worker(input_path: str, worker_kwargs: dict) -> None:
+    """
+    Инициализация процесса пула: собственный обфускатор, открытый файл дампа и правила из TOC.
+    :param input_path: путь к файлу дампа
+    :param worker_kwargs: параметры обфускатора
+    """
+    global _block_worker
+    random.seed()
+    mimesis_random.seed()
+    obfuscator = CustomObfuscator(**worker_kwargs)
+    processor = SeekableDumpProcessor(
+        data_parser=PgStageParser.from_obfuscator(obfuscator),
+        options=obfuscator.get_block_options(),
+    )
+    with open(input_path, 'rb') as input_file:
+        input_stream = _map_file(input_file)
+
+    dump = processor._parse_header_and_toc(input_stream)
+    processor._load_rules(dump)
+    _block_worker = (processor, input_stream, dump)
+
+
+def _process_block_to_spool(start: Offset) -> str:
+    """
+    Обработка блока данных в процессе пула.
+    :param start: позиция блока в файле
+    :return: путь к временному файлу с обработанным блоком
+    """
+    if _block_worker is None:
+        message = 'Worker is not initialized.'
+        raise PgDumpError(message)
+
+    processor, input_stream, dump = _block_worker
+    return processor.process_spool_block(input_stream, start, dump)
+
+
+OUTPUT_COMPRESSION_METHODS = ('none', 'zlib', 'lz4', 'zstd')
 
 
 class CustomObfuscator(PlainObfuscator):
     """Главный класс для работы с обфускатором."""
 
+    def __init__(
+        self,
+        *args: Any,
+        use_temp_files: bool = False,
+        use_threads: bool = False,
+        compression_threads: int = 0,
+        output_compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Метод инициализации класса.
+        :param use_temp_files: обрабатывать сжатые блоки через временные файлы (резервный вариант)
+        :param use_threads: выполнять распаковку и сжатие в отдельных потоках параллельно с мутацией
+        :param compression_threads: количество потоков для параллельного сжатия блоков zlib
+        :param output_compression: метод сжатия результата: none, zlib, lz4 или zstd (None - как во входном дампе)
+        :param compression_level: уровень сжатия результата (None - по умолчанию для метода)
+        :param args: позиционные параметры PlainObfuscator
+        :param kwargs: именованные параметры PlainObfuscator
+        """
+        super().__init__(*args, **kwargs)
+        self.use_temp_files = use_temp_files
+        self.use_threads = use_threads
+        self.compression_threads = compression_threads
+        self.output_compression = output_compression
+        self.compression_level = compression_level
+        if output_compression is not None and output_compression not in OUTPUT_COMPRESSION_METHODS:
+            message = f'Unsupported output compression: {output_compression}'
+            raise ValueError(message)
+
+        if output_compression is not None:
+            # Недоступный кодек (например, zstd без зависимостей) обнаруживается до чтения дампа
+            get_codec(output_compression)
+
+    def get_block_options(self) -> BlockOptions:
+        """
+        Параметры обработки сжатых блоков данных.
+        :return: параметры обработки
+        """
+        return BlockOptions(
+            use_temp_files=self.use_temp_files,
+            use_threads=self.use_threads,
+            compression_threads=self.compression_threads,
+            output_compression=CompressionMethod(self.output_compression) if self.output_compression else None,
+            compression_level=self.compression_level,
+        )
+
+    def _get_worker_kwargs(self) -> dict:
+        """
+        Параметры для создания обфускатора в процессах пула.
+        :return: именованные параметры обфускатора
+        """
+        return {
+            **super()._get_worker_kwargs(),
+            'use_temp_files': self.use_temp_files,
+            'use_threads': self.use_threads,
+            'compression_threads': self.compression_threads,
+            'output_compression': self.output_compression,
+            'compression_level': self.compression_level,
+        }
+
     @staticmethod
     def cleanup_tmp_files(*, prefix: str) -> None:
         """Удаляет файлы с указанным префиксом"""
@@ -1174,11 +2373,39 @@ class CustomObfuscator(PlainObfuscator):
                 message = f'Error cleaning up file {file_path}: {e}'
                 raise PgDumpError(message) from e
 
-    def run(self, *, stdin=None) -> None:
+    @staticmethod
+    def _resolve_input_path(stream: BinaryIO) -> Optional[str]:
+        """
+        Определение пути к файлу входного потока (в том числе перенаправленного в stdin).
+        :param stream: входной поток
+        :return: путь к файлу или None
+        """
+        name = getattr(stream, 'name', None)
+        if isinstance(name, str) and os.path.isfile(name):
+            return name
+
+        with suppress(AttributeError, OSError, ValueError):
+            path = os.readlink(f'/proc/self/fd/{stream.fileno()}')
+            if os.path.isfile(path):
+                return path
+
+        return None
+
+    def run(self, *, stdin=None, stdout=None, input_path: Optional[str] = None) -> WriteStats:
         """
         Метод для запуска обфускации.
+        Если входной поток - файл и задано количество процессов, блоки данных таблиц обрабатываются параллельно.
         :param stdin: поток, с которого приходит информация в виде бинарных данных
+        :param stdout: бинарный поток для записи результата
+        :param input_path: путь к файлу дампа; файл отображается в память и читается по смещениям из TOC
+        :return: статистика записанных данных (архив не делится на строки, поэтому lines_written равно 0)
         """
+        if not stdout:
+            stdout = sys.stdout.buffer
+
+        if input_path:
+            return self._run_mapped(input_path=input_path, stdout=stdout)
+
         if not stdin:
             stdin = sys.stdin
 
@@ -1186,7 +2413,45 @@ class CustomObfuscator(PlainObfuscator):
             stdin = stdin.buffer
 
         try:
-            dump_processor = DumpProcessor(data_parser=PgStageParser(parser=self._parse_line))
-            return dump_processor.process_stream(stdin, sys.stdout.buffer)
+            data_parser = PgStageParser.from_obfuscator(self)
+            if self.workers > 0 and SeekableDumpProcessor._is_seekable(stdin):
+                seekable_processor = SeekableDumpProcessor(
+                    data_parser=data_parser,
+                    input_path=self._resolve_input_path(stdin),
+                    workers=self.workers,
+                    is_parallel_safe=self._is_copy_parallel_safe,
+                    options=self.get_block_options(),
+                    worker_kwargs=self._get_worker_kwargs(),
+                )
+                return WriteStats(bytes_written=seekable_processor.process_file(stdin, stdout), lines_written=0)
+
+            dump_processor = DumpProcessor(data_parser=data_parser, options=self.get_block_options())
+            return WriteStats(bytes_written=dump_processor.process_stream(stdin, stdout), lines_written=0)
         finally:
             self.cleanup_tmp_files(prefix=Constants.TMP_FILE_PREFIX)
+            self.close_stores()
+
+    def _run_mapped(self, *, input_path: str, stdout: BinaryIO) -> WriteStats:
+        """
+        Обфускация дампа из файла, отображенного в память.
+        :param input_path: путь к файлу дампа
+        :param stdout: бинарный поток для записи результата
+        :return: статистика записанных данных
+        """
+        dump_processor = SeekableDumpProcessor(
+            data_parser=PgStageParser.from_obfuscator(self),
+            input_path=input_path,
+            workers=self.workers,
+            is_parallel_safe=self._is_copy_parallel_safe,
+            options=self.get_block_options(),
+            worker_kwargs=self._get_worker_kwargs(),
+        )
+        try:
+            with open(input_path, 'rb') as input_file:
+                with _map_file(input_file) as mapping:
+                    bytes_written = dump_processor.process_file(mapping, stdout)
+        finally:
+            self.cleanup_tmp_files(prefix=Constants.TMP_FILE_PREFIX)
+            self.close_stores()
+
+        return WriteStats(bytes_written=bytes_written, lines_written=0)
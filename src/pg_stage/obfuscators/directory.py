@@ -0,0 +1,224 @@
+import gzip
+import os
+import random
+import shutil
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import IO, Any, BinaryIO, Dict, List, Optional, Tuple
+
+from mimesis.random import random as mimesis_random
+
+from pg_stage.compression import CompressingWriter, DecompressingReader, get_codec
+from pg_stage.obfuscators.custom import (
+    CompressionMethod,
+    Constants,
+    Dump,
+    DumpProcessor,
+    PgDumpError,
+    PgStageParser,
+    TocEntry,
+)
+from pg_stage.obfuscators.plain import PlainObfuscator
+
+TOC_FILE_NAME = 'toc.dat'
+DATA_FILE_SUFFIXES = ('', '.gz', '.lz4', '.zst')
+DATA_FILE_CODECS = {'.lz4': CompressionMethod.LZ4, '.zst': CompressionMethod.ZSTD}
+
+
+def find_data_file(path: str, filename: str) -> Optional[str]:
+    """
+    Поиск файла данных записи TOC с учетом расширения сжатия.
+    :param path: директория дампа
+    :param filename: имя файла из TOC
+    :return: имя найденного файла или None
+    """
+    for suffix in DATA_FILE_SUFFIXES:
+        if os.path.isfile(os.path.join(path, f'{filename}{suffix}')):
+            return f'{filename}{suffix}'
+
+    return None
+
+
+def open_data_file(path: str, mode: str) -> BinaryIO:
+    """
+    Открытие файла данных с распаковкой или сжатием по расширению.
+    :param path: путь к файлу
+    :param mode: режим открытия (rb или wb)
+    :return: бинарный поток
+    """
+    if path.endswith('.gz'):
+        return gzip.open(path, mode, compresslevel=Constants.COMPRESSION_LEVEL)  # type: ignore[return-value]
+
+    extension = os.path.splitext(path)[1]
+    if extension in DATA_FILE_CODECS:
+        try:
+            codec = get_codec(DATA_FILE_CODECS[extension].value)
+        except ValueError as error:
+            message = f'Unsupported data file compression: {path}: {error}'
+            raise PgDumpError(message) from error
+
+        if mode == 'rb':
+            return DecompressingReader(open(path, 'rb'), codec)  # type: ignore[return-value]
+
+        return CompressingWriter(open(path, 'wb'), codec)  # type: ignore[return-value]
+
+    return open(path, 'rb') if mode == 'rb' else open(path, 'wb')
+
+
+class DataFileProcessor(DumpProcessor):
+    """Процессор дампов, в которых данные каждой таблицы хранятся в отдельном файле (форматы directory и tar)."""
+
+    def process_data_stream(self, entry: TocEntry, input_stream: IO[bytes], output_stream: IO[bytes]) -> None:
+        """
+        Потоковая обработка данных таблицы.
+        :param entry: запись TOC с данными таблицы
+        :param input_stream: поток с исходными данными
+        :param output_stream: поток для записи результата
+        """
+        self._start_block(entry.copy_stmt)
+        while True:
+            chunk = input_stream.read(Constants.DEFAULT_BUFFER_SIZE)
+            if not chunk:
+                break
+
+            output_stream.write(self.data_parser.parse(chunk))
+
+        output_stream.write(self.data_parser.flush())
+
+
+class DirectoryDumpProcessor(DataFileProcessor):
+    """Процессор дампов в формате directory (pg_dump -Fd)."""
+
+    def __init__(self, data_parser: PgStageParser):
+        """
+        Инициализация процессора.
+        :param data_parser: обработчик данных
+        """
+        super().__init__(data_parser, archive_format=Constants.DIRECTORY_FORMAT)
+
+    def read_dump(self, path: str) -> Dump:
+        """
+        Чтение заголовка и TOC из файла toc.dat.
+        :param path: директория дампа
+        :return: объект дампа
+        """
+        with open(os.path.join(path, TOC_FILE_NAME), 'rb') as toc_file:
+            return self._parse_header_and_toc(toc_file)
+
+    def process_data_file(self, entry: TocEntry, input_path: str, output_path: str) -> None:
+        """
+        Обработка файла данных таблицы.
+        :param entry: запись TOC с данными таблицы
+        :param input_path: путь к исходному файлу данных
+        :param output_path: путь к файлу для записи результата
+        """
+        try:
+            with open_data_file(input_path, 'rb') as input_file, open_data_file(output_path, 'wb') as output_file:
+                self.process_data_stream(entry, input_file, output_file)
+        except (OSError, EOFError, ValueError, RuntimeError) as error:
+            message = f'Error processing data file {input_path}: {error}'
+            raise PgDumpError(message) from error
+
+
+class DirectoryObfuscator(PlainObfuscator):
+    """Класс для работы с обфускатором в формате directory (pg_dump -Fd)."""
+
+    def _create_processor(self) -> DirectoryDumpProcessor:
+        """
+        Создание процессора дампа, который обрабатывает данные этим обфускатором.
+        :return: процессор дампа
+        """
+        return DirectoryDumpProcessor(
+            data_parser=PgStageParser.from_obfuscator(self),
+        )
+
+    def run(self, *, input_path: str, output_path: str) -> None:  # type: ignore[override]
+        """
+        Метод для запуска обфускации.
+        Файлы данных таблиц обрабатываются пулом процессов (если задано количество процессов),
+        остальные файлы копируются без изменений.
+        :param input_path: директория исходного дампа
+        :param output_path: директория для записи результата
+        """
+        processor = self._create_processor()
+        dump = processor.read_dump(input_path)
+        processor._load_rules(dump)
+        os.makedirs(output_path, exist_ok=True)
+
+        tasks: List[Tuple[TocEntry, str]] = []
+        for entry in dump.get_table_data_entries():
+            filename = find_data_file(input_path, entry.filename) if entry.filename else None
+            # Файлы таблиц без правил обфускации копируются вместе с остальными файлами без распаковки
+            if filename and not processor._is_pass_through_entry(entry):
+                tasks.append((entry, filename))
+
+        data_files = {filename for _, filename in tasks}
+        for filename in os.listdir(input_path):
+            if filename not in data_files and os.path.isfile(os.path.join(input_path, filename)):
+                shutil.copy2(os.path.join(input_path, filename), os.path.join(output_path, filename))
+
+        executor = None
+        if self.workers > 0:
+            executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_directory_worker,
+                initargs=(input_path, self._get_worker_kwargs()),
+            )
+
+        try:
+            futures: List[Future] = []
+            local_tasks = []
+            for entry, filename in tasks:
+                paths = (os.path.join(input_path, filename), os.path.join(output_path, filename))
+                if processor._is_deleted_entry(entry):
+                    # Файл удаляемой таблицы не читается, вместо него записывается пустой файл с тем же сжатием
+                    with open_data_file(paths[1], 'wb'):
+                        pass
+                elif executor and entry.copy_stmt and self._is_copy_parallel_safe(copy_line=entry.copy_stmt):
+                    futures.append(executor.submit(_process_directory_file, entry.dump_id, *paths))
+                else:
+                    local_tasks.append((entry, paths))
+
+            # Таблицы со связями и уникальными значениями обрабатываются в текущем процессе, пока работает пул
+            for entry, (source_path, target_path) in local_tasks:
+                processor.process_data_file(entry, source_path, target_path)
+
+            for future in futures:
+                future.result()
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+            self.close_stores()
+
+
+_directory_worker: Optional[Tuple[DirectoryDumpProcessor, Dict[int, TocEntry]]] = None
+
+
+def _init_directory_worker(input_path: str, worker_kwargs: Dict[str, Any]) -> None:
+    """
+    Инициализация процесса пула: собственный обфускатор и правила из toc.dat.
+    :param input_path: директория дампа
+    :param worker_kwargs: параметры обфускатора
+    """
+    global _directory_worker
+    random.seed()
+    mimesis_random.seed()
+    processor = DirectoryObfuscator(**worker_kwargs)._create_processor()
+    dump = processor.read_dump(input_path)
+    processor._load_rules(dump)
+    _directory_worker = (processor, {entry.dump_id: entry for entry in dump.get_table_data_entries()})
+
+
+def _process_directory_file(dump_id: int, input_path: str, output_path: str) -> None:
+    """
+    Обработка файла данных таблицы в процессе пула.
+    :param dump_id: ID записи дампа
+    :param input_path: путь к исходному файлу данных
+    :param output_path: путь к файлу для записи результата
+    """
+    if _directory_worker is None:
+        message = 'Worker is not initialized.'
+        raise PgDumpError(message)
+
+    processor, entries = _directory_worker
+    processor.process_data_file(entries[dump_id], input_path, output_path)
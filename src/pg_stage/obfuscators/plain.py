@@ -1,12 +1,22 @@
 import json
+import random
 import re
 import sys
-from collections import defaultdict
-from typing import Dict, List, Optional, Set
-from uuid import uuid4
+from collections import defaultdict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from typing import Any, AnyStr, Callable, Deque, Dict, List, Optional, Set
 
+from mimesis.random import random as mimesis_random
+
+from pg_stage.conditions import compile_conditions, iter_condition_columns
+from pg_stage.encoding import DECODE_ERRORS, get_python_encoding
 from pg_stage.mutator import Mutator
-from pg_stage.types import ConditionTypeMany, MapTablesValueTypeMany
+from pg_stage.plan import ColumnPlan, MutationPlan, TablePlan
+from pg_stage.relations import RelationStore, relation_space
+from pg_stage.streams import DEFAULT_OUTPUT_BUFFER_SIZE, LineReader, OutputWriter, WriteStats
+from pg_stage.types import MapTablesValueTypeMany
+from pg_stage.uniqueness import DEFAULT_BLOOM_CAPACITY, UniquenessRegistry
 
 
 class PlainObfuscator:
@@ -15,25 +25,77 @@ class PlainObfuscator:
     copy_parse_pattern = r'COPY ([\d\w\_\.]+) \(([\w\W]+)\) FROM stdin;'
     comment_table_parse_pattern = r'COMMENT ON TABLE ([\d\w\_\.]*) IS \'anon: ([\w\W]*)\'\;'
     comment_column_parse_pattern = r'COMMENT ON COLUMN ([\d\w\_\.]+) IS \'anon: ([\w\W]*)\'\;'
+    client_encoding_parse_pattern = r'SET client_encoding = \'([\w\-]+)\';'
 
     def __init__(
         self,
         delimiter: str = '\t',
         locale: str = 'en',
         delete_tables_by_pattern: Optional[List[str]] = None,
+        *,
+        output_buffer_size: int = DEFAULT_OUTPUT_BUFFER_SIZE,
+        binary: bool = False,
+        workers: int = 0,
+        worker_batch_size: int = 10000,
+        relation_cache_size: Optional[int] = None,
+        relation_spill_directory: Optional[str] = None,
+        relation_store_path: Optional[str] = None,
+        deterministic: bool = False,
+        unique_mode: str = 'memory',
+        unique_lifetime: str = 'schema',
+        unique_bloom_capacity: int = DEFAULT_BLOOM_CAPACITY,
+        pool_size: int = 0,
+        pool_refresh: Optional[int] = None,
     ) -> None:
         """
         Метод инициализации класса.
         :param delimiter: разделитель
         :param locale: локализация для Faker
         :param delete_tables_by_pattern: список таблиц, которые нужно очистить по паттерну
+        :param output_buffer_size: размер буфера записи в байтах (меньше для pipe, больше для файлов)
+        :param binary: читать stdin как байты; декодируются только поля, которые затрагивают мутации
+        :param workers: количество процессов для мутации строк блоков COPY (0 - обработка в текущем процессе)
+        :param worker_batch_size: количество строк в одном задании для процесса
+        :param relation_cache_size: количество связей в памяти, остальные выгружаются во временную базу sqlite
+            (None - все связи хранятся в памяти)
+        :param relation_spill_directory: директория для временной базы связей
+        :param relation_store_path: путь к постоянной базе связей (sqlite), общей для разных запусков и дампов
+        :param deterministic: результат мутаций определяется HMAC исходного значения (нужны SECRET_KEY
+            и SECRET_KEY_NONCE), одинаковые значения мутируются одинаково без хранения связей
+        :param unique_mode: хранение уникальных значений колонок: memory (хеши в памяти), bloom (фильтр Блума)
+            или disk (временная база sqlite)
+        :param unique_lifetime: время жизни уникальных значений: table, schema (до смены схемы) или run
+        :param unique_bloom_capacity: ожидаемое количество уникальных значений колонки для режима bloom
+        :param pool_size: размер пулов заранее сгенерированных имен, фамилий, email и адресов (0 - без пулов)
+        :param pool_refresh: количество значений, после выдачи которых пул генерируется заново (None - не обновлять)
         """
         self.delimiter = delimiter
+        self.locale = locale
+        self.output_buffer_size = output_buffer_size
+        self.binary = binary
+        self.workers = workers
+        self.worker_batch_size = worker_batch_size
+        self.deterministic = deterministic
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._encoding = 'utf-8'
         self.delete_tables_by_pattern: List[str] = delete_tables_by_pattern or []
         self._map_tables: Dict[str, Dict[str, MapTablesValueTypeMany]] = defaultdict(dict)
-        self._mutator = Mutator(locale=locale)
-        self._relation_values: Dict[str, str] = {}
-        self._relation_fk: Dict[str, Dict[str, Dict[str, str]]] = defaultdict(dict)
+        self._mutator = Mutator(
+            locale=locale,
+            deterministic=deterministic,
+            pool_size=pool_size,
+            pool_refresh=pool_refresh,
+        )
+        self._relations = RelationStore(
+            hot_size=relation_cache_size,
+            spill_directory=relation_spill_directory,
+            path=relation_store_path,
+        )
+        self._uniqueness = UniquenessRegistry(
+            mode=unique_mode,
+            lifetime=unique_lifetime,
+            bloom_capacity=unique_bloom_capacity,
+        )
         self._is_data: bool = False
         self._schema_name: Optional[str] = None
         self._table_name: str = ''
@@ -41,6 +103,10 @@ class PlainObfuscator:
         self._enumerate_table_columns: Dict[str, int] = {}
         self._delete_tables: Set[str] = set()
         self._is_delete: bool = False
+        self._table_plan: Optional[TablePlan] = None
+        self._is_pass_through: bool = False
+        self._is_parallel: bool = False
+        self._worker_copy_line: Optional[str] = None
 
     def _prepare_variables(self, *, line: str) -> Optional[str]:
         """
@@ -53,44 +119,23 @@ class PlainObfuscator:
         self._table_columns = []
         self._enumerate_table_columns = {}
         self._is_delete = False
+        self._table_plan = None
+        self._is_pass_through = False
+        self._is_parallel = False
         return line
 
-    def _checking_conditions(self, *, conditions: ConditionTypeMany, table_values: List[str]) -> bool:
+    def _get_mutation_func(self, *, mutation_name: str) -> Callable[..., Optional[str]]:
         """
-        Метод для проверки условий обфускации.
-        :param conditions: условия
-        :param table_values: значения вставляемой строки из дампа
-        :return: флаг об выполнение обфускации для столбца
+        Метод для получения функции мутации по названию.
+        :param mutation_name: название мутации
+        :return: функция мутации
         """
-        if not conditions:
-            return True
-
-        flag = False
-        for condition in conditions:
-            if flag:
-                break
-
-            column_name = condition['column_name']
-            operation = condition['operation']
-            value = condition['value']
-
-            column_value = table_values[self._enumerate_table_columns[column_name]]
-            if operation == 'equal':
-                flag = column_value == value
-                continue
-
-            if operation == 'not_equal':
-                flag = column_value != value
-                continue
-
-            if operation == 'by_pattern':
-                flag = re.search(pattern=value, string=column_value) is not None
-                continue
-
-            msg = 'Invalid condition operation.'
+        mutation_func = getattr(self._mutator, f'mutation_{mutation_name}', None)
+        if not mutation_func:
+            msg = f'Not found mutation {mutation_name}.'
             raise ValueError(msg)
 
-        return flag
+        return mutation_func
 
     def _parse_comment_column(self, *, line: str) -> str:
         """
@@ -109,10 +154,7 @@ class PlainObfuscator:
 
         for mutation_param in mutations_params:
             mutation_name = mutation_param['mutation_name']
-            mutation_func = getattr(self._mutator, f'mutation_{mutation_name}', None)
-            if not mutation_func:
-                msg = f'Not found mutation {mutation_name}.'
-                raise ValueError(msg)
+            mutation_func = self._get_mutation_func(mutation_name=mutation_name)
 
             try:
                 table_name, column_name = result.group(1).split('.')
@@ -133,6 +175,18 @@ class PlainObfuscator:
 
         return line
 
+    def _parse_client_encoding(self, *, line: str) -> str:
+        """
+        Метод для определения кодировки данных дампа.
+        :param line: строка sql
+        :return: строка sql
+        """
+        result = re.search(pattern=self.client_encoding_parse_pattern, string=line)
+        if result:
+            self._encoding = get_python_encoding(result.group(1))
+
+        return line
+
     def _parse_comment_table(self, *, line: str) -> str:
         """
         Метод для обработки комментария таблицы.
@@ -169,95 +223,232 @@ class PlainObfuscator:
             independent_columns.append(column_name)
         return independent_columns + dependent_columns
 
-    def _prepared_data(self, *, line: str) -> Optional[str]:
+    def _compile_table_plan(self) -> Optional[TablePlan]:
         """
-        Метод для обработки данных.
-        :return: Новая строка с данными
+        Метод для построения плана обработки строк текущей таблицы.
+        :return: план обработки или None, если для таблицы нет мутаций
         """
-        if self._is_delete:
-            return None
-
         table_mutations_by_column = self._map_tables.get(self._table_name)
         if not table_mutations_by_column:
-            return line
-
-        sorted_columns = self._sort_columns_by_source_column_exists(table_mutations_by_column)
+            return None
 
-        obfuscated_values = {}
-        table_values = line.split(self.delimiter)
-        for column_name in sorted_columns:
-            column_index = self._enumerate_table_columns[column_name]
+        columns: List[ColumnPlan] = []
+        uses_obfuscated_values = False
+        read_indexes: Set[int] = set()
+        for column_name in self._sort_columns_by_source_column_exists(table_mutations_by_column):
             mutations_for_column = table_mutations_by_column.get(column_name)
             if not mutations_for_column:
-                obfuscated_values[column_name] = table_values[column_index]
                 continue
 
-            is_obfuscated = False
-            len_mutations_for_column = len(mutations_for_column)
-            for mutation_index, mutation_for_column in enumerate(mutations_for_column):
-                if is_obfuscated:
-                    break
-
-                mutation_func = mutation_for_column['mutation_func']
+            mutations: List[MutationPlan] = []
+            for mutation_for_column in mutations_for_column:
                 mutation_kwargs = mutation_for_column['mutation_kwargs']
                 mutation_relations = mutation_for_column['mutation_relations']
-                mutation_conditions = mutation_for_column['mutation_conditions']
+                func: Callable[..., Optional[str]] = partial(mutation_for_column['mutation_func'], **mutation_kwargs)
+
+                constant = None
+                if mutation_for_column['mutation_name'] in Mutator.constant_mutations and not mutation_relations:
+                    constant = func()
+                elif self.deterministic:
+                    # Ключ колонки - мутация с параметрами: одинаковые правила в разных таблицах дают одинаковый результат
+                    key = json.dumps([mutation_for_column['mutation_name'], mutation_kwargs], sort_keys=True)
+                    func = self._mutator.make_deterministic(func, key=key)
+
+                if mutation_kwargs.get('unique'):
+                    scope = self._uniqueness.scope(f'{self._table_name}.{column_name}')
+                    func = self._mutator.make_unique_scoped(func, scope=scope)
+
+                relation_lookups = tuple(
+                    (
+                        relation_space(relation['table_name'], relation['column_name'], relation['to_column_name']),
+                        self._enumerate_table_columns[relation['from_column_name']],
+                    )
+                    for relation in mutation_relations
+                )
+                relation_stores = tuple(
+                    (
+                        relation_space(self._table_name, column_name, from_column_name),
+                        self._enumerate_table_columns[from_column_name],
+                    )
+                    for from_column_name in dict.fromkeys(
+                        relation['from_column_name'] for relation in mutation_relations
+                    )
+                )
+                if self._relations.is_persistent:
+                    # Значения прошлых запусков ищутся и по собственным ключам колонки
+                    relation_lookups += tuple(slot for slot in relation_stores if slot not in relation_lookups)
+
+                is_dependent = 'source_column' in mutation_kwargs
+                uses_obfuscated_values = uses_obfuscated_values or is_dependent
+                if is_dependent:
+                    read_indexes.add(self._enumerate_table_columns[mutation_kwargs['source_column']])
+
+                read_indexes.update(from_index for _, from_index in relation_lookups)
+                conditions = mutation_for_column['mutation_conditions']
+                read_indexes.update(
+                    self._enumerate_table_columns[condition_column]
+                    for condition_column in iter_condition_columns(conditions)
+                )
+                mutations.append(
+                    MutationPlan(
+                        func=func,
+                        condition=compile_conditions(conditions, self._enumerate_table_columns),
+                        constant=constant,
+                        relation_lookups=relation_lookups,
+                        relation_stores=relation_stores,
+                        uses_obfuscated_values=is_dependent,
+                    ),
+                )
+
+            read_indexes.add(self._enumerate_table_columns[column_name])
+            columns.append(
+                ColumnPlan(
+                    name=column_name,
+                    index=self._enumerate_table_columns[column_name],
+                    mutations=tuple(mutations),
+                ),
+            )
 
-                # Сохранить текущее значение для обработки в Mutator
-                mutation_kwargs['current_value'] = table_values[column_index]
+        if not columns:
+            return None
 
-                if not self._checking_conditions(conditions=mutation_conditions, table_values=table_values):
-                    if mutation_index + 1 == len_mutations_for_column:
-                        obfuscated_values[column_name] = table_values[column_index]
-                        break
+        return TablePlan(
+            table_name=self._table_name,
+            column_names=tuple(self._table_columns),
+            columns=tuple(columns),
+            uses_obfuscated_values=uses_obfuscated_values,
+            read_indexes=tuple(sorted(read_indexes)),
+        )
 
+    def _apply_table_plan(self, *, plan: TablePlan, table_values: List[str]) -> List[str]:
+        """
+        Метод для применения плана обработки к значениям строки.
+        :param plan: план обработки таблицы
+        :param table_values: исходные значения строки из дампа
+        :return: новые значения строки
+        """
+        values = table_values.copy()
+        obfuscated_values = dict(zip(plan.column_names, values)) if plan.uses_obfuscated_values else None
+        for column in plan.columns:
+            index = column.index
+            for mutation in column.mutations:
+                if mutation.condition is not None and not mutation.condition(table_values):
                     continue
 
-                if 'source_column' in mutation_kwargs:
-                    mutation_kwargs['obfuscated_values'] = obfuscated_values
+                new_value = mutation.constant
+                if new_value is None:
+                    new_value = self._mutate_value(
+                        mutation=mutation,
+                        table_values=table_values,
+                        current_value=table_values[index],
+                        obfuscated_values=obfuscated_values,
+                    )
+                    if new_value is None:
+                        # Мутация не вернула значение (например, пустой номер телефона): значение не меняется
+                        new_value = table_values[index]
 
-                if not mutation_relations:
-                    is_obfuscated = True
-                    obfuscated_values[column_name] = mutation_func(**mutation_kwargs)
-                    continue
+                values[index] = new_value
+                if obfuscated_values is not None:
+                    obfuscated_values[column.name] = new_value
 
-                new_value = None
-                for mutation_relation in mutation_relations:
-                    key_table = f'{mutation_relation["table_name"]}:{mutation_relation["column_name"]}'
-                    from_column_name = mutation_relation['from_column_name']
-                    to_column_name = mutation_relation['to_column_name']
-                    relation_key_value = table_values[self._enumerate_table_columns[from_column_name]]
-                    relation_fk = self._relation_fk.get(key_table, {}).get(to_column_name, {}).get(relation_key_value)
-                    if not relation_fk:
-                        continue
-
-                    new_value = self._relation_values.get(relation_fk)
-                    if new_value is None:
-                        msg = 'Invalid relation fk!'
-                        raise ValueError(msg)
+                break
 
-                    break
+        return values
 
-                if new_value is None:
-                    relation_fk = str(uuid4())
-                    new_value = mutation_func(**mutation_kwargs)
-                    for mutation_relation in mutation_relations:
-                        key_table = f'{self._table_name}:{column_name}'
-                        from_column_name = mutation_relation['from_column_name']
-                        relation_key_value = table_values[self._enumerate_table_columns[from_column_name]]
-                        self._relation_fk[key_table].setdefault(from_column_name, {})
-                        self._relation_fk[key_table][from_column_name][relation_key_value] = relation_fk
+    def _mutate_value(
+        self,
+        *,
+        mutation: MutationPlan,
+        table_values: List[str],
+        current_value: str,
+        obfuscated_values: Optional[Dict[str, str]],
+    ) -> Optional[str]:
+        """
+        Метод для получения нового значения колонки с учетом связанных таблиц.
+        :param mutation: скомпилированная мутация
+        :param table_values: исходные значения строки из дампа
+        :param current_value: текущее значение колонки
+        :param obfuscated_values: уже обработанные значения строки (для мутаций с `source_column`)
+        :return: новое значение или None, если мутация не вернула значение
+        """
+        if mutation.uses_obfuscated_values:
+            kwargs = {'current_value': current_value, 'obfuscated_values': obfuscated_values}
+        else:
+            kwargs = {'current_value': current_value}
 
-                    self._relation_values[relation_fk] = new_value
+        if not mutation.relation_lookups:
+            return mutation.func(**kwargs)
 
-                obfuscated_values[column_name] = new_value
-                is_obfuscated = True
+        for space, from_index in mutation.relation_lookups:
+            handle = self._relations.find(space, table_values[from_index])
+            if handle is None:
+                continue
 
-        sorted_result: list[str] = []
-        for column_name, _ in self._enumerate_table_columns.items():
-            sorted_result.append(obfuscated_values[column_name])
+            new_value = self._relations.value(handle)
+            if new_value is None:
+                msg = 'Invalid relation fk!'
+                raise ValueError(msg)
 
-        return self.delimiter.join(sorted_result)
+            return new_value
+
+        new_value = mutation.func(**kwargs)
+        if new_value is None:
+            # Значение не изменяется, поэтому связь не сохраняется
+            return None
+
+        handle = self._relations.add(new_value)
+        for space, from_index in mutation.relation_stores:
+            self._relations.bind(space, table_values[from_index], handle)
+
+        return new_value
+
+    def _prepared_data(self, *, line: str) -> Optional[str]:
+        """
+        Метод для обработки данных.
+        :return: Новая строка с данными
+        """
+        if self._is_delete:
+            return None
+
+        plan = self._table_plan
+        if plan is None:
+            return line
+
+        table_values = line.split(self.delimiter)
+        return self.delimiter.join(self._apply_table_plan(plan=plan, table_values=table_values))
+
+    def _prepared_data_bytes(self, *, line: bytes) -> Optional[bytes]:
+        """
+        Метод для обработки данных в байтах.
+        Декодируются только поля, которые читают мутации; неизмененные строки возвращаются как есть.
+        :param line: строка данных в кодировке дампа
+        :return: новая строка с данными
+        """
+        if self._is_delete:
+            return None
+
+        plan = self._table_plan
+        if plan is None:
+            return line
+
+        delimiter = self.delimiter.encode(self._encoding)
+        raw_values = line.split(delimiter)
+        table_values: List[Any] = raw_values.copy()
+        for index in plan.read_indexes:
+            table_values[index] = raw_values[index].decode(self._encoding, DECODE_ERRORS)
+
+        values = self._apply_table_plan(plan=plan, table_values=table_values)
+        is_changed = False
+        for column in plan.columns:
+            index = column.index
+            if values[index] is not table_values[index]:
+                raw_values[index] = values[index].encode(self._encoding, DECODE_ERRORS)
+                is_changed = True
+
+        if not is_changed:
+            return line
+
+        return delimiter.join(raw_values)
 
     def _parse_copy_values(self, *, line: str) -> Optional[str]:
         """
@@ -274,16 +465,23 @@ class PlainObfuscator:
         except ValueError:
             schema_name = None
 
-        if self._schema_name != schema_name:
+        is_new_schema = self._schema_name != schema_name
+        if is_new_schema:
             # Если произошла смена схемы БД, то сбрасываем накопившиеся уникальные значения для ускорения работы
             self._mutator.clear_unique_values()
 
+        self._uniqueness.start_table(is_new_schema=is_new_schema)
+
         self._schema_name = schema_name
         self._table_name = result.group(1)
         self._table_columns = [item.strip() for item in result.group(2).split(',')]
         self._enumerate_table_columns = {column_name: index for index, column_name in enumerate(self._table_columns)}
-        self._is_delete = self._table_name in self._delete_tables or any(
-            re.search(pattern, self._table_name) for pattern in self.delete_tables_by_pattern
+        self._is_delete = self._is_table_deleted(table_name=self._table_name)
+        self._table_plan = None if self._is_delete else self._compile_table_plan()
+        # Данные таблицы без мутаций можно копировать блоками без разбора строк
+        self._is_pass_through = not self._is_delete and self._table_plan is None
+        self._is_parallel = (
+            self.workers > 0 and self._table_plan is not None and self._is_parallel_safe(table_name=self._table_name)
         )
         self._is_data = True
         return line
@@ -309,17 +507,308 @@ class PlainObfuscator:
         if line.startswith('COPY'):
             return self._parse_copy_values(line=line)
 
+        if line.startswith('SET client_encoding'):
+            return self._parse_client_encoding(line=line)
+
         return line
 
-    def run(self, *, stdin=None) -> None:
+    def _parse_line_bytes(self, *, line: bytes) -> Optional[bytes]:
+        """
+        Метод для парсинга строки из дампа в байтах.
+        :param line: строка sql в кодировке дампа
+        :return: обработанная строка sql
+        """
+        if self._is_data and not line.startswith(b'\\.'):
+            return self._prepared_data_bytes(line=line)
+
+        text_line = line.decode(self._encoding, DECODE_ERRORS)
+        new_line = self._parse_line(line=text_line)
+        if new_line is None:
+            return None
+
+        if new_line is text_line:
+            return line
+
+        return new_line.encode(self._encoding, DECODE_ERRORS)
+
+    def _is_parallel_safe(self, *, table_name: str) -> bool:
+        """
+        Метод для проверки, можно ли обрабатывать строки таблицы в разных процессах.
+        Связи и уникальные значения требуют общего состояния, поэтому такие таблицы обрабатываются последовательно.
+        :param table_name: название таблицы
+        :return: флаг возможности параллельной обработки
+        """
+        for mutations_for_column in self._map_tables.get(table_name, {}).values():
+            for mutation_for_column in mutations_for_column:
+                if mutation_for_column['mutation_relations'] or mutation_for_column['mutation_kwargs'].get('unique'):
+                    return False
+
+        return True
+
+    def _is_table_deleted(self, *, table_name: str) -> bool:
+        """
+        Метод для проверки, удаляются ли данные таблицы (правило delete или delete_tables_by_pattern).
+        :param table_name: название таблицы
+        :return: флаг удаления данных таблицы
+        """
+        return table_name in self._delete_tables or any(
+            re.search(pattern, table_name) for pattern in self.delete_tables_by_pattern
+        )
+
+    def _parse_copy_table_name(self, *, copy_line: str) -> Optional[str]:
+        """
+        Метод для получения названия таблицы из строки COPY без изменения состояния обфускатора.
+        :param copy_line: строка COPY таблицы
+        :return: название таблицы или None, если строка не является командой COPY
+        """
+        result = re.search(pattern=self.copy_parse_pattern, string=copy_line)
+        if not result:
+            return None
+
+        return result.group(1)
+
+    def _is_copy_parallel_safe(self, *, copy_line: str) -> bool:
+        """
+        Метод для проверки, можно ли обработать все данные таблицы в отдельном процессе.
+        :param copy_line: строка COPY таблицы
+        :return: флаг возможности обработки в отдельном процессе
+        """
+        table_name = self._parse_copy_table_name(copy_line=copy_line)
+        return table_name is not None and self._is_parallel_safe(table_name=table_name)
+
+    def _is_copy_pass_through(self, *, copy_line: str) -> bool:
+        """
+        Метод для проверки, можно ли скопировать данные таблицы без изменений (нет мутаций и удаления).
+        :param copy_line: строка COPY таблицы
+        :return: флаг копирования данных без обработки
+        """
+        table_name = self._parse_copy_table_name(copy_line=copy_line)
+        if table_name is None or self._is_table_deleted(table_name=table_name):
+            return False
+
+        return not any(self._map_tables.get(table_name, {}).values())
+
+    def _is_copy_deleted(self, *, copy_line: str) -> bool:
+        """
+        Метод для проверки, удаляются ли данные таблицы (правило delete или delete_tables_by_pattern).
+        :param copy_line: строка COPY таблицы
+        :return: флаг удаления данных таблицы
+        """
+        table_name = self._parse_copy_table_name(copy_line=copy_line)
+        return table_name is not None and self._is_table_deleted(table_name=table_name)
+
+    def close_stores(self) -> None:
+        """Метод для закрытия хранилищ связей и уникальных значений (временные базы удаляются)."""
+        self._relations.close()
+        self._uniqueness.close()
+
+    def _get_worker_kwargs(self) -> Dict[str, Any]:
+        """
+        Метод для получения параметров создания обфускатора в процессах пула.
+        :return: именованные параметры обфускатора
+        """
+        return {
+            'delimiter': self.delimiter,
+            'locale': self.locale,
+            'delete_tables_by_pattern': self.delete_tables_by_pattern,
+            'deterministic': self.deterministic,
+            'unique_mode': self._uniqueness.mode,
+            'unique_lifetime': self._uniqueness.lifetime,
+            'unique_bloom_capacity': self._uniqueness.bloom_capacity,
+            'pool_size': self._mutator.pool_size,
+            'pool_refresh': self._mutator.pool_refresh,
+        }
+
+    def _get_table_rules(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Метод для получения мутаций текущей таблицы без привязки к мутатору (для передачи в другой процесс).
+        :return: мутации по колонкам
+        """
+        return {
+            column_name: [
+                {key: value for key, value in mutation_for_column.items() if key != 'mutation_func'}
+                for mutation_for_column in mutations_for_column
+            ]
+            for column_name, mutations_for_column in self._map_tables[self._table_name].items()
+        }
+
+    def _process_rows_batch(
+        self,
+        *,
+        copy_line: str,
+        table_rules: Dict[str, List[Dict[str, Any]]],
+        encoding: str,
+        rows: List[AnyStr],
+    ) -> AnyStr:
+        """
+        Метод для обработки батча строк данных в процессе пула.
+        :param copy_line: строка COPY таблицы
+        :param table_rules: мутации таблицы по колонкам
+        :param encoding: кодировка данных дампа
+        :param rows: строки данных без перевода строки
+        :return: обработанные строки, объединенные переводами строк
+        """
+        if copy_line != self._worker_copy_line:
+            self._encoding = encoding
+            self._parse_copy_values(line=copy_line)
+            self._map_tables[self._table_name] = {
+                column_name: [
+                    {
+                        'mutation_name': mutation_for_column['mutation_name'],
+                        'mutation_func': self._get_mutation_func(mutation_name=mutation_for_column['mutation_name']),
+                        'mutation_kwargs': mutation_for_column['mutation_kwargs'],
+                        'mutation_relations': mutation_for_column['mutation_relations'],
+                        'mutation_conditions': mutation_for_column['mutation_conditions'],
+                    }
+                    for mutation_for_column in mutations_for_column
+                ]
+                for column_name, mutations_for_column in table_rules.items()
+            }
+            self._table_plan = self._compile_table_plan()
+            self._worker_copy_line = copy_line
+
+        if rows and isinstance(rows[0], bytes):
+            new_rows: List[Any] = [self._prepared_data_bytes(line=row) for row in rows]
+            return b''.join(row + b'\n' for row in new_rows)  # type: ignore[return-value]
+
+        new_rows = [self._prepared_data(line=row) for row in rows]  # type: ignore[arg-type]
+        return ''.join(row + '\n' for row in new_rows)  # type: ignore[return-value]
+
+    def _process_data_in_workers(self, *, lines: LineReader, writer: OutputWriter) -> None:
+        """
+        Метод для обработки данных блока COPY пулом процессов.
+        Строки отправляются батчами, результаты записываются в исходном порядке,
+        количество батчей в обработке ограничено удвоенным числом процессов.
+        :param lines: входной поток строк
+        :param writer: выходной поток
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_rows_worker,
+                initargs=(self._get_worker_kwargs(),),
+            )
+
+        newline: Any = b'\n' if lines.is_binary else '\n'
+        terminator: Any = b'\\.' if lines.is_binary else '\\.'
+        copy_line = f'COPY {self._table_name} ({", ".join(self._table_columns)}) FROM stdin;'
+        table_rules = self._get_table_rules()
+        in_flight: Deque[Future] = deque()
+        rows: List[Any] = []
+
+        def submit() -> None:
+            in_flight.append(
+                self._executor.submit(  # type: ignore[union-attr]
+                    _process_rows_batch,
+                    copy_line,
+                    table_rules,
+                    self._encoding,
+                    rows,
+                ),
+            )
+            if len(in_flight) >= 2 * self.workers:
+                writer.write(in_flight.popleft().result())
+
+        for line in lines:
+            if line.startswith(terminator):
+                lines.unread(line)
+                break
+
+            rows.append(line.rstrip(newline))
+            if len(rows) >= self.worker_batch_size:
+                submit()
+                rows = []
+
+        if rows:
+            submit()
+
+        while in_flight:
+            writer.write(in_flight.popleft().result())
+
+    def run(self, *, stdin=None, stdout=None) -> WriteStats:
         """
         Метод для запуска обфускации.
-        :param stdin: поток, с которого приходит информация в виде строк sql
+        :param stdin: поток, с которого приходит информация в виде строк sql (текстовый или бинарный)
+        :param stdout: текстовый или бинарный поток для записи результата
+        :return: статистика записанных данных
         """
         if not stdin:
-            stdin = sys.stdin
-
-        for line in stdin:
-            new_line = self._parse_line(line=line.rstrip('\n'))
-            if isinstance(new_line, str):
-                sys.stdout.write(new_line + '\n')
+            stdin = sys.stdin.buffer if self.binary else sys.stdin
+
+        writer = OutputWriter(stdout or sys.stdout, buffer_size=self.output_buffer_size)
+        if not hasattr(stdin, 'read'):
+            for line in stdin:
+                new_line = self._parse_line(line=line.rstrip('\n'))
+                if isinstance(new_line, str):
+                    writer.write_line(new_line)
+
+            writer.flush()
+            return writer.stats
+
+        lines = LineReader(stdin)
+        parse_line: Callable[..., Any]
+        if lines.is_binary:
+            parse_line = self._parse_line_bytes
+        else:
+            parse_line = self._parse_line
+
+        newline: Any = b'\n' if lines.is_binary else '\n'
+        try:
+            for line in lines:
+                new_line = parse_line(line=line.rstrip(newline))
+                if new_line is not None:
+                    writer.write_line(new_line)
+
+                if self._is_pass_through:
+                    lines.copy_data_block(writer.write)
+                elif self._is_parallel:
+                    self._process_data_in_workers(lines=lines, writer=writer)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+            self.close_stores()
+
+        writer.flush()
+        return writer.stats
+
+
+_worker_obfuscator: Optional[PlainObfuscator] = None
+
+
+def _init_rows_worker(worker_kwargs: Dict[str, Any]) -> None:
+    """
+    Инициализация процесса пула: собственный обфускатор и независимое состояние генераторов случайных чисел.
+    :param worker_kwargs: параметры обфускатора
+    """
+    global _worker_obfuscator
+    random.seed()
+    mimesis_random.seed()
+    _worker_obfuscator = PlainObfuscator(**worker_kwargs)
+
+
+def _process_rows_batch(
+    copy_line: str,
+    table_rules: Dict[str, List[Dict[str, Any]]],
+    encoding: str,
+    rows: List[AnyStr],
+) -> AnyStr:
+    """
+    Обработка батча строк в процессе пула.
+    :param copy_line: строка COPY таблицы
+    :param table_rules: мутации таблицы по колонкам
+    :param encoding: кодировка данных дампа
+    :param rows: строки данных без перевода строки
+    :return: обработанные строки
+    """
+    if _worker_obfuscator is None:
+        msg = 'Worker is not initialized.'
+        raise RuntimeError(msg)
+
+    return _worker_obfuscator._process_rows_batch(
+        copy_line=copy_line,
+        table_rules=table_rules,
+        encoding=encoding,
+        rows=rows,
+    )
@@ -0,0 +1,132 @@
+import copy
+import io
+import sys
+import tarfile
+import tempfile
+from typing import IO, Any, BinaryIO, Dict
+
+from pg_stage.obfuscators.custom import Constants, CountingWriter, Dump, PgDumpError, PgStageParser, TocEntry
+from pg_stage.obfuscators.directory import TOC_FILE_NAME, DataFileProcessor
+from pg_stage.obfuscators.plain import PlainObfuscator
+from pg_stage.streams import WriteStats
+
+SPOOL_MAX_SIZE = 64 * 1024 * 1024  # 64MB; обработанные данные большего размера выгружаются во временный файл
+
+
+class TarDumpProcessor(DataFileProcessor):
+    """Процессор дампов в формате tar (pg_dump -Ft)."""
+
+    def __init__(self, data_parser: PgStageParser):
+        """
+        Инициализация процессора.
+        :param data_parser: обработчик данных
+        """
+        super().__init__(data_parser, archive_format=Constants.TAR_FORMAT)
+
+    def process_stream(self, input_stream: BinaryIO, output_stream: BinaryIO) -> int:
+        """
+        Потоковая обработка архива: члены архива читаются и записываются по порядку без распаковки на диск.
+        :param input_stream: входной бинарный поток
+        :param output_stream: выходной бинарный поток
+        :return: количество записанных байт
+        """
+        entries: Dict[str, TocEntry] = {}
+        # В потоковом режиме tarfile только пишет в fileobj, поэтому достаточно обертки со счетчиком
+        written = CountingWriter(output_stream)
+        output_tar = tarfile.open(fileobj=written, mode='w|', format=tarfile.GNU_FORMAT)  # type: ignore[arg-type]
+        with tarfile.open(fileobj=input_stream, mode='r|') as input_tar, output_tar:
+            for member in input_tar:
+                source = input_tar.extractfile(member) if member.isfile() else None
+                if source is None:
+                    output_tar.addfile(member)
+                elif member.name == TOC_FILE_NAME:
+                    data = source.read()
+                    dump = self._parse_toc(data)
+                    entries = {entry.filename: entry for entry in dump.get_table_data_entries() if entry.filename}
+                    output_tar.addfile(member, io.BytesIO(data))
+                elif member.name in entries and self._is_deleted_entry(entries[member.name]):
+                    # Данные удаляемой таблицы пропускаются без чтения, в архив записывается пустой файл
+                    empty_member = copy.copy(member)
+                    empty_member.size = 0
+                    output_tar.addfile(empty_member, io.BytesIO())
+                elif member.name in entries and not self._is_pass_through_entry(entries[member.name]):
+                    self._process_member(entries[member.name], member, source, output_tar)
+                else:
+                    output_tar.addfile(member, source)
+
+        return written.position
+
+    def _parse_toc(self, data: bytes) -> Dump:
+        """
+        Разбор toc.dat и передача обработчику данных правил обфускации.
+        :param data: содержимое toc.dat
+        :return: объект дампа
+        """
+        dump = self._parse_header_and_toc(io.BytesIO(data))
+        self._load_rules(dump)
+        return dump
+
+    def _process_member(
+        self,
+        entry: TocEntry,
+        member: tarfile.TarInfo,
+        source: IO[bytes],
+        output_tar: tarfile.TarFile,
+    ) -> None:
+        """
+        Обработка файла данных таблицы.
+        Заголовок члена архива содержит размер, поэтому результат накапливается в памяти,
+        а при превышении SPOOL_MAX_SIZE - во временном файле.
+        :param entry: запись TOC с данными таблицы
+        :param member: заголовок члена архива
+        :param source: поток с данными члена архива
+        :param output_tar: выходной архив
+        """
+        with tempfile.SpooledTemporaryFile(
+            max_size=SPOOL_MAX_SIZE,
+            prefix=Constants.TMP_FILE_PREFIX,
+            dir=Constants.DEFAULT_TMP_DIR,
+        ) as spool:
+            try:
+                self.process_data_stream(entry, source, spool)
+            except (OSError, tarfile.TarError) as error:
+                message = f'Error processing tar member {member.name}: {error}'
+                raise PgDumpError(message) from error
+
+            new_member = copy.copy(member)
+            new_member.size = spool.tell()
+            spool.seek(0)
+            output_tar.addfile(new_member, spool)
+
+
+class TarObfuscator(PlainObfuscator):
+    """Класс для работы с обфускатором в формате tar (pg_dump -Ft)."""
+
+    def run(self, *, stdin=None, stdout=None) -> WriteStats:
+        """
+        Метод для запуска обфускации.
+        :param stdin: поток, с которого приходит архив в виде бинарных данных
+        :param stdout: бинарный поток для записи результата
+        :return: статистика записанных данных (архив не делится на строки, поэтому lines_written равно 0)
+        """
+        processor = TarDumpProcessor(
+            data_parser=PgStageParser.from_obfuscator(self),
+        )
+        try:
+            bytes_written = processor.process_stream(
+                _get_binary_stream(stdin or sys.stdin),
+                _get_binary_stream(stdout or sys.stdout),
+            )
+        finally:
+            self.close_stores()
+
+        return WriteStats(bytes_written=bytes_written, lines_written=0)
+
+
+def _get_binary_stream(stream: Any) -> BinaryIO:
+    """
+    Получение бинарного потока из текстового (например, sys.stdin).
+    :param stream: текстовый или бинарный поток
+    :return: бинарный поток
+    """
+    return getattr(stream, 'buffer', stream)
@@ -0,0 +1,83 @@
+from hashlib import blake2b
+from typing import Iterator, List
+
+FEISTEL_ROUNDS = 6
+_MIX_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK_64 = (1 << 64) - 1
+
+
+class FeistelPermutation:
+    """
+    Ключевая биекция отрезка [0, size) на себя.
+    Сеть Фейстеля переставляет числа из [0, 2^bits), где 2^bits < 4 * size; значения за пределами отрезка
+    шифруются повторно (cycle-walking), поэтому результат остается в отрезке и не повторяется.
+    Каждое значение вычисляется за O(1) без хранения выданных значений.
+    """
+
+    def __init__(self, size: int, key: int) -> None:
+        """
+        Метод инициализации класса.
+        :param size: размер отрезка
+        :param key: ключ перестановки (разные ключи дают разный порядок)
+        """
+        if size < 1:
+            message = 'Permutation size must be positive.'
+            raise ValueError(message)
+
+        self.size = size
+        bits = max(2, (size - 1).bit_length())
+        self._half_bits = (bits + 1) // 2
+        self._half_mask = (1 << self._half_bits) - 1
+        key_bytes = (key & _MASK_64).to_bytes(8, 'big')
+        self._round_keys: List[int] = [
+            int.from_bytes(blake2b(key_bytes + bytes([index]), digest_size=8).digest(), 'big')
+            for index in range(FEISTEL_ROUNDS)
+        ]
+
+    def __len__(self) -> int:
+        """Размер отрезка."""
+        return self.size
+
+    def _round(self, value: int, round_key: int) -> int:
+        """
+        Раундовая функция: перемешивание половины блока с ключом раунда (обратимость не требуется).
+        :param value: правая половина блока
+        :param round_key: ключ раунда
+        :return: маска для левой половины блока
+        """
+        mixed = ((value ^ round_key) * _MIX_MULTIPLIER) & _MASK_64
+        mixed ^= mixed >> 29
+        return mixed & self._half_mask
+
+    def _encrypt(self, value: int) -> int:
+        """
+        Перестановка числа из [0, 2^bits).
+        :param value: число
+        :return: переставленное число
+        """
+        left, right = value >> self._half_bits, value & self._half_mask
+        for round_key in self._round_keys:
+            left, right = right, left ^ self._round(right, round_key)
+
+        return (left << self._half_bits) | right
+
+    def __getitem__(self, index: int) -> int:
+        """
+        Значение перестановки.
+        :param index: позиция в отрезке [0, size)
+        :return: значение в отрезке [0, size)
+        """
+        if not 0 <= index < self.size:
+            message = f'Permutation index out of range: {index}'
+            raise IndexError(message)
+
+        value = self._encrypt(index)
+        while value >= self.size:
+            value = self._encrypt(value)
+
+        return value
+
+    def __iter__(self) -> Iterator[int]:
+        """Значения перестановки по порядку позиций."""
+        for index in range(self.size):
+            yield self[index]
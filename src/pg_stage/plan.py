@@ -0,0 +1,47 @@
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+from pg_stage.conditions import Predicate
+
+# Пространство ключей связи (см. relation_space) и индекс колонки с ключом
+RelationSlot = Tuple[bytes, int]
+
+
+@dataclass(frozen=True)
+class MutationPlan:
+    """Скомпилированная мутация колонки"""
+
+    __slots__ = ('func', 'condition', 'constant', 'relation_lookups', 'relation_stores', 'uses_obfuscated_values')
+
+    func: Callable[..., Optional[str]]
+    # Скомпилированные условия мутации (None - мутация применяется всегда)
+    condition: Optional[Predicate]
+    constant: Optional[str]
+    relation_lookups: Tuple[RelationSlot, ...]
+    relation_stores: Tuple[RelationSlot, ...]
+    uses_obfuscated_values: bool
+
+
+@dataclass(frozen=True)
+class ColumnPlan:
+    """Скомпилированный список мутаций одной колонки"""
+
+    __slots__ = ('name', 'index', 'mutations')
+
+    name: str
+    index: int
+    mutations: Tuple[MutationPlan, ...]
+
+
+@dataclass(frozen=True)
+class TablePlan:
+    """План обработки строк таблицы, который строится один раз на блок COPY"""
+
+    __slots__ = ('table_name', 'column_names', 'columns', 'uses_obfuscated_values', 'read_indexes')
+
+    table_name: str
+    column_names: Tuple[str, ...]
+    columns: Tuple[ColumnPlan, ...]
+    uses_obfuscated_values: bool
+    # Индексы колонок, значения которых читаются мутациями, условиями и связями
+    read_indexes: Tuple[int, ...]
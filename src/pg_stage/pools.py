@@ -0,0 +1,56 @@
+from array import array
+from typing import Callable, Iterable, Tuple
+
+
+class ValuePool:
+    """
+    Пул заранее сгенерированных различных значений.
+    Значения хранятся компактно: одна строка со всеми значениями подряд и массив смещений,
+    поэтому пул из сотен тысяч значений занимает в несколько раз меньше памяти, чем список строк.
+    """
+
+    def __init__(self, values: Iterable[str], *, name: str = '', generation: int = 0) -> None:
+        """
+        Метод инициализации класса.
+        :param values: значения (повторы отбрасываются)
+        :param name: название пула
+        :param generation: номер поколения пула (увеличивается при обновлении)
+        """
+        distinct_values = list(dict.fromkeys(values))
+        if not distinct_values:
+            message = 'Value pool cannot be empty.'
+            raise ValueError(message)
+
+        self.name = name
+        self.generation = generation
+        # Ключ последовательности уникальных значений: у каждого поколения пула своя перестановка индексов
+        self.key: Tuple[str, str, int] = ('pool', name, generation)
+        self.draws = 0
+        self._data = ''.join(distinct_values)
+        self._offsets = array('Q', [0])
+        for value in distinct_values:
+            self._offsets.append(self._offsets[-1] + len(value))
+
+    @classmethod
+    def generate(cls, factory: Callable[[], str], *, size: int, name: str = '', generation: int = 0) -> 'ValuePool':
+        """
+        Создание пула из значений генератора.
+        :param factory: функция генерации одного значения
+        :param size: количество вызовов генератора (различных значений может получиться меньше)
+        :param name: название пула
+        :param generation: номер поколения пула
+        :return: пул значений
+        """
+        return cls((factory() for _ in range(size)), name=name, generation=generation)
+
+    def __len__(self) -> int:
+        """Количество значений в пуле."""
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        """
+        Значение пула по индексу.
+        :param index: индекс значения
+        :return: значение
+        """
+        return self._data[self._offsets[index] : self._offsets[index + 1]]
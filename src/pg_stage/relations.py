@@ -0,0 +1,272 @@
+import os
+import sqlite3
+import struct
+import tempfile
+from array import array
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Optional
+
+from pg_stage.hashtable import HashTable
+
+# 128-битный хеш ключа: вероятность совпадения хешей разных ключей для 10^8 ключей порядка 10^-23
+KEY_DIGEST_SIZE = 16
+DEFAULT_HOT_SIZE = 1000000  # размер горячего набора постоянного хранилища, если он не задан явно
+COMMIT_INTERVAL = 10000  # количество записей между фиксациями транзакции постоянного хранилища
+BUSY_TIMEOUT = 60.0  # секунд ожидания блокировки базы другим запуском
+_KEY_HALVES = struct.Struct('<qq')
+
+
+def relation_space(table_name: str, column_name: str, key_column_name: str) -> bytes:
+    """
+    Пространство ключей связи: значения колонки таблицы, найденные по значению ключевой колонки.
+    :param table_name: название таблицы
+    :param column_name: название колонки со значением
+    :param key_column_name: название колонки с ключом связи
+    :return: префикс ключей пространства
+    """
+    return f'{table_name}:{column_name}:{key_column_name}\x00'.encode()
+
+
+class RelationStore:
+    """
+    Хранилище связанных значений.
+    Каждому новому значению выдается целочисленный дескриптор, ключи связей хранятся в виде 128-битных хешей
+    (пространство ключей + значение ключа) и указывают на дескриптор. В памяти ключи лежат в таблице
+    с открытой адресацией (HashTable), значения - в одном буфере UTF-8 с массивом смещений, без объектов Python
+    на запись. Если задан размер горячего набора
+    или путь к постоянной базе, все записи сразу пишутся в базу sqlite, а в памяти остаются только
+    недавно использованные (LRU). Постоянная база (режим WAL) сохраняется между запусками и дополняется
+    новыми связями, поэтому одинаковые ключи получают одинаковые значения в разных дампах.
+    """
+
+    def __init__(
+        self,
+        *,
+        hot_size: Optional[int] = None,
+        spill_directory: Optional[str] = None,
+        path: Optional[str] = None,
+    ) -> None:
+        """
+        Метод инициализации класса.
+        :param hot_size: количество записей в памяти (None - все записи в памяти, без выгрузки на диск)
+        :param spill_directory: директория для временной базы sqlite (None - системная временная директория)
+        :param path: путь к постоянной базе sqlite, которая используется вместо временной
+        """
+        if path is not None and hot_size is None:
+            hot_size = DEFAULT_HOT_SIZE
+
+        self.hot_size = hot_size
+        self.spill_directory = spill_directory
+        self.path = path
+        self._handles = HashTable()
+        self._value_data = bytearray()
+        self._value_offsets = array('Q', [0])
+        # Горячий набор при выгрузке на диск: порядок записей соответствует давности использования
+        self._hot_handles: 'OrderedDict[bytes, int]' = OrderedDict()
+        self._hot_values: 'OrderedDict[int, str]' = OrderedDict()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._spill_path: Optional[str] = None
+        self._pending_writes = 0
+
+    def __len__(self) -> int:
+        """Количество сохраненных значений."""
+        if not self.is_spilled:
+            return len(self._value_offsets) - 1
+
+        if self._connection is None and not self.is_persistent:
+            return 0
+
+        return self._connect().execute('SELECT COUNT(*) FROM relation_values').fetchone()[0]
+
+    @property
+    def is_spilled(self) -> bool:
+        """Записи выгружаются в базу sqlite."""
+        return self.hot_size is not None
+
+    @property
+    def is_persistent(self) -> bool:
+        """Записи сохраняются в постоянной базе между запусками."""
+        return self.path is not None
+
+    @staticmethod
+    def _hash_key(space: bytes, key: str) -> bytes:
+        """
+        Хеш ключа связи в пространстве ключей.
+        :param space: префикс пространства ключей
+        :param key: значение ключа
+        :return: 128-битный хеш
+        """
+        return blake2b(space + key.encode('utf-8', 'surrogateescape'), digest_size=KEY_DIGEST_SIZE).digest()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Открытие базы sqlite при первом обращении: постоянной по пути или временной.
+        :return: соединение с базой
+        """
+        if self._connection is not None:
+            return self._connection
+
+        if self.path is not None:
+            self._connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT)
+            # WAL: чтение не блокируется записью, фиксация транзакции не требует перезаписи базы
+            self._connection.execute('PRAGMA journal_mode = WAL')
+            self._connection.execute('PRAGMA synchronous = NORMAL')
+        else:
+            descriptor, self._spill_path = tempfile.mkstemp(
+                prefix='pg_stage_relations_',
+                suffix='.sqlite',
+                dir=self.spill_directory,
+            )
+            os.close(descriptor)
+            self._connection = sqlite3.connect(self._spill_path)
+            # База временная: журнал и синхронизация с диском не нужны
+            self._connection.execute('PRAGMA journal_mode = OFF')
+            self._connection.execute('PRAGMA synchronous = OFF')
+
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS relation_keys (key BLOB PRIMARY KEY, handle INTEGER NOT NULL) WITHOUT ROWID',
+        )
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS relation_values (handle INTEGER PRIMARY KEY, value BLOB NOT NULL)',
+        )
+        self._connection.commit()
+        return self._connection
+
+    def _written(self) -> None:
+        """Периодическая фиксация записей в постоянной базе, чтобы они были видны другим запускам."""
+        self._pending_writes += 1
+        if self.is_persistent and self._pending_writes >= COMMIT_INTERVAL:
+            self._connect().commit()
+            self._pending_writes = 0
+
+    def _remember(self, cache: OrderedDict, key: object, value: object) -> None:
+        """
+        Добавление записи в горячий набор с вытеснением давно не использованных записей.
+        :param cache: горячий набор (OrderedDict)
+        :param key: ключ записи
+        :param value: значение записи
+        """
+        cache[key] = value
+        if self.hot_size is not None and len(cache) > self.hot_size:
+            cache.popitem(last=False)
+
+    def find(self, space: bytes, key: str) -> Optional[int]:
+        """
+        Поиск дескриптора значения по ключу связи.
+        :param space: префикс пространства ключей
+        :param key: значение ключа
+        :return: дескриптор или None, если ключ еще не встречался
+        """
+        hashed_key = self._hash_key(space, key)
+        if not self.is_spilled:
+            first_half, second_half = _KEY_HALVES.unpack(hashed_key)
+            return self._handles.get(first_half, second_half)
+
+        handle = self._hot_handles.get(hashed_key)
+        if handle is not None:
+            self._hot_handles.move_to_end(hashed_key)
+            return handle
+
+        if self._connection is None and not self.is_persistent:
+            return None
+
+        query = 'SELECT handle FROM relation_keys WHERE key = ?'
+        row = self._connect().execute(query, (hashed_key,)).fetchone()
+        if row is None:
+            return None
+
+        self._remember(self._hot_handles, hashed_key, row[0])
+        return row[0]
+
+    def value(self, handle: int) -> Optional[str]:
+        """
+        Получение значения по дескриптору.
+        :param handle: дескриптор значения
+        :return: значение или None, если дескриптор неизвестен
+        """
+        if not self.is_spilled:
+            if not 0 <= handle < len(self._value_offsets) - 1:
+                return None
+
+            data = self._value_data[self._value_offsets[handle] : self._value_offsets[handle + 1]]
+            return data.decode('utf-8', 'surrogateescape')
+
+        value = self._hot_values.get(handle)
+        if value is not None:
+            self._hot_values.move_to_end(handle)
+            return value
+
+        if self._connection is None and not self.is_persistent:
+            return None
+
+        query = 'SELECT value FROM relation_values WHERE handle = ?'
+        row = self._connect().execute(query, (handle,)).fetchone()
+        if row is None:
+            return None
+
+        value = row[0].decode('utf-8', 'surrogateescape')
+        self._remember(self._hot_values, handle, value)
+        return value
+
+    def add(self, value: str) -> int:
+        """
+        Сохранение нового значения.
+        :param value: значение
+        :return: дескриптор значения
+        """
+        if not self.is_spilled:
+            self._value_data += value.encode('utf-8', 'surrogateescape')
+            self._value_offsets.append(len(self._value_data))
+            return len(self._value_offsets) - 2
+
+        # Дескриптор выдает sqlite (rowid), поэтому он не пересекается с записями прошлых запусков
+        cursor = self._connect().execute(
+            'INSERT INTO relation_values (value) VALUES (?)',
+            (value.encode('utf-8', 'surrogateescape'),),
+        )
+        handle: int = cursor.lastrowid  # type: ignore[assignment]
+        self._written()
+        self._remember(self._hot_values, handle, value)
+        return handle
+
+    def bind(self, space: bytes, key: str, handle: int) -> None:
+        """
+        Привязка ключа связи к дескриптору значения.
+        :param space: префикс пространства ключей
+        :param key: значение ключа
+        :param handle: дескриптор значения
+        """
+        hashed_key = self._hash_key(space, key)
+        if not self.is_spilled:
+            first_half, second_half = _KEY_HALVES.unpack(hashed_key)
+            self._handles.set(first_half, second_half, handle)
+            return
+
+        self._connect().execute(
+            'INSERT OR REPLACE INTO relation_keys (key, handle) VALUES (?, ?)',
+            (hashed_key, handle),
+        )
+        self._written()
+        self._remember(self._hot_handles, hashed_key, handle)
+
+    def close(self) -> None:
+        """
+        Закрытие базы sqlite: постоянная база сохраняется, временная удаляется вместе с записями.
+        Записи в памяти без выгрузки на диск сохраняются.
+        """
+        if not self.is_spilled:
+            return
+
+        if self._connection is not None:
+            self._connection.commit()
+            self._connection.close()
+            self._connection = None
+
+        if self._spill_path is not None:
+            os.remove(self._spill_path)
+            self._spill_path = None
+
+        self._hot_handles.clear()
+        self._hot_values.clear()
+        self._pending_writes = 0
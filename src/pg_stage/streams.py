@@ -0,0 +1,234 @@
+import io
+from dataclasses import dataclass
+from typing import Any, AnyStr, Callable, Generic, Iterator, List
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024  # 1MB для блочного копирования данных
+DEFAULT_OUTPUT_BUFFER_SIZE = 1024 * 1024  # 1MB; для записи в pipe достаточно 64KB, для файлов выгоднее больше
+
+
+class LineReader(Generic[AnyStr]):
+    """
+    Построчное чтение текстового или бинарного потока.
+    Позволяет скопировать данные блока COPY целиком до терминатора `\\.` без разбора строк.
+    """
+
+    def __init__(self, stream: Any, block_size: int = DEFAULT_BLOCK_SIZE) -> None:
+        """
+        Метод инициализации класса.
+        :param stream: входной поток (текстовый или бинарный)
+        :param block_size: размер блока для копирования данных
+        """
+        self._stream = stream
+        self._block_size = block_size
+        self._empty: AnyStr = stream.read(0)
+        self._newline: AnyStr = self._cast('\n')
+        self._terminator: AnyStr = self._cast('\\.')
+        self._line_terminator: AnyStr = self._cast('\n\\.')
+        self._pending: AnyStr = self._empty
+        self._pending_position = 0
+
+    @property
+    def is_binary(self) -> bool:
+        """Поток возвращает байты."""
+        return isinstance(self._empty, bytes)
+
+    def _cast(self, value: str) -> AnyStr:
+        """
+        Метод для приведения служебной строки к типу данных потока.
+        :param value: служебная строка
+        :return: строка или байты
+        """
+        if self.is_binary:
+            return value.encode()  # type: ignore[return-value]
+
+        return value  # type: ignore[return-value]
+
+    def _read_pending(self) -> AnyStr:
+        """
+        Метод для получения непрочитанного остатка последнего блока.
+        :return: остаток блока
+        """
+        data = self._pending[self._pending_position :]
+        self._pending = self._empty
+        self._pending_position = 0
+        return data
+
+    def readline(self) -> AnyStr:
+        """
+        Метод для чтения одной строки.
+        :return: строка вместе с переводом строки (пустая строка при окончании потока)
+        """
+        if not self._pending:
+            return self._stream.readline()
+
+        index = self._pending.find(self._newline, self._pending_position)
+        if index == -1:
+            return self._read_pending() + self._stream.readline()
+
+        line = self._pending[self._pending_position : index + 1]
+        self._pending_position = index + 1
+        if self._pending_position == len(self._pending):
+            self._pending = self._empty
+            self._pending_position = 0
+
+        return line
+
+    def unread(self, line: AnyStr) -> None:
+        """
+        Метод для возврата прочитанной строки в поток.
+        :param line: строка, которая будет прочитана следующей
+        """
+        self._pending = line + self._read_pending()
+
+    def __iter__(self) -> Iterator[AnyStr]:
+        while True:
+            line = self.readline()
+            if not line:
+                return
+
+            yield line
+
+    def copy_data_block(self, write: Callable[[AnyStr], Any]) -> None:
+        """
+        Метод для копирования данных блока COPY до строки `\\.` (не включая ее) большими блоками.
+        :param write: функция записи данных
+        """
+        tail = self._empty
+        is_line_start = True
+        while True:
+            chunk = self._read_pending() or self._stream.read(self._block_size)
+            data = tail + chunk if tail else chunk
+            tail = self._empty
+            if not chunk:
+                if data:
+                    write(data)
+                return
+
+            if is_line_start and data.startswith(self._terminator):
+                self._pending = data
+                return
+
+            index = data.find(self._line_terminator)
+            if index != -1:
+                write(data[: index + 1])
+                self._pending = data[index + 1 :]
+                return
+
+            last_newline = data.rfind(self._newline)
+            if last_newline == -1:
+                if is_line_start and len(data) < len(self._terminator):
+                    # Недостаточно данных, чтобы понять, является ли строка терминатором
+                    tail = data
+                    continue
+
+                write(data)
+                is_line_start = False
+                continue
+
+            write(data[: last_newline + 1])
+            tail = data[last_newline + 1 :]
+            is_line_start = True
+
+
+@dataclass(frozen=True)
+class WriteStats:
+    """Статистика записи в выходной поток"""
+
+    bytes_written: int
+    lines_written: int
+
+
+class OutputWriter:
+    """
+    Буферизованная запись строк в текстовый или бинарный поток.
+    Строки накапливаются в батч и записываются одной операцией при достижении размера буфера.
+    """
+
+    def __init__(self, stream: Any, buffer_size: int = DEFAULT_OUTPUT_BUFFER_SIZE, encoding: str = 'utf-8') -> None:
+        """
+        Метод инициализации класса.
+        :param stream: выходной поток (текстовый или бинарный)
+        :param buffer_size: размер батча, после которого данные сбрасываются в поток
+        :param encoding: кодировка для записи строк в бинарный поток
+        """
+        errors = 'strict'
+        if isinstance(stream, io.TextIOBase) and hasattr(stream, 'buffer'):
+            # Пишем напрямую в бинарный буфер текстового потока, минуя текстовый слой
+            stream.flush()
+            encoding = stream.encoding or encoding
+            errors = stream.errors or errors
+            stream = stream.buffer
+
+        self._stream = stream
+        self._is_binary = not isinstance(stream, io.TextIOBase)
+        self._buffer_size = buffer_size
+        self._encoding = encoding
+        self._errors = errors
+        self._parts: List[Any] = []
+        self._size = 0
+        self._bytes_written = 0
+        self._lines_written = 0
+
+    @property
+    def stats(self) -> WriteStats:
+        """
+        Статистика записанных данных.
+        Байты учитываются при сбросе батча; для текстовых потоков без бинарного буфера считаются символы.
+        """
+        return WriteStats(bytes_written=self._bytes_written, lines_written=self._lines_written)
+
+    def write_line(self, line: AnyStr) -> None:
+        """
+        Метод для добавления строки в батч.
+        :param line: строка без перевода строки
+        """
+        newline = b'\n' if isinstance(line, bytes) else '\n'
+        self._parts.append(line)
+        self._parts.append(newline)
+        self._size += len(line) + 1
+        self._lines_written += 1
+        if self._size >= self._buffer_size:
+            self.flush()
+
+    def write(self, data: AnyStr) -> None:
+        """
+        Метод для записи уже подготовленного блока данных (со своими переводами строк).
+        :param data: блок данных
+        """
+        if not data:
+            return
+
+        self._lines_written += data.count(b'\n' if isinstance(data, bytes) else '\n')
+        if self._size + len(data) < self._buffer_size:
+            self._parts.append(data)
+            self._size += len(data)
+            return
+
+        self.flush()
+        self._write(data)
+
+    def _write(self, data: AnyStr) -> None:
+        """
+        Метод для записи данных в поток.
+        :param data: данные
+        """
+        if self._is_binary and isinstance(data, str):
+            data = data.encode(self._encoding, self._errors)  # type: ignore[assignment]
+        elif not self._is_binary and isinstance(data, bytes):
+            data = data.decode(self._encoding, self._errors)  # type: ignore[assignment]
+
+        self._stream.write(data)
+        self._bytes_written += len(data)
+
+    def flush(self) -> None:
+        """Метод для сброса накопленного батча в поток."""
+        if self._parts:
+            if isinstance(self._parts[0], bytes):
+                self._write(b''.join(self._parts))
+            else:
+                self._write(''.join(self._parts))
+
+            self._parts.clear()
+            self._size = 0
+
+        self._stream.flush()
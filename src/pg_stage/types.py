@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Union
 
 from typing_extensions import TypedDict
 
@@ -10,6 +10,9 @@ class OperationChoices(Enum):
     equal = 'equal'
     not_equal = 'not_equal'
     by_pattern = 'by_pattern'
+    in_ = 'in'
+    not_in = 'not_in'
+    is_null = 'is_null'
 
 
 class ConditionType(TypedDict):
@@ -17,7 +20,11 @@ class ConditionType(TypedDict):
 
     column_name: str
     operation: OperationChoices
-    value: str
+    value: Any
+
+
+# Группа условий: all - выполнены все условия, any - хотя бы одно
+ConditionGroupType = TypedDict('ConditionGroupType', {'all': List[Any], 'any': List[Any]}, total=False)
 
 
 class RelationType(TypedDict):
@@ -29,7 +36,7 @@ class RelationType(TypedDict):
     to_column_name: str
 
 
-ConditionTypeMany = List[ConditionType]
+ConditionTypeMany = List[Union[ConditionType, ConditionGroupType]]
 RelationTypeMany = List[RelationType]
 
 
@@ -37,7 +44,7 @@ class MapTablesValueType(TypedDict):
     """Описание типа значения карты таблиц"""
 
     mutation_name: str
-    mutation_func: Callable[..., str]
+    mutation_func: Callable[..., Optional[str]]
     mutation_kwargs: Dict[str, Any]
     mutation_relations: RelationTypeMany
     mutation_conditions: ConditionTypeMany
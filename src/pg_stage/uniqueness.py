@@ -0,0 +1,244 @@
+import math
+import os
+import sqlite3
+import tempfile
+from abc import ABCMeta, abstractmethod
+from hashlib import blake2b
+from typing import Any, Dict, Iterator, Optional
+
+from pg_stage.hashtable import HashSet
+
+UNIQUE_MODES = ('memory', 'bloom', 'disk')
+# Время жизни областей уникальности: блок COPY таблицы, схема БД или весь запуск
+UNIQUE_LIFETIMES = ('table', 'schema', 'run')
+# Фильтр на 1 млн значений при доле ложных срабатываний 0.1% занимает около 1.8 МБ на колонку
+DEFAULT_BLOOM_CAPACITY = 1000000
+DEFAULT_BLOOM_ERROR_RATE = 0.001
+
+
+def hash_value(value: Any) -> int:
+    """
+    64-битный хеш значения для проверки уникальности.
+    Коллизия хешей приводит только к повторной генерации значения, но не к повторам в результате.
+    :param value: значение
+    :return: знаковое 64-битное число
+    """
+    digest = blake2b(str(value).encode('utf-8', 'surrogateescape'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+class UniqueScope(metaclass=ABCMeta):
+    """Область уникальности значений одной колонки"""
+
+    def __init__(self) -> None:
+        """Метод инициализации класса."""
+        # Последовательности значений ключевых перестановок (уникальны по построению): диапазон -> итератор
+        self.sequences: Dict[Any, Iterator[int]] = {}
+
+    @abstractmethod
+    def add(self, value: Any) -> bool:
+        """
+        Добавление значения в область.
+        :param value: значение
+        :return: True, если значение еще не встречалось
+        """
+        raise NotImplementedError()
+
+    def clear(self) -> None:
+        """Сброс значений области."""
+        self.sequences.clear()
+
+
+class HashedScope(UniqueScope):
+    """Область уникальности в памяти: 64-битные хеши значений в массиве с открытой адресацией (HashSet)"""
+
+    def __init__(self) -> None:
+        """Метод инициализации класса."""
+        super().__init__()
+        self._hashes = HashSet()
+
+    def __len__(self) -> int:
+        """Количество значений в области."""
+        return len(self._hashes)
+
+    def add(self, value: Any) -> bool:
+        """
+        Добавление значения в область.
+        :param value: значение
+        :return: True, если значение еще не встречалось
+        """
+        return self._hashes.add(hash_value(value))
+
+    def clear(self) -> None:
+        """Сброс значений области."""
+        super().clear()
+        self._hashes.clear()
+
+
+class BloomScope(UniqueScope):
+    """
+    Область уникальности на фильтре Блума фиксированного размера.
+    Ложные срабатывания приводят к повторной генерации значения (повторов в результате не будет),
+    их доля растет, если значений больше, чем рассчитанная емкость.
+    """
+
+    def __init__(self, *, capacity: int = DEFAULT_BLOOM_CAPACITY, error_rate: float = DEFAULT_BLOOM_ERROR_RATE) -> None:
+        """
+        Метод инициализации класса.
+        :param capacity: ожидаемое количество значений
+        :param error_rate: допустимая доля ложных срабатываний при заполнении до емкости
+        """
+        super().__init__()
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, value: Any) -> bool:
+        """
+        Добавление значения в область.
+        :param value: значение
+        :return: True, если значение точно еще не встречалось
+        """
+        digest = blake2b(str(value).encode('utf-8', 'surrogateescape'), digest_size=16).digest()
+        first_hash = int.from_bytes(digest[:8], 'big')
+        second_hash = int.from_bytes(digest[8:], 'big') | 1
+        is_new = False
+        for index in range(self.hash_count):
+            position = (first_hash + index * second_hash) % self.size
+            mask = 1 << (position & 7)
+            if not self._bits[position >> 3] & mask:
+                self._bits[position >> 3] |= mask
+                is_new = True
+
+        return is_new
+
+    def clear(self) -> None:
+        """Сброс значений области."""
+        super().clear()
+        self._bits = bytearray(len(self._bits))
+
+
+class DiskScope(UniqueScope):
+    """Область уникальности во временной базе sqlite (хеши значений)"""
+
+    def __init__(self, connection: sqlite3.Connection, scope_id: int) -> None:
+        """
+        Метод инициализации класса.
+        :param connection: соединение с временной базой
+        :param scope_id: идентификатор области в базе
+        """
+        super().__init__()
+        self._connection = connection
+        self._scope_id = scope_id
+
+    def add(self, value: Any) -> bool:
+        """
+        Добавление значения в область.
+        :param value: значение
+        :return: True, если значение еще не встречалось
+        """
+        cursor = self._connection.execute(
+            'INSERT OR IGNORE INTO unique_values (scope, value) VALUES (?, ?)',
+            (self._scope_id, hash_value(value)),
+        )
+        return cursor.rowcount > 0
+
+    def clear(self) -> None:
+        """Сброс значений области."""
+        super().clear()
+        self._connection.execute('DELETE FROM unique_values WHERE scope = ?', (self._scope_id,))
+
+
+class UniquenessRegistry:
+    """Области уникальности по колонкам (table.column) с настраиваемым способом хранения и временем жизни"""
+
+    def __init__(
+        self,
+        *,
+        mode: str = 'memory',
+        lifetime: str = 'schema',
+        bloom_capacity: int = DEFAULT_BLOOM_CAPACITY,
+        spill_directory: Optional[str] = None,
+    ) -> None:
+        """
+        Метод инициализации класса.
+        :param mode: способ хранения: memory (хеши в памяти), bloom (фильтр Блума) или disk (временная база sqlite)
+        :param lifetime: время жизни областей: table, schema или run
+        :param bloom_capacity: ожидаемое количество значений одной колонки для фильтра Блума
+        :param spill_directory: директория для временной базы (None - системная временная директория)
+        """
+        if mode not in UNIQUE_MODES:
+            message = f'Unsupported unique mode: {mode}'
+            raise ValueError(message)
+
+        if lifetime not in UNIQUE_LIFETIMES:
+            message = f'Unsupported unique lifetime: {lifetime}'
+            raise ValueError(message)
+
+        self.mode = mode
+        self.lifetime = lifetime
+        self.bloom_capacity = bloom_capacity
+        self.spill_directory = spill_directory
+        self._scopes: Dict[str, UniqueScope] = {}
+        self._connection: Optional[sqlite3.Connection] = None
+        self._spill_path: Optional[str] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Создание временной базы sqlite при первом обращении.
+        :return: соединение с базой
+        """
+        if self._connection is None:
+            descriptor, self._spill_path = tempfile.mkstemp(
+                prefix='pg_stage_unique_',
+                suffix='.sqlite',
+                dir=self.spill_directory,
+            )
+            os.close(descriptor)
+            self._connection = sqlite3.connect(self._spill_path)
+            self._connection.execute('PRAGMA journal_mode = OFF')
+            self._connection.execute('PRAGMA synchronous = OFF')
+            self._connection.execute(
+                'CREATE TABLE unique_values (scope INTEGER, value INTEGER, PRIMARY KEY (scope, value)) WITHOUT ROWID',
+            )
+
+        return self._connection
+
+    def scope(self, name: str) -> UniqueScope:
+        """
+        Получение области уникальности колонки.
+        :param name: название области (table.column)
+        :return: область уникальности
+        """
+        scope = self._scopes.get(name)
+        if scope is None:
+            if self.mode == 'bloom':
+                scope = BloomScope(capacity=self.bloom_capacity)
+            elif self.mode == 'disk':
+                scope = DiskScope(self._connect(), len(self._scopes))
+            else:
+                scope = HashedScope()
+            self._scopes[name] = scope
+
+        return scope
+
+    def start_table(self, *, is_new_schema: bool) -> None:
+        """
+        Сброс областей, время жизни которых закончилось, перед обработкой новой таблицы.
+        :param is_new_schema: таблица относится к другой схеме БД
+        """
+        if self.lifetime == 'table' or (self.lifetime == 'schema' and is_new_schema):
+            self._scopes.clear()
+            if self._connection is not None:
+                self._connection.execute('DELETE FROM unique_values')
+
+    def close(self) -> None:
+        """Сброс всех областей и удаление временной базы."""
+        self._scopes.clear()
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+        if self._spill_path is not None:
+            os.remove(self._spill_path)
+            self._spill_path = None
@@ -0,0 +1,310 @@
+import gzip
+import io
+import os
+import tarfile
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.pg_stage.compression import CompressingWriter, DecompressingReader, get_codec
+from src.pg_stage.obfuscators.custom import DumpIO, HeaderParser, TocParser
+
+TableType = Tuple[str, List[str], List[str]]
+
+INT_SIZE = 4
+OFFSET_SIZE = 8
+ZLIB_OUT_SIZE = 4096
+COMPRESSION_CODES = {'none': 0, 'zlib': 1, 'gzip': 1, 'lz4': 2, 'zstd': 3}
+CUSTOM_FORMAT = 1
+TAR_FORMAT = 3
+DIRECTORY_FORMAT = 5
+
+
+def _write_int(value: int) -> bytes:
+    return bytes([1 if value < 0 else 0]) + abs(value).to_bytes(INT_SIZE, 'little')
+
+
+def _write_str(value: Optional[str]) -> bytes:
+    if value is None:
+        return _write_int(-1)
+
+    data = value.encode()
+    return _write_int(len(data)) + data
+
+
+def _write_entry(
+    *,
+    dump_id: int,
+    desc: str,
+    section: int,
+    version: Tuple[int, int, int],
+    tag: str = '',
+    defn: str = '',
+    copy_stmt: str = '',
+    offset: Optional[int] = None,
+    archive_format: int = CUSTOM_FORMAT,
+) -> bytes:
+    entry = _write_int(dump_id) + _write_int(1 if desc == 'TABLE DATA' else 0)
+    entry += _write_str('0') + _write_str(str(dump_id)) + _write_str(tag) + _write_str(desc)
+    entry += _write_int(section)
+    entry += _write_str(defn) + _write_str('') + _write_str(copy_stmt) + _write_str('public') + _write_str('')
+    if version >= (1, 14, 0):
+        entry += _write_str('heap' if desc == 'TABLE' else '')
+
+    entry += _write_str('postgres') + _write_str('false') + _write_str(None)
+    if archive_format != CUSTOM_FORMAT:
+        return entry + _write_str(f'{dump_id}.dat' if desc == 'TABLE DATA' else None)
+
+    if offset is None:
+        return entry + bytes([1]) + bytes(OFFSET_SIZE)
+
+    return entry + bytes([2]) + offset.to_bytes(OFFSET_SIZE, 'little')
+
+
+def _compress(data: bytes, compression: str) -> bytes:
+    if compression == 'zlib':
+        return zlib.compress(data)
+
+    compressor = get_codec(compression).create_compressor()
+    return compressor.compress(data) + compressor.flush()
+
+
+def _decompress(data: bytes, compression: str) -> bytes:
+    if compression in ('zlib', 'raw'):
+        return zlib.decompress(data)
+
+    decompressor = get_codec(compression).create_decompressor()
+    return b''.join(decompressor.decompress(data)) + decompressor.flush()
+
+
+def _write_data(data: bytes, compression: str) -> bytes:
+    if compression == 'none':
+        chunks = [data[index : index + ZLIB_OUT_SIZE] for index in range(0, len(data), ZLIB_OUT_SIZE)]
+    else:
+        compressed = _compress(data, compression)
+        chunks = [compressed[index : index + ZLIB_OUT_SIZE] for index in range(0, len(compressed), ZLIB_OUT_SIZE)]
+
+    return b''.join(_write_int(len(chunk)) + chunk for chunk in chunks) + _write_int(0)
+
+
+def _write_header(*, version: Tuple[int, int, int], compression: str, archive_format: int) -> bytes:
+    header = b'PGDMP' + bytes(version) + bytes([INT_SIZE, OFFSET_SIZE, archive_format])
+    if version >= (1, 15, 0):
+        header += bytes([COMPRESSION_CODES[compression]])
+    else:
+        header += _write_int(0 if compression == 'none' else -1)
+
+    for value in (0, 0, 12, 1, 0, 124, 0):
+        header += _write_int(value)
+
+    return header + _write_str('postgres') + _write_str('16.0') + _write_str('16.0')
+
+
+def _make_entries(*, tables: List[TableType], comments: Optional[List[str]]) -> List[Dict[str, Any]]:
+    entries: List[Dict[str, Any]] = [
+        {'dump_id': 1, 'desc': 'ENCODING', 'section': 1, 'defn': "SET client_encoding = 'UTF8';\n"},
+    ]
+    for comment in comments or []:
+        entries.append({'dump_id': len(entries) + 1, 'desc': 'COMMENT', 'section': 1, 'defn': comment})
+
+    for table_name, columns, _ in tables:
+        copy_stmt = f'COPY public.{table_name} ({", ".join(columns)}) FROM stdin;\n'
+        entries.append(
+            {
+                'dump_id': len(entries) + 1,
+                'desc': 'TABLE DATA',
+                'section': 2,
+                'tag': table_name,
+                'copy_stmt': copy_stmt,
+            },
+        )
+
+    return entries
+
+
+def _make_data(rows: List[str]) -> bytes:
+    return ''.join(f'{row}\n' for row in rows).encode()
+
+
+def build_custom_dump(
+    *,
+    tables: List[TableType],
+    comments: Optional[List[str]] = None,
+    compression: str = 'none',
+    version: Tuple[int, int, int] = (1, 14, 0),
+    with_offsets: bool = False,
+) -> bytes:
+    """
+    Сборка дампа в custom формате (pg_dump -Fc).
+    :param tables: таблицы в виде (название, колонки, строки данных без перевода строки)
+    :param comments: комментарии к колонкам и таблицам
+    :param compression: сжатие блоков данных: none, zlib, lz4 или zstd (lz4 и zstd - для версии формата 1.15 и выше)
+    :param version: версия формата архива
+    :param with_offsets: записать смещения блоков данных в TOC
+    :return: байты дампа
+    """
+    header = _write_header(version=version, compression=compression, archive_format=CUSTOM_FORMAT)
+    entries = _make_entries(tables=tables, comments=comments)
+    data_entries = [entry for entry in entries if entry['desc'] == 'TABLE DATA']
+    blocks = [
+        b'\x01' + _write_int(entry['dump_id']) + _write_data(_make_data(rows), compression)
+        for entry, (_, _, rows) in zip(data_entries, tables)
+    ]
+
+    def write_toc(offsets: Dict[int, int]) -> bytes:
+        toc = _write_int(len(entries))
+        for entry in entries:
+            toc += _write_entry(version=version, offset=offsets.get(entry['dump_id']), **entry)
+
+        return toc
+
+    offsets: Dict[int, int] = {}
+    if with_offsets:
+        position = len(header) + len(write_toc({}))
+        for entry, block in zip(data_entries, blocks):
+            offsets[entry['dump_id']] = position
+            position += len(block)
+
+    return header + write_toc(offsets) + b''.join(blocks)
+
+
+def read_custom_dump(data: bytes) -> Dict[str, List[str]]:
+    """
+    Чтение строк данных таблиц из дампа в custom формате.
+    :param data: байты дампа
+    :return: строки данных по названиям таблиц
+    """
+    stream = io.BytesIO(data)
+    dio = DumpIO()
+    header = HeaderParser(dio).parse(stream)
+    entries = {entry.dump_id: entry for entry in TocParser(dio).parse(stream, header.version)}
+
+    result: Dict[str, List[str]] = {}
+    while True:
+        block_type = stream.read(1)
+        if not block_type:
+            break
+
+        dump_id = dio.read_int(stream)
+        block = bytearray()
+        while True:
+            size = dio.read_int(stream)
+            if size <= 0:
+                break
+
+            block.extend(stream.read(size))
+
+        if header.compression_method.value != 'none':
+            block = bytearray(_decompress(bytes(block), header.compression_method.value))
+
+        result[entries[dump_id].tag or ''] = block.decode().splitlines()
+
+    return result
+
+
+def _write_file_toc(*, entries: List[Dict[str, Any]], compression: str, archive_format: int) -> bytes:
+    version = (1, 14, 0)
+    toc = _write_header(version=version, compression=compression, archive_format=archive_format)
+    toc += _write_int(len(entries))
+    for entry in entries:
+        toc += _write_entry(version=version, archive_format=archive_format, **entry)
+
+    return toc
+
+
+def build_directory_dump(
+    path: str,
+    *,
+    tables: List[TableType],
+    comments: Optional[List[str]] = None,
+    compression: str = 'none',
+) -> None:
+    """
+    Сборка дампа в формате directory (pg_dump -Fd).
+    :param path: директория дампа
+    :param tables: таблицы в виде (название, колонки, строки данных без перевода строки)
+    :param comments: комментарии к колонкам и таблицам
+    :param compression: сжатие файлов данных: none, gzip или lz4
+    """
+    entries = _make_entries(tables=tables, comments=comments)
+    toc = _write_file_toc(entries=entries, compression=compression, archive_format=DIRECTORY_FORMAT)
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, 'toc.dat'), 'wb') as toc_file:
+        toc_file.write(toc)
+
+    data_entries = [entry for entry in entries if entry['desc'] == 'TABLE DATA']
+    for entry, (_, _, rows) in zip(data_entries, tables):
+        file_path = os.path.join(path, f'{entry["dump_id"]}.dat')
+        if compression == 'none':
+            with open(file_path, 'wb') as data_file:
+                data_file.write(_make_data(rows))
+        elif compression == 'lz4':
+            with CompressingWriter(open(f'{file_path}.lz4', 'wb'), get_codec('lz4')) as data_file:
+                data_file.write(_make_data(rows))
+        else:
+            with gzip.open(f'{file_path}.gz', 'wb') as data_file:
+                data_file.write(_make_data(rows))
+
+
+def read_directory_dump(path: str) -> Dict[str, List[str]]:
+    """
+    Чтение строк данных таблиц из дампа в формате directory.
+    :param path: директория дампа
+    :return: строки данных по названиям таблиц
+    """
+    with open(os.path.join(path, 'toc.dat'), 'rb') as toc_file:
+        dio = DumpIO()
+        header = HeaderParser(dio, DIRECTORY_FORMAT).parse(toc_file)
+        entries = TocParser(dio, DIRECTORY_FORMAT).parse(toc_file, header.version)
+
+    result: Dict[str, List[str]] = {}
+    for entry in entries:
+        if entry.desc != 'TABLE DATA' or not entry.filename:
+            continue
+
+        file_path = os.path.join(path, entry.filename)
+        if os.path.exists(file_path):
+            with open(file_path, 'rb') as data_file:
+                data = data_file.read()
+        elif os.path.exists(f'{file_path}.lz4'):
+            with DecompressingReader(open(f'{file_path}.lz4', 'rb'), get_codec('lz4')) as data_file:
+                data = b''.join(iter(data_file.read, b''))
+        else:
+            with gzip.open(f'{file_path}.gz', 'rb') as data_file:
+                data = data_file.read()
+
+        result[entry.tag or ''] = data.decode().splitlines()
+
+    return result
+
+
+def build_tar_dump(*, tables: List[TableType], comments: Optional[List[str]] = None) -> bytes:
+    """
+    Сборка дампа в формате tar (pg_dump -Ft).
+    :param tables: таблицы в виде (название, колонки, строки данных без перевода строки)
+    :param comments: комментарии к колонкам и таблицам
+    :return: байты архива
+    """
+    entries = _make_entries(tables=tables, comments=comments)
+    data_entries = [entry for entry in entries if entry['desc'] == 'TABLE DATA']
+    members = [('toc.dat', _write_file_toc(entries=entries, compression='none', archive_format=TAR_FORMAT))]
+    members.extend((f'{entry["dump_id"]}.dat', _make_data(rows)) for entry, (_, _, rows) in zip(data_entries, tables))
+    members.append(('restore.sql', b'--\n-- PostgreSQL database dump\n--\n'))
+
+    stream = io.BytesIO()
+    with tarfile.open(fileobj=stream, mode='w', format=tarfile.USTAR_FORMAT) as tar:
+        for name, data in members:
+            member = tarfile.TarInfo(name)
+            member.size = len(data)
+            tar.addfile(member, io.BytesIO(data))
+
+    return stream.getvalue()
+
+
+def read_tar_dump(data: bytes) -> Dict[str, bytes]:
+    """
+    Чтение членов архива дампа в формате tar.
+    :param data: байты архива
+    :return: содержимое членов архива по именам
+    """
+    with tarfile.open(fileobj=io.BytesIO(data), mode='r') as tar:
+        return {member.name: tar.extractfile(member).read() for member in tar.getmembers()}  # type: ignore[union-attr]
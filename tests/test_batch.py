@@ -0,0 +1,156 @@
+import datetime
+import uuid
+
+import pytest
+
+from src.pg_stage import mutator as mutator_module
+from src.pg_stage.mutator import Mutator
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def batch_mutator(request, monkeypatch) -> Mutator:
+    """Мутатор с векторной генерацией на NumPy и без него."""
+    if request.param == 'numpy' and mutator_module.numpy is None:
+        pytest.skip('numpy is not installed')
+
+    if request.param == 'python':
+        monkeypatch.setattr(mutator_module, 'numpy', None)
+
+    return Mutator()
+
+
+@pytest.mark.parametrize('integer_type', Mutator.integer_types)
+def test_mutate_batch_integer(batch_mutator: Mutator, integer_type: str) -> None:
+    """
+    Arrange: Мутация целого числа в диапазоне
+    Act: Генерация списка значений одним вызовом
+    Assert: Получено нужное количество чисел в пределах диапазона
+    """
+    values = batch_mutator.mutate_batch(f'numeric_{integer_type}', 1000, start=1, end=20)
+
+    assert len(values) == 1000  # nosec
+    assert {int(value) for value in values} <= set(range(1, 21))  # nosec
+
+
+def test_mutate_batch_integer_bounds(batch_mutator: Mutator) -> None:
+    """
+    Arrange: Мутация bigint без границ и мутация smallserial с границами вне типа
+    Act: Генерация списка значений
+    Assert: Значения в пределах типа, неверные границы вызывают ошибку
+    """
+    values = [int(value) for value in batch_mutator.mutate_batch('numeric_bigint', 100)]
+
+    assert all(Mutator.min_value_bigint <= value <= Mutator.max_value_bigint for value in values)  # nosec
+    with pytest.raises(ValueError, match='The start and end values must be between'):
+        batch_mutator.mutate_batch('numeric_smallserial', 10, start=0, end=10)
+
+
+def test_mutate_batch_unique_integer(batch_mutator: Mutator) -> None:
+    """
+    Arrange: Уникальная мутация числа в узком диапазоне
+    Act: Генерация всех значений диапазона одним вызовом
+    Assert: Получены все числа диапазона без повторов
+    """
+    values = batch_mutator.mutate_batch('numeric_serial', 500, start=10, end=509, unique=True)
+
+    assert sorted(int(value) for value in values) == list(range(10, 510))  # nosec
+
+
+@pytest.mark.parametrize('date_format', ['%Y-%m-%d', '%d.%m.%Y'])
+def test_mutate_batch_date(batch_mutator: Mutator, date_format: str) -> None:
+    """
+    Arrange: Мутация даты между двумя годами
+    Act: Генерация списка значений
+    Assert: Даты в заданном формате и в пределах лет, встречаются все месяцы и последние дни месяцев
+    """
+    values = batch_mutator.mutate_batch('date', 5000, start=2000, end=2001, date_format=date_format)
+
+    dates = [datetime.datetime.strptime(value, date_format).date() for value in values]
+    assert all(2000 <= value.year <= 2001 for value in dates)  # nosec
+    assert {value.month for value in dates} == set(range(1, 13))  # nosec
+    assert {value.day for value in dates} >= {29, 30, 31}  # nosec
+
+
+def test_mutate_batch_uuid4(batch_mutator: Mutator) -> None:
+    """
+    Arrange: Мутация uuid4
+    Act: Генерация списка значений
+    Assert: Значения - различные uuid версии 4 с вариантом RFC 4122
+    """
+    values = batch_mutator.mutate_batch('uuid4', 1000)
+
+    uuids = [uuid.UUID(value) for value in values]
+    assert [str(value) for value in uuids] == values  # nosec
+    assert all(value.version == 4 and value.variant == uuid.RFC_4122 for value in uuids)  # nosec
+    assert len(set(values)) == len(values)  # nosec
+
+
+def test_mutate_batch_string_by_mask(batch_mutator: Mutator) -> None:
+    """
+    Arrange: Мутация строки по маске и маска с одинаковыми символами для букв и цифр
+    Act: Генерация списка значений
+    Assert: Значения соответствуют маске, одинаковые символы вызывают ошибку
+    """
+    values = batch_mutator.mutate_batch('string_by_mask', 1000, mask='@@-##')
+
+    assert len(values) == 1000  # nosec
+    assert all(value[:2].isupper() and value[2] == '-' and value[3:].isdigit() for value in values)  # nosec
+    assert len(set(values)) > 1  # nosec
+    with pytest.raises(ValueError, match='The same placeholder'):
+        batch_mutator.mutate_batch('string_by_mask', 10, mask='@#', char='@', digit='@')
+
+
+@pytest.mark.parametrize('mutation_name', ['first_name', 'last_name', 'email', 'address'])
+def test_mutate_batch_pool(batch_mutator: Mutator, mutation_name: str) -> None:
+    """
+    Arrange: Мутатор с пулами значений
+    Act: Генерация списка значений
+    Assert: Значения выбраны из пула, выдачи учтены для обновления пула
+    """
+    batch_mutator.pool_size = 100
+
+    values = batch_mutator.mutate_batch(mutation_name, 1000)
+
+    pool = batch_mutator._pools[mutation_name]
+    assert set(values) <= {pool[index] for index in range(len(pool))}  # nosec
+    assert pool.draws == 1000  # nosec
+
+
+def test_mutate_batch_unique_pool(batch_mutator: Mutator) -> None:
+    """
+    Arrange: Мутатор с пулами значений
+    Act: Генерация списка уникальных значений больше размера пула
+    Assert: Значения не повторяются
+    """
+    batch_mutator.pool_size = 50
+
+    values = batch_mutator.mutate_batch('last_name', 60, unique=True)
+
+    assert len(set(values)) == 60  # nosec
+
+
+def test_mutate_batch_other_mutations(batch_mutator: Mutator) -> None:
+    """
+    Arrange: Мутации без векторной реализации
+    Act: Генерация списка значений
+    Assert: Значения получены вызовом обычной мутации, неизвестная мутация вызывает ошибку
+    """
+    assert batch_mutator.mutate_batch('fixed_value', 3, value=5) == ['5', '5', '5']  # nosec
+    assert len(batch_mutator.mutate_batch('ipv4', 10)) == 10  # nosec
+    assert batch_mutator.mutate_batch('uuid4', 0) == []  # nosec
+    with pytest.raises(ValueError, match='Not found mutation unknown'):
+        batch_mutator.mutate_batch('unknown', 3)
+
+
+def test_mutate_batch_deterministic(monkeypatch) -> None:
+    """
+    Arrange: Мутатор в детерминированном режиме
+    Act: Вызов mutate_batch
+    Assert: Ошибка ValueError, так как значения зависят от исходных значений
+    """
+    monkeypatch.setenv('SECRET_KEY', 'key')
+    monkeypatch.setenv('SECRET_KEY_NONCE', 'nonce')
+    mutator = Mutator(deterministic=True)
+
+    with pytest.raises(ValueError, match='deterministic mode'):
+        mutator.mutate_batch('uuid4', 3)
@@ -0,0 +1,48 @@
+import io
+
+from src.pg_stage.obfuscators.custom import PgStageParser
+from src.pg_stage.obfuscators.plain import PlainObfuscator
+
+WIN1251_DUMP = (
+    "SET client_encoding = 'WIN1251';\n"
+    'COMMENT ON COLUMN table_1.first_name IS \'anon: [{"mutation_name": "first_name", "conditions": '
+    '[{"column_name": "id", "operation": "equal", "value": "1"}]}]\';\n'
+    'COPY table_1 (id, first_name, notes) FROM stdin;\n'
+    '1\tИван\tзаметка\n'
+    '2\tПётр\tзаметка\n'
+    '\\.\n'
+).encode('cp1251')
+
+
+def test_run_binary_mode_with_client_encoding() -> None:
+    """
+    Arrange: Дамп в кодировке WIN1251
+    Act: Вызов функции `run` класса Obfuscator с бинарными потоками
+    Assert: Кодировка определена по SET client_encoding, изменены только мутируемые поля
+    """
+    obfuscator = PlainObfuscator(binary=True)
+    stdout = io.BytesIO()
+    obfuscator.run(stdin=io.BytesIO(WIN1251_DUMP), stdout=stdout)
+
+    result = stdout.getvalue().split(b'\n')
+    assert obfuscator._encoding == 'cp1251'  # nosec
+    first_row = result[3].split(b'\t')
+    assert first_row[0] == b'1'  # nosec
+    assert first_row[1] != 'Иван'.encode('cp1251')  # nosec
+    assert first_row[2] == 'заметка'.encode('cp1251')  # nosec
+    assert result[4] == '2\tПётр\tзаметка'.encode('cp1251')  # nosec
+
+
+def test_pg_stage_parser_drops_deleted_rows() -> None:
+    """
+    Arrange: Парсер custom формата и таблица, данные которой необходимо удалить
+    Act: Вызов функции `parse` класса PgStageParser с байтами данных
+    Assert: Строки удаляемой таблицы не попадают в результат, невалидный UTF-8 не вызывает ошибок
+    """
+    obfuscator = PlainObfuscator()
+    parser = PgStageParser(parser=obfuscator._parse_line, bytes_parser=obfuscator._parse_line_bytes)
+    parser.parse('COMMENT ON TABLE table_1 IS \'anon: {"mutation_name": "delete"}\';')
+    parser.parse('COPY table_1 (id, name) FROM stdin;\n')
+
+    assert parser.parse(b'1\t\xcf\xe5\xf2\xf0\n2\tname\n') == b''  # nosec
+    assert parser.flush() == b''  # nosec
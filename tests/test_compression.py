@@ -0,0 +1,173 @@
+import os
+import zlib
+from pathlib import Path
+
+import pytest
+
+from src.pg_stage.compression import (
+    CODECS,
+    LZ4_MAGIC,
+    CompressingWriter,
+    DecompressingReader,
+    ParallelZlibCompressor,
+    PyLz4Compressor,
+    PyLz4Decompressor,
+    get_codec,
+    xxh32,
+)
+
+
+@pytest.mark.parametrize(
+    ('data', 'expected'),
+    [(b'', 0x02CC5D05), (b'a', 0x550D7456), (b'abc', 0x32D153FF)],
+)
+def test_xxh32(data: bytes, expected: int) -> None:
+    """
+    Arrange: Данные с известным значением хеша
+    Act: Вызов функции `xxh32`
+    Assert: Значение совпадает с эталонным
+    """
+    assert xxh32(data) == expected  # nosec
+
+
+@pytest.mark.parametrize('size', [0, 10, 4096, 4096 * 5, 100_000])
+def test_parallel_zlib_compressor(size: int) -> None:
+    """
+    Arrange: Данные размером меньше, кратно и не кратно размеру части
+    Act: Сжатие ParallelZlibCompressor в несколько потоков маленькими частями
+    Assert: Результат - один поток zlib с корректной контрольной суммой, распаковывается в исходные данные
+    """
+    data = b''.join(f'{row}\tuser{row}@mail.ru\n'.encode() for row in range(size))[:size]
+    compressor = ParallelZlibCompressor(6, threads=3, piece_size=4096)
+
+    compressed = b''.join(compressor.compress(data[index : index + 1000]) for index in range(0, len(data), 1000))
+    compressed += compressor.flush()
+
+    assert zlib.decompress(compressed) == data  # nosec
+    assert compressed[:2] == zlib.compress(b'', 6)[:2]  # nosec
+
+
+@pytest.mark.parametrize(
+    'data',
+    [
+        b'',
+        b'short',
+        b'a' * 100_000,
+        b''.join(f'{row}\tuser{row}@mail.ru\tnote {row}\n'.encode() for row in range(20_000)),
+        os.urandom(70_000),
+    ],
+)
+def test_py_lz4_round_trip(data: bytes) -> None:
+    """
+    Arrange: Данные разной сжимаемости и размера (в том числе больше одного блока)
+    Act: Сжатие PyLz4Compressor по частям и распаковка PyLz4Decompressor по частям
+    Assert: Распакованные данные совпадают с исходными
+    """
+    compressor = PyLz4Compressor()
+    compressed = b''.join(compressor.compress(data[index : index + 10_000]) for index in range(0, len(data), 10_000))
+    compressed += compressor.flush()
+
+    decompressor = PyLz4Decompressor()
+    result = b''.join(
+        piece
+        for index in range(0, len(compressed), 777)
+        for piece in decompressor.decompress(compressed[index : index + 777])
+    )
+
+    assert compressed.startswith(LZ4_MAGIC)  # nosec
+    assert result + decompressor.flush() == data  # nosec
+
+
+def test_py_lz4_compresses_repetitive_data() -> None:
+    """
+    Arrange: Повторяющиеся строки COPY
+    Act: Сжатие PyLz4Compressor
+    Assert: Сжатые данные заметно меньше исходных
+    """
+    data = b''.join(f'{row}\tuser@mail.ru\tnote\n'.encode() for row in range(10_000))
+    compressor = PyLz4Compressor()
+
+    compressed = compressor.compress(data) + compressor.flush()
+
+    assert len(compressed) < len(data) // 2  # nosec
+
+
+def test_py_lz4_linked_blocks() -> None:
+    """
+    Arrange: Кадр со связанными блоками, второй блок ссылается на данные первого
+    Act: Распаковка PyLz4Decompressor
+    Assert: Ссылка разрешается через историю предыдущего блока
+    """
+    descriptor = bytes([0x40, 0x40])
+    frame = LZ4_MAGIC + descriptor + bytes([(xxh32(descriptor) >> 8) & 0xFF])
+    frame += (8 | 0x80000000).to_bytes(4, 'little') + b'abcdefgh'
+    block = bytes([0x04, 0x08, 0x00, 0x50]) + b'xxxxx'
+    frame += len(block).to_bytes(4, 'little') + block + bytes(4)
+
+    decompressor = PyLz4Decompressor()
+
+    assert b''.join(decompressor.decompress(frame)) == b'abcdefghabcdefghxxxxx'  # nosec
+
+
+def test_py_lz4_invalid_frame() -> None:
+    """
+    Arrange: Данные, не являющиеся кадром LZ4
+    Act: Распаковка PyLz4Decompressor
+    Assert: Ошибка ValueError
+    """
+    with pytest.raises(ValueError, match='Invalid LZ4 frame magic'):
+        list(PyLz4Decompressor().decompress(b'not an lz4 frame'))
+
+
+def test_codec_streams(tmp_path: Path) -> None:
+    """
+    Arrange: Файл для записи со сжатием LZ4
+    Act: Запись через CompressingWriter и чтение через DecompressingReader
+    Assert: Прочитанные данные совпадают с записанными
+    """
+    data = b'1\tvalue\n' * 10_000
+    path = tmp_path / 'data.lz4'
+    with CompressingWriter(open(path, 'wb'), get_codec('lz4')) as writer:
+        writer.write(data)
+
+    with DecompressingReader(open(path, 'rb'), get_codec('lz4')) as reader:
+        result = b''.join(iter(reader.read, b''))
+
+    assert result == data  # nosec
+
+
+def test_get_codec_unknown() -> None:
+    """
+    Arrange: Неизвестный алгоритм сжатия
+    Act: Вызов функции `get_codec`
+    Assert: Ошибка ValueError
+    """
+    with pytest.raises(ValueError, match='Unsupported compression method'):
+        get_codec('brotli')
+
+
+def test_get_codec_missing_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Arrange: Нет ни модуля compression.zstd, ни пакета zstandard
+    Act: Вызов функции `get_codec` для zstd
+    Assert: Ошибка ValueError с описанием требуемой зависимости
+    """
+    monkeypatch.delitem(CODECS, 'zstd', raising=False)
+
+    with pytest.raises(ValueError, match='requires Python 3.14'):
+        get_codec('zstd')
+
+
+@pytest.mark.skipif('zstd' not in CODECS, reason='zstd backend is not installed')
+def test_zstd_round_trip() -> None:
+    """
+    Arrange: Данные больше порога распаковки за один шаг
+    Act: Сжатие и распаковка кодеком zstd
+    Assert: Распакованные данные совпадают с исходными
+    """
+    data = b'1\tvalue\n' * 500_000
+    compressor = get_codec('zstd').create_compressor()
+    compressed = compressor.compress(data) + compressor.flush()
+    decompressor = get_codec('zstd').create_decompressor()
+
+    assert b''.join(decompressor.decompress(compressed)) + decompressor.flush() == data  # nosec
@@ -1,3 +1,9 @@
+import io
+from typing import List, Optional
+
+import pytest
+
+from src.pg_stage.conditions import compile_conditions
 from src.pg_stage.obfuscators.plain import PlainObfuscator
 
 
@@ -56,3 +62,98 @@ def test_by_pattern_condition(obfuscator_object: PlainObfuscator) -> None:
 
             if new_line.startswith('2'):
                 assert 'test@mail.ru' not in new_line  # nosec
+
+
+@pytest.mark.parametrize(
+    ('conditions', 'expected'),
+    [
+        ([], None),
+        ([{'column_name': 'status', 'operation': 'in', 'value': ['new', 1]}], [True, True, False, False]),
+        ([{'column_name': 'status', 'operation': 'not_in', 'value': ['new', None]}], [False, True, True, False]),
+        ([{'column_name': 'status', 'operation': 'is_null'}], [False, False, False, True]),
+        (
+            [
+                {'column_name': 'status', 'operation': 'equal', 'value': 'new'},
+                {'column_name': 'id', 'operation': 'by_pattern', 'value': '^3'},
+            ],
+            [True, False, True, False],
+        ),
+        (
+            [
+                {
+                    'all': [
+                        {'column_name': 'id', 'operation': 'not_equal', 'value': '2'},
+                        {
+                            'any': [
+                                {'column_name': 'status', 'operation': 'in', 'value': ['1', 'old']},
+                                {'column_name': 'status', 'operation': 'is_null'},
+                            ]
+                        },
+                    ],
+                },
+            ],
+            [False, False, True, True],
+        ),
+    ],
+)
+def test_compile_conditions(conditions: list, expected: Optional[List[bool]]) -> None:
+    """
+    Arrange: Условия мутации с разными операциями и группами
+    Act: Компиляция условий и проверка строк
+    Assert: Предикат выполняется только для подходящих строк, пустые условия не компилируются
+    """
+    rows = [['1', 'new'], ['2', '1'], ['3', 'old'], ['4', '\\N']]
+
+    predicate = compile_conditions(conditions, {'id': 0, 'status': 1})
+
+    if expected is None:
+        assert predicate is None  # nosec
+    else:
+        assert [predicate(row) for row in rows] == expected  # nosec
+
+
+@pytest.mark.parametrize(
+    ('condition', 'message'),
+    [
+        ({'column_name': 'id', 'operation': 'greater', 'value': '1'}, 'Invalid condition operation'),
+        ({'column_name': 'id', 'operation': 'in', 'value': '1'}, 'must be a list'),
+        ({'column_name': 'id', 'operation': 'by_pattern', 'value': 1}, 'must be a string'),
+        ({'operation': 'equal', 'value': '1'}, 'must have a column_name'),
+    ],
+)
+def test_compile_conditions_invalid(condition: dict, message: str) -> None:
+    """
+    Arrange: Неизвестная операция, операции in и by_pattern со значением неверного типа, условие без колонки
+    Act: Компиляция условий
+    Assert: Ошибка ValueError
+    """
+    with pytest.raises(ValueError, match=message):
+        compile_conditions([condition], {'id': 0})
+
+
+def test_condition_group_in_dump() -> None:
+    """
+    Arrange: Дамп с мутацией, условие которой - группа по двум колонкам
+    Act: Вызов функции `run` класса PlainObfuscator
+    Assert: Изменены только строки, для которых выполнены все условия группы
+    """
+    conditions = (
+        '[{"all": [{"column_name": "active", "operation": "equal", "value": "t"}, '
+        '{"column_name": "role", "operation": "not_in", "value": ["admin", null]}]}]'
+    )
+    dump = (
+        f'COMMENT ON COLUMN table_1.name IS \'anon: [{{"mutation_name": "fixed_value", '
+        f'"mutation_kwargs": {{"value": "hidden"}}, "conditions": {conditions}}}]\';\n'
+        'COPY table_1 (id, name, active, role) FROM stdin;\n'
+        '1\tname\tt\tuser\n'
+        '2\tname\tt\tadmin\n'
+        '3\tname\tf\tuser\n'
+        '4\tname\tt\t\\N\n'
+        '\\.\n'
+    )
+    stdout = io.StringIO()
+
+    PlainObfuscator().run(stdin=io.StringIO(dump), stdout=stdout)
+
+    rows = [line.split('\t') for line in stdout.getvalue().splitlines() if line.count('\t') == 3]
+    assert [row[1] for row in rows] == ['hidden', 'name', 'name', 'name']  # nosec
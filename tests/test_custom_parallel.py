@@ -0,0 +1,149 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from src.pg_stage.obfuscators.custom import (
+    CompressionMethod,
+    CustomObfuscator,
+    DumpIO,
+    HeaderParser,
+    OffsetPosition,
+    PgDumpError,
+    TocParser,
+)
+from tests.dump_builder import build_custom_dump, read_custom_dump
+
+ROWS_COUNT = 300
+TABLES_COUNT = 4
+COMMENTS = [
+    f'COMMENT ON COLUMN public.table_{index}.email IS \'anon: [{{"mutation_name": "email"}}]\';\n'
+    for index in range(0, TABLES_COUNT, 2)
+]
+
+
+def _make_tables() -> list:
+    return [
+        (
+            f'table_{index}',
+            ['id', 'email', 'notes'],
+            [f'{row}\tuser{row}@mail.ru\tnote {row}' for row in range(ROWS_COUNT)],
+        )
+        for index in range(TABLES_COUNT)
+    ]
+
+
+def _assert_obfuscated(result: dict) -> None:
+    for index in range(TABLES_COUNT):
+        rows = [line.split('\t') for line in result[f'table_{index}']]
+        assert [row[0] for row in rows] == [str(row) for row in range(ROWS_COUNT)]  # nosec
+        assert [row[2] for row in rows] == [f'note {row}' for row in range(ROWS_COUNT)]  # nosec
+        is_changed = [row[1] != f'user{number}@mail.ru' for number, row in enumerate(rows)]
+        assert all(is_changed) if index % 2 == 0 else not any(is_changed)  # nosec
+
+
+@pytest.mark.parametrize('compression', ['none', 'zlib'])
+def test_run_custom_with_workers(tmp_path: Path, compression: str) -> None:
+    """
+    Arrange: Файл дампа в custom формате с несколькими таблицами и смещениями блоков в TOC
+    Act: Вызов функции `run` класса CustomObfuscator с пулом процессов
+    Assert: Блоки записаны в порядке TOC, мутированы только колонки с правилами, смещения указывают на блоки,
+        в статистике учтены все записанные байты
+    """
+    dump_path = tmp_path / 'dump.backup'
+    dump_path.write_bytes(
+        build_custom_dump(tables=_make_tables(), comments=COMMENTS, compression=compression, with_offsets=True),
+    )
+    stdout = io.BytesIO()
+    with open(dump_path, 'rb') as stdin:
+        stats = CustomObfuscator(workers=2).run(stdin=stdin, stdout=stdout)
+
+    data = stdout.getvalue()
+    _assert_obfuscated(read_custom_dump(data))
+    assert stats.bytes_written == len(data)  # nosec
+
+    stream = io.BytesIO(data)
+    dio = DumpIO()
+    header = HeaderParser(dio).parse(stream)
+    for entry in TocParser(dio).parse(stream, header.version):
+        if entry.desc != 'TABLE DATA':
+            continue
+
+        assert entry.data_state == OffsetPosition.SET  # nosec
+        stream.seek(entry.offset)
+        assert stream.read(1) == b'\x01'  # nosec
+        assert dio.read_int(stream) == entry.dump_id  # nosec
+
+
+def test_run_custom_stream_with_several_tables() -> None:
+    """
+    Arrange: Дамп в custom формате со сжатием и несколькими таблицами разной структуры
+    Act: Вызов функции `run` класса CustomObfuscator с потоком без произвольного доступа
+    Assert: Каждый блок обрабатывается по своей команде COPY, все чанки zlib прочитаны, байты посчитаны
+    """
+    stdin = io.BufferedReader(
+        io.BytesIO(build_custom_dump(tables=_make_tables(), comments=COMMENTS, compression='zlib'))
+    )
+    stdout = io.BytesIO()
+    stats = CustomObfuscator().run(stdin=stdin, stdout=stdout)
+
+    _assert_obfuscated(read_custom_dump(stdout.getvalue()))
+    assert stats.bytes_written == len(stdout.getvalue())  # nosec
+
+
+@pytest.mark.parametrize(('workers', 'with_offsets'), [(0, True), (0, False), (2, True)])
+def test_run_custom_with_input_path(tmp_path: Path, workers: int, *, with_offsets: bool) -> None:
+    """
+    Arrange: Файл дампа в custom формате со смещениями блоков в TOC и без них
+    Act: Вызов функции `run` класса CustomObfuscator с путем к файлу
+    Assert: Файл прочитан через отображение в память, мутированы только колонки с правилами, байты посчитаны
+    """
+    dump_path = tmp_path / 'dump.backup'
+    dump_path.write_bytes(
+        build_custom_dump(tables=_make_tables(), comments=COMMENTS, compression='zlib', with_offsets=with_offsets),
+    )
+    stdout = io.BytesIO()
+    stats = CustomObfuscator(workers=workers).run(input_path=str(dump_path), stdout=stdout)
+
+    _assert_obfuscated(read_custom_dump(stdout.getvalue()))
+    assert stats.bytes_written == len(stdout.getvalue())  # nosec
+
+
+@pytest.mark.parametrize(('size', 'message'), [(0, 'Dump file is empty'), (4500, 'Unexpected EOF')])
+@pytest.mark.parametrize('with_offsets', [True, False])
+def test_run_custom_with_truncated_input_path(tmp_path: Path, size: int, message: str, *, with_offsets: bool) -> None:
+    """
+    Arrange: Пустой файл и файл дампа, обрезанный посреди блока данных (смещения из TOC указывают за конец файла)
+    Act: Вызов функции `run` класса CustomObfuscator с путем к файлу
+    Assert: Ошибка PgDumpError вместо ValueError от отображения файла в память
+    """
+    dump = build_custom_dump(tables=_make_tables(), comments=COMMENTS, compression='zlib', with_offsets=with_offsets)
+    dump_path = tmp_path / 'dump.backup'
+    dump_path.write_bytes(dump[:size])
+
+    with pytest.raises(PgDumpError, match=message):
+        CustomObfuscator().run(input_path=str(dump_path), stdout=io.BytesIO())
+
+
+def test_run_custom_with_workers_and_output_compression(tmp_path: Path) -> None:
+    """
+    Arrange: Файл дампа версии 1.15 со сжатием zlib и смещениями блоков в TOC
+    Act: Вызов функции `run` класса CustomObfuscator с процессами пула и сжатием результата LZ4
+    Assert: Блоки всех таблиц (в том числе без правил) перекодированы, заголовок указывает LZ4
+    """
+    dump_path = tmp_path / 'dump.backup'
+    dump_path.write_bytes(
+        build_custom_dump(
+            tables=_make_tables(),
+            comments=COMMENTS,
+            compression='zlib',
+            version=(1, 15, 0),
+            with_offsets=True,
+        ),
+    )
+    stdout = io.BytesIO()
+    CustomObfuscator(workers=2, output_compression='lz4').run(input_path=str(dump_path), stdout=stdout)
+
+    header = HeaderParser(DumpIO()).parse(io.BytesIO(stdout.getvalue()))
+    assert header.compression_method == CompressionMethod.LZ4  # nosec
+    _assert_obfuscated(read_custom_dump(stdout.getvalue()))
@@ -0,0 +1,114 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from src.pg_stage.obfuscators.custom import CustomObfuscator, DataBlockProcessor
+from tests.dump_builder import _make_data, _write_data, _write_int, build_custom_dump, read_custom_dump
+
+ROWS_COUNT = 2000
+TABLES = [
+    ('table_1', ['id', 'email'], [f'{row}\tuser{row}@mail.ru' for row in range(ROWS_COUNT)]),
+    ('table_2', ['id', 'notes'], [f'{row}\tnote {row * 7919 % 10007}' for row in range(ROWS_COUNT)]),
+]
+COMMENTS = ['COMMENT ON COLUMN public.table_1.email IS \'anon: [{"mutation_name": "email"}]\';\n']
+
+
+@pytest.fixture
+def processed_blocks(monkeypatch: pytest.MonkeyPatch) -> list:
+    calls: list = []
+    process_block = DataBlockProcessor.process_block
+
+    def wrapper(self, input_stream, output_stream, dump_id, compression):
+        calls.append(dump_id)
+        return process_block(self, input_stream, output_stream, dump_id, compression)
+
+    monkeypatch.setattr(DataBlockProcessor, 'process_block', wrapper)
+    return calls
+
+
+@pytest.mark.parametrize('compression', ['none', 'zlib'])
+def test_table_without_rules_is_copied(processed_blocks: list, compression: str) -> None:
+    """
+    Arrange: Дамп с таблицей с правилами и таблицей без правил, данные которой занимают несколько чанков
+    Act: Вызов функции `run` класса CustomObfuscator
+    Assert: Обрабатывается только блок таблицы с правилами, блок второй таблицы скопирован побайтно
+    """
+    dump = build_custom_dump(tables=TABLES, comments=COMMENTS, compression=compression)
+    stdout = io.BytesIO()
+
+    CustomObfuscator().run(stdin=io.BufferedReader(io.BytesIO(dump)), stdout=stdout)
+
+    block = b'\x01' + _write_int(4) + _write_data(_make_data(TABLES[1][2]), compression)
+    result = read_custom_dump(stdout.getvalue())
+    assert processed_blocks == [3]  # nosec
+    assert block in stdout.getvalue()  # nosec
+    assert result['table_2'] == TABLES[1][2]  # nosec
+    assert all(row != f'{index}\tuser{index}@mail.ru' for index, row in enumerate(result['table_1']))  # nosec
+
+
+@pytest.mark.parametrize('workers', [0, 2])
+def test_table_without_rules_is_copied_from_file(tmp_path: Path, processed_blocks: list, workers: int) -> None:
+    """
+    Arrange: Файл дампа со смещениями блоков в TOC, одна из таблиц без правил
+    Act: Вызов функции `run` класса CustomObfuscator с путем к файлу
+    Assert: Блок таблицы без правил скопирован побайтно и не передается в процессы пула
+    """
+    dump_path = tmp_path / 'dump.backup'
+    dump_path.write_bytes(build_custom_dump(tables=TABLES, comments=COMMENTS, compression='zlib', with_offsets=True))
+    stdout = io.BytesIO()
+
+    CustomObfuscator(workers=workers).run(input_path=str(dump_path), stdout=stdout)
+
+    block = b'\x01' + _write_int(4) + _write_data(_make_data(TABLES[1][2]), 'zlib')
+    assert 4 not in processed_blocks  # nosec
+    assert block in stdout.getvalue()  # nosec
+    assert read_custom_dump(stdout.getvalue())['table_2'] == TABLES[1][2]  # nosec
+
+
+@pytest.mark.parametrize(
+    ('comments', 'kwargs'),
+    [
+        (['COMMENT ON TABLE public.table_2 IS \'anon: {"mutation_name": "delete"}\';\n'], {}),
+        ([], {'delete_tables_by_pattern': [r'table_2']}),
+    ],
+)
+@pytest.mark.parametrize('compression', ['none', 'zlib'])
+def test_deleted_table_is_skipped(processed_blocks: list, comments: list, kwargs: dict, compression: str) -> None:
+    """
+    Arrange: Дамп с таблицей, данные которой удаляются правилом delete или шаблоном
+    Act: Вызов функции `run` класса CustomObfuscator
+    Assert: Данные удаляемой таблицы не обрабатываются, вместо них записан пустой блок
+    """
+    dump = build_custom_dump(tables=TABLES, comments=COMMENTS + comments, compression=compression)
+    stdout = io.BytesIO()
+
+    CustomObfuscator(**kwargs).run(stdin=io.BufferedReader(io.BytesIO(dump)), stdout=stdout)
+
+    dump_id = 4 + len(comments)
+    empty_data = _write_int(0) if compression == 'none' else _write_data(b'', compression)
+    assert dump_id not in processed_blocks  # nosec
+    assert stdout.getvalue().endswith(b'\x01' + _write_int(dump_id) + empty_data)  # nosec
+    assert read_custom_dump(stdout.getvalue())['table_2'] == []  # nosec
+
+
+@pytest.mark.parametrize('workers', [0, 2])
+def test_deleted_table_is_skipped_in_file(tmp_path: Path, workers: int) -> None:
+    """
+    Arrange: Файл дампа со смещениями блоков в TOC и таблицей, данные которой удаляются
+    Act: Вызов функции `run` класса CustomObfuscator с путем к файлу
+    Assert: Вместо блока удаляемой таблицы записан пустой блок, смещения блоков в TOC корректны
+    """
+    dump_path = tmp_path / 'dump.backup'
+    dump_path.write_bytes(build_custom_dump(tables=TABLES, comments=COMMENTS, compression='zlib', with_offsets=True))
+    output_path = tmp_path / 'output.backup'
+
+    with open(output_path, 'wb') as output:
+        CustomObfuscator(workers=workers, delete_tables_by_pattern=[r'table_2']).run(
+            input_path=str(dump_path),
+            stdout=output,
+        )
+
+    result = read_custom_dump(output_path.read_bytes())
+    assert result['table_2'] == []  # nosec
+    assert len(result['table_1']) == ROWS_COUNT  # nosec
@@ -0,0 +1,241 @@
+import io
+import tempfile
+from typing import Any
+
+import pytest
+
+from src.pg_stage.compression import CODECS
+from src.pg_stage.obfuscators.custom import (
+    CompressedChunkWriter,
+    CompressionMethod,
+    Constants,
+    CustomObfuscator,
+    DumpIO,
+    HeaderParser,
+    PgDumpError,
+)
+from tests.dump_builder import build_custom_dump, read_custom_dump
+
+ROWS_COUNT = 500
+TABLES = [('table_1', ['id', 'email', 'notes'], [f'{row}\tuser{row}@mail.ru\tnote {row}' for row in range(ROWS_COUNT)])]
+COMMENTS = ['COMMENT ON COLUMN public.table_1.email IS \'anon: [{"mutation_name": "email"}]\';\n']
+
+
+def _run(**kwargs: Any) -> list:
+    stdin = io.BufferedReader(io.BytesIO(build_custom_dump(tables=TABLES, comments=COMMENTS, compression='zlib')))
+    stdout = io.BytesIO()
+    CustomObfuscator(**kwargs).run(stdin=stdin, stdout=stdout)
+    return [line.split('\t') for line in read_custom_dump(stdout.getvalue())['table_1']]
+
+
+def test_compressed_block_streaming_without_temp_files(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Arrange: Сжатый дамп и маленький размер чанка, временные файлы недоступны
+    Act: Вызов функции `run` класса CustomObfuscator
+    Assert: Блок обработан потоково и разбит на несколько чанков, строки мутированы в исходном порядке
+    """
+
+    def mkstemp(*args, **kwargs):
+        msg = 'Temporary files are not expected'
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(Constants, 'ZLIB_CHUNK_SIZE', 64)
+    monkeypatch.setattr(tempfile, 'mkstemp', mkstemp)
+
+    rows = _run(use_temp_files=False)
+
+    assert [row[0] for row in rows] == [str(row) for row in range(ROWS_COUNT)]  # nosec
+    assert [row[2] for row in rows] == [f'note {row}' for row in range(ROWS_COUNT)]  # nosec
+    assert all(row[1] != f'user{index}@mail.ru' for index, row in enumerate(rows))  # nosec
+
+
+def test_compressed_block_with_temp_files() -> None:
+    """
+    Arrange: Сжатый дамп
+    Act: Вызов функции `run` класса CustomObfuscator с обработкой через временные файлы
+    Assert: Резервный вариант обработки дает тот же набор строк
+    """
+    rows = _run(use_temp_files=True)
+
+    assert [row[0] for row in rows] == [str(row) for row in range(ROWS_COUNT)]  # nosec
+    assert all(row[1] != f'user{index}@mail.ru' for index, row in enumerate(rows))  # nosec
+
+
+def test_compressed_block_pipelined(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Arrange: Сжатый дамп, маленький размер чанка и очередей конвейера
+    Act: Вызов функции `run` класса CustomObfuscator с распаковкой и сжатием в отдельных потоках
+    Assert: Строки мутированы и записаны в исходном порядке
+    """
+    monkeypatch.setattr(Constants, 'ZLIB_CHUNK_SIZE', 64)
+    monkeypatch.setattr(Constants, 'PIPELINE_QUEUE_SIZE', 1)
+
+    rows = _run(use_threads=True)
+
+    assert [row[0] for row in rows] == [str(row) for row in range(ROWS_COUNT)]  # nosec
+    assert [row[2] for row in rows] == [f'note {row}' for row in range(ROWS_COUNT)]  # nosec
+    assert all(row[1] != f'user{index}@mail.ru' for index, row in enumerate(rows))  # nosec
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'use_threads': True}, {'use_temp_files': True}])
+def test_compressed_block_parallel_compression(kwargs: dict) -> None:
+    """
+    Arrange: Сжатый дамп
+    Act: Вызов функции `run` класса CustomObfuscator со сжатием результата в нескольких потоках
+    Assert: Блок записан одним корректным потоком zlib, строки мутированы в исходном порядке
+    """
+    rows = _run(compression_threads=4, **kwargs)
+
+    assert [row[0] for row in rows] == [str(row) for row in range(ROWS_COUNT)]  # nosec
+    assert all(row[1] != f'user{index}@mail.ru' for index, row in enumerate(rows))  # nosec
+
+
+def test_compressed_block_pipelined_stage_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Arrange: Сжатый дамп и ошибка записи сжатых данных
+    Act: Вызов функции `run` класса CustomObfuscator с распаковкой и сжатием в отдельных потоках
+    Assert: Ошибка стадии конвейера передается вызывающему коду, потоки завершаются
+    """
+
+    def write_chunk(self) -> None:
+        msg = 'disk is full'
+        raise OSError(msg)
+
+    monkeypatch.setattr(Constants, 'ZLIB_CHUNK_SIZE', 64)
+    monkeypatch.setattr(CompressedChunkWriter, '_write_chunk', write_chunk)
+
+    stdin = io.BufferedReader(io.BytesIO(build_custom_dump(tables=TABLES, comments=COMMENTS, compression='zlib')))
+    with pytest.raises(PgDumpError, match='disk is full'):
+        CustomObfuscator(use_threads=True).run(stdin=stdin, stdout=io.BytesIO())
+
+
+@pytest.mark.parametrize('use_threads', [False, True])
+def test_lz4_compressed_block(monkeypatch: pytest.MonkeyPatch, *, use_threads: bool) -> None:
+    """
+    Arrange: Дамп версии 1.15 с блоками, сжатыми LZ4, и маленький размер чанка
+    Act: Вызов функции `run` класса CustomObfuscator
+    Assert: Блок распакован потоково, строки мутированы и снова сжаты LZ4
+    """
+    monkeypatch.setattr(Constants, 'ZLIB_CHUNK_SIZE', 64)
+    dump = build_custom_dump(tables=TABLES, comments=COMMENTS, compression='lz4', version=(1, 15, 0))
+    stdout = io.BytesIO()
+
+    CustomObfuscator(use_threads=use_threads).run(stdin=io.BufferedReader(io.BytesIO(dump)), stdout=stdout)
+    rows = [line.split('\t') for line in read_custom_dump(stdout.getvalue())['table_1']]
+
+    assert [row[0] for row in rows] == [str(row) for row in range(ROWS_COUNT)]  # nosec
+    assert [row[2] for row in rows] == [f'note {row}' for row in range(ROWS_COUNT)]  # nosec
+    assert all(row[1] != f'user{index}@mail.ru' for index, row in enumerate(rows))  # nosec
+
+
+@pytest.mark.parametrize(
+    ('compression_byte', 'expected'),
+    [
+        (0, CompressionMethod.NONE),
+        (1, CompressionMethod.ZLIB),
+        (2, CompressionMethod.LZ4),
+        (3, CompressionMethod.ZSTD),
+    ],
+)
+def test_parse_compression_byte(compression_byte: int, expected: CompressionMethod) -> None:
+    """
+    Arrange: Заголовок дампа версии 1.15 с байтом алгоритма сжатия
+    Act: Вызов функции `parse` класса HeaderParser
+    Assert: Алгоритм соответствует pg_compress_algorithm (none, gzip, lz4, zstd)
+    """
+    dump = bytearray(build_custom_dump(tables=TABLES, version=(1, 15, 0)))
+    dump[11] = compression_byte
+
+    header = HeaderParser(DumpIO()).parse(io.BytesIO(bytes(dump)))
+
+    assert header.compression_method == expected  # nosec
+
+
+@pytest.mark.skipif('zstd' not in CODECS, reason='zstd backend is not installed')
+def test_zstd_compressed_block() -> None:
+    """
+    Arrange: Дамп версии 1.15 с блоками, сжатыми zstd
+    Act: Вызов функции `run` класса CustomObfuscator
+    Assert: Строки мутированы и снова сжаты zstd
+    """
+    dump = build_custom_dump(tables=TABLES, comments=COMMENTS, compression='zstd', version=(1, 15, 0))
+    stdout = io.BytesIO()
+
+    CustomObfuscator().run(stdin=io.BufferedReader(io.BytesIO(dump)), stdout=stdout)
+    rows = [line.split('\t') for line in read_custom_dump(stdout.getvalue())['table_1']]
+
+    assert [row[0] for row in rows] == [str(row) for row in range(ROWS_COUNT)]  # nosec
+    assert all(row[1] != f'user{index}@mail.ru' for index, row in enumerate(rows))  # nosec
+
+
+def test_zstd_without_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Arrange: Дамп со сжатием zstd без доступной реализации zstd
+    Act: Вызов функции `run` класса CustomObfuscator
+    Assert: Ошибка PgDumpError с описанием требуемой зависимости
+    """
+    monkeypatch.delitem(CODECS, 'zstd', raising=False)
+    dump = build_custom_dump(tables=TABLES, comments=COMMENTS, compression='none', version=(1, 15, 0))
+    dump = dump[:11] + bytes([3]) + dump[12:]
+
+    with pytest.raises(PgDumpError, match='zstd requires'):
+        CustomObfuscator().run(stdin=io.BufferedReader(io.BytesIO(dump)), stdout=io.BytesIO())
+
+
+@pytest.mark.parametrize(
+    ('compression', 'version', 'output_compression', 'expected'),
+    [
+        ('zlib', (1, 15, 0), 'none', CompressionMethod.NONE),
+        ('none', (1, 15, 0), 'zlib', CompressionMethod.ZLIB),
+        ('zlib', (1, 15, 0), 'lz4', CompressionMethod.LZ4),
+        ('lz4', (1, 15, 0), 'zlib', CompressionMethod.ZLIB),
+        ('zlib', (1, 14, 0), 'none', CompressionMethod.NONE),
+        ('none', (1, 14, 0), 'zlib', CompressionMethod.RAW),
+    ],
+)
+def test_output_compression(
+    compression: str,
+    version: tuple,
+    output_compression: str,
+    expected: CompressionMethod,
+) -> None:
+    """
+    Arrange: Дамп с одним методом сжатия блоков
+    Act: Вызов функции `run` класса CustomObfuscator с другим методом сжатия результата
+    Assert: Заголовок результата указывает новый метод сжатия, блоки перекодированы, строки мутированы
+    """
+    dump = build_custom_dump(tables=TABLES, comments=COMMENTS, compression=compression, version=version)
+    stdout = io.BytesIO()
+
+    CustomObfuscator(output_compression=output_compression, compression_level=1).run(
+        stdin=io.BufferedReader(io.BytesIO(dump)),
+        stdout=stdout,
+    )
+    header = HeaderParser(DumpIO()).parse(io.BytesIO(stdout.getvalue()))
+    rows = [line.split('\t') for line in read_custom_dump(stdout.getvalue())['table_1']]
+
+    assert header.compression_method == expected  # nosec
+    assert [row[0] for row in rows] == [str(row) for row in range(ROWS_COUNT)]  # nosec
+    assert all(row[1] != f'user{index}@mail.ru' for index, row in enumerate(rows))  # nosec
+
+
+def test_output_compression_requires_new_archive_version() -> None:
+    """
+    Arrange: Дамп версии 1.14, в заголовке которой нельзя указать LZ4
+    Act: Вызов функции `run` класса CustomObfuscator со сжатием результата LZ4
+    Assert: Ошибка PgDumpError
+    """
+    dump = build_custom_dump(tables=TABLES, comments=COMMENTS, compression='zlib', version=(1, 14, 0))
+
+    with pytest.raises(PgDumpError, match='requires archive version 1.15'):
+        CustomObfuscator(output_compression='lz4').run(stdin=io.BufferedReader(io.BytesIO(dump)), stdout=io.BytesIO())
+
+
+def test_output_compression_unknown() -> None:
+    """
+    Arrange: Неизвестный метод сжатия результата
+    Act: Создание CustomObfuscator
+    Assert: Ошибка ValueError
+    """
+    with pytest.raises(ValueError, match='Unsupported output compression'):
+        CustomObfuscator(output_compression='brotli')
@@ -0,0 +1,139 @@
+import io
+import uuid
+
+import pytest
+
+from src.pg_stage.obfuscators.plain import PlainObfuscator
+
+MUTATIONS = [
+    '{"mutation_name": "first_name"}',
+    '{"mutation_name": "email"}',
+    '{"mutation_name": "address"}',
+    '{"mutation_name": "numeric_integer", "mutation_kwargs": {"start": 1, "end": 1000000}}',
+    '{"mutation_name": "date", "mutation_kwargs": {"start": 1990, "end": 2020}}',
+    '{"mutation_name": "uuid4"}',
+    '{"mutation_name": "string_by_mask", "mutation_kwargs": {"mask": "@@##-@@##"}}',
+    '{"mutation_name": "random_choice", "mutation_kwargs": {"choices": ["a", "b", "c", "d", "e", "f"]}}',
+]
+
+
+@pytest.fixture(autouse=True)
+def secret_key(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv('SECRET_KEY', 'secret')
+    monkeypatch.setenv('SECRET_KEY_NONCE', 'nonce')
+
+
+def _run(mutation: str, **kwargs) -> list:
+    rows = '\n'.join(f'{row}\tvalue {row % 10}' for row in range(50))
+    dump = ''.join(
+        f"COMMENT ON COLUMN {table}.value IS 'anon: [{mutation}]';\nCOPY {table} (id, value) FROM stdin;\n{rows}\n\\.\n"
+        for table in ('table_1', 'table_2')
+    )
+    stdout = io.StringIO()
+    PlainObfuscator(deterministic=True, **kwargs).run(stdin=io.StringIO(dump), stdout=stdout)
+    return [line.split('\t') for line in stdout.getvalue().splitlines() if '\t' in line]
+
+
+@pytest.mark.parametrize('mutation', MUTATIONS)
+def test_deterministic_mutations(mutation: str) -> None:
+    """
+    Arrange: Две таблицы с одинаковыми значениями колонки и одинаковым правилом мутации
+    Act: Два запуска PlainObfuscator в детерминированном режиме
+    Assert: Одинаковые исходные значения мутированы одинаково в обеих таблицах и в обоих запусках
+    """
+    rows = _run(mutation)
+    values_by_source = {}
+    for row_id, value in rows:
+        values_by_source.setdefault(int(row_id) % 10, set()).add(value)
+
+    assert all(len(values) == 1 for values in values_by_source.values())  # nosec
+    assert len({value for values in values_by_source.values() for value in values}) > 1  # nosec
+    assert 'value 0' not in values_by_source[0]  # nosec
+    assert _run(mutation) == rows  # nosec
+
+
+def test_deterministic_uuid4() -> None:
+    """
+    Arrange: Таблица с мутацией uuid4
+    Act: Запуск PlainObfuscator в детерминированном режиме
+    Assert: Результат - корректный uuid версии 4
+    """
+    rows = _run('{"mutation_name": "uuid4"}')
+
+    assert all(uuid.UUID(value).version == 4 for _, value in rows)  # nosec
+
+
+def test_deterministic_depends_on_secret_key(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Arrange: Разные значения SECRET_KEY
+    Act: Запуски PlainObfuscator в детерминированном режиме
+    Assert: Результат мутации зависит от ключа
+    """
+    rows = _run('{"mutation_name": "email"}')
+    monkeypatch.setenv('SECRET_KEY', 'another secret')
+
+    assert _run('{"mutation_name": "email"}') != rows  # nosec
+
+
+def test_deterministic_in_workers() -> None:
+    """
+    Arrange: Таблица с повторяющимися значениями
+    Act: Запуск PlainObfuscator в детерминированном режиме с пулом процессов
+    Assert: Результат совпадает с обработкой в текущем процессе
+    """
+    mutation = '{"mutation_name": "first_name"}'
+
+    assert _run(mutation, workers=2, worker_batch_size=7) == _run(mutation)  # nosec
+
+
+def test_deterministic_without_secret_key(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Arrange: Не задана переменная окружения SECRET_KEY
+    Act: Создание PlainObfuscator в детерминированном режиме
+    Assert: Ошибка ValueError
+    """
+    monkeypatch.delenv('SECRET_KEY')
+
+    with pytest.raises(ValueError, match='SECRET_KEY not set'):
+        PlainObfuscator(deterministic=True)
+
+
+def _run_unique(mutation: str, source_values: list, **kwargs) -> dict:
+    rows = '\n'.join(f'{row}\t{value}' for row, value in enumerate(source_values))
+    dump = (
+        f"COMMENT ON COLUMN table_1.value IS 'anon: [{mutation}]';\nCOPY table_1 (id, value) FROM stdin;\n{rows}\n\\.\n"
+    )
+    stdout = io.StringIO()
+    PlainObfuscator(deterministic=True, **kwargs).run(stdin=io.StringIO(dump), stdout=stdout)
+    values = [line.split('\t')[1] for line in stdout.getvalue().splitlines() if '\t' in line]
+    return dict(zip(source_values, values))
+
+
+@pytest.mark.parametrize(
+    ('mutation', 'source_values'),
+    [
+        (
+            '{"mutation_name": "numeric_integer", "mutation_kwargs": {"start": 1, "end": 1000000, "unique": true}}',
+            ['1', '2', '3', 'x'],
+        ),
+        (
+            '{"mutation_name": "numeric_smallserial", "mutation_kwargs": {"start": 1, "end": 20, "unique": true}}',
+            [str(row) for row in range(1, 21)],
+        ),
+        (
+            '{"mutation_name": "string_by_mask", "mutation_kwargs": {"mask": "@@##", "unique": true}}',
+            ['ab1', 'cd2', 'ef3'],
+        ),
+    ],
+)
+def test_deterministic_unique_does_not_depend_on_order(mutation: str, source_values: list) -> None:
+    """
+    Arrange: Уникальная мутация в детерминированном режиме
+    Act: Два запуска PlainObfuscator с одинаковыми строками в прямом и обратном порядке
+    Assert: Каждое исходное значение мутировано одинаково независимо от порядка строк, значения не повторяются
+    """
+    forward = _run_unique(mutation, source_values)
+    backward = _run_unique(mutation, source_values[::-1])
+
+    assert forward == backward  # nosec
+    assert len(set(forward.values())) == len(source_values)  # nosec
@@ -0,0 +1,60 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from src.pg_stage.obfuscators.directory import DirectoryObfuscator
+from tests.dump_builder import build_directory_dump, read_directory_dump
+
+ROWS_COUNT = 100
+TABLES = [
+    ('table_1', ['id', 'email', 'notes'], [f'{row}\tuser{row}@mail.ru\tnote {row}' for row in range(ROWS_COUNT)]),
+    ('table_2', ['id', 'email'], [f'{row}\tuser{row}@mail.ru' for row in range(ROWS_COUNT)]),
+]
+COMMENTS = ['COMMENT ON COLUMN public.table_1.email IS \'anon: [{"mutation_name": "email"}]\';\n']
+
+
+@pytest.mark.parametrize(('compression', 'workers'), [('none', 0), ('gzip', 0), ('gzip', 2), ('lz4', 2)])
+def test_run_directory(tmp_path: Path, compression: str, workers: int) -> None:
+    """
+    Arrange: Дамп в формате directory с двумя таблицами, правило обфускации есть только у одной
+    Act: Вызов функции `run` класса DirectoryObfuscator
+    Assert: Мутированы только колонки с правилами, toc.dat скопирован без изменений
+    """
+    input_path = str(tmp_path / 'input')
+    output_path = str(tmp_path / 'output')
+    build_directory_dump(input_path, tables=TABLES, comments=COMMENTS, compression=compression)
+
+    DirectoryObfuscator(workers=workers).run(input_path=input_path, output_path=output_path)
+
+    result = read_directory_dump(output_path)
+    first_rows = [line.split('\t') for line in result['table_1']]
+    assert [row[0] for row in first_rows] == [str(row) for row in range(ROWS_COUNT)]  # nosec
+    assert [row[2] for row in first_rows] == [f'note {row}' for row in range(ROWS_COUNT)]  # nosec
+    assert all(row[1] != f'user{index}@mail.ru' for index, row in enumerate(first_rows))  # nosec
+    assert result['table_2'] == TABLES[1][2]  # nosec
+    assert sorted(os.listdir(output_path)) == sorted(os.listdir(input_path))  # nosec
+    with (
+        open(os.path.join(input_path, 'toc.dat'), 'rb') as source,
+        open(os.path.join(output_path, 'toc.dat'), 'rb') as target,
+    ):
+        assert source.read() == target.read()  # nosec
+
+
+@pytest.mark.parametrize('compression', ['none', 'gzip', 'lz4'])
+def test_run_directory_deleted_table(tmp_path: Path, compression: str) -> None:
+    """
+    Arrange: Дамп в формате directory, данные одной из таблиц удаляются шаблоном
+    Act: Вызов функции `run` класса DirectoryObfuscator
+    Assert: Вместо файла данных удаляемой таблицы записан пустой файл с тем же сжатием
+    """
+    input_path = str(tmp_path / 'input')
+    output_path = str(tmp_path / 'output')
+    build_directory_dump(input_path, tables=TABLES, comments=COMMENTS, compression=compression)
+
+    DirectoryObfuscator(delete_tables_by_pattern=[r'table_2']).run(input_path=input_path, output_path=output_path)
+
+    result = read_directory_dump(output_path)
+    assert result['table_2'] == []  # nosec
+    assert len(result['table_1']) == ROWS_COUNT  # nosec
+    assert sorted(os.listdir(output_path)) == sorted(os.listdir(input_path))  # nosec
@@ -0,0 +1,65 @@
+import pytest
+
+from src.pg_stage.hashtable import HashSet, HashTable
+
+
+def test_hash_table() -> None:
+    """
+    Arrange: Пустая таблица с открытой адресацией
+    Act: Запись ключей сверх начального количества ячеек и замена значения
+    Assert: Все ключи находят свои значения, таблица увеличилась, неизвестный ключ не найден
+    """
+    table = HashTable(capacity=8)
+    for key in range(1000):
+        table.set(key * 7919 - 500000, key, key)
+    table.set(-500000, 0, 42)
+
+    assert len(table) == 1000  # nosec
+    assert table.capacity >= 1000 * 4 // 3  # nosec
+    assert table.get(-500000, 0) == 42  # nosec
+    assert all(table.get(key * 7919 - 500000, key) == key for key in range(1, 1000))  # nosec
+    assert table.get(1, 1) is None  # nosec
+
+
+def test_hash_table_first_half_collision() -> None:
+    """
+    Arrange: Два ключа с одинаковой первой половиной хеша
+    Act: Запись обоих ключей
+    Assert: Ключи не объединяются, у каждого свое значение
+    """
+    table = HashTable()
+    table.set(123, 1, 10)
+    table.set(123, 2, 20)
+
+    assert (table.get(123, 1), table.get(123, 2), table.get(123, 3)) == (10, 20, None)  # nosec
+    assert len(table) == 2  # nosec
+
+
+def test_hash_table_value_out_of_range() -> None:
+    """
+    Arrange: Пустая таблица
+    Act: Запись отрицательного значения
+    Assert: Ошибка ValueError
+    """
+    with pytest.raises(ValueError, match='out of range'):
+        HashTable().set(1, 1, -1)
+
+
+def test_hash_set() -> None:
+    """
+    Arrange: Пустое множество хешей
+    Act: Добавление хешей сверх начального количества ячеек, повторов и нуля
+    Assert: Повторы обнаруживаются, множество увеличилось, после сброса хеши добавляются снова
+    """
+    hash_set = HashSet(capacity=8)
+    hashes = [(key * 0x9E3779B97F4A7C15 & (2**64 - 1)) - 2**63 for key in range(1, 1000)]
+
+    assert all(hash_set.add(key) for key in hashes)  # nosec
+    assert not any(hash_set.add(key) for key in hashes)  # nosec
+    assert hash_set.add(0)  # nosec
+    assert not hash_set.add(0)  # nosec
+    assert len(hash_set) == 1000  # nosec
+    assert hash_set.capacity >= 1000 * 4 // 3  # nosec
+
+    hash_set.clear()
+    assert hash_set.add(hashes[0])  # nosec
@@ -78,3 +78,32 @@ def test_parse_copy_values_without_delete_tables_by_pattern_and_not_found_table(
     )
     assert not obfuscator_object_with_delete_tables_by_pattern._is_delete  # nosec
     assert obfuscator_object_with_delete_tables_by_pattern._is_data  # nosec
+
+
+def test_copy_checks_keep_state() -> None:
+    """
+    Arrange: Обфускатор в процессе обработки блока COPY с уникальными значениями колонки
+    Act: Проверки других таблиц по строкам COPY
+    Assert: Результаты проверок верные, состояние текущего блока и области уникальности не изменены
+    """
+    obfuscator = PlainObfuscator(unique_lifetime='table', delete_tables_by_pattern=[r'^logs\.'])
+    obfuscator._parse_line(
+        line=(
+            'COMMENT ON COLUMN public.users.email IS '
+            '\'anon: [{"mutation_name": "email", "mutation_kwargs": {"unique": true}}]\';'
+        ),
+    )
+    obfuscator._parse_line(line='COPY public.users (id, email) FROM stdin;')
+    obfuscator._uniqueness.scope('public.users.email').add('value')
+
+    assert not obfuscator._is_copy_pass_through(copy_line='COPY public.users (id, email) FROM stdin;')  # nosec
+    assert not obfuscator._is_copy_parallel_safe(copy_line='COPY public.users (id, email) FROM stdin;')  # nosec
+    assert obfuscator._is_copy_pass_through(copy_line='COPY other.notes (id) FROM stdin;')  # nosec
+    assert obfuscator._is_copy_parallel_safe(copy_line='COPY other.notes (id) FROM stdin;')  # nosec
+    assert obfuscator._is_copy_deleted(copy_line='COPY logs.events (id) FROM stdin;')  # nosec
+    assert not obfuscator._is_copy_pass_through(copy_line='COPY logs.events (id) FROM stdin;')  # nosec
+    assert obfuscator._table_name == 'public.users'  # nosec
+    assert obfuscator._schema_name == 'public'  # nosec
+    assert obfuscator._table_plan is not None  # nosec
+    assert not obfuscator._uniqueness.scope('public.users.email').add('value')  # nosec
+    assert 'other.notes' not in obfuscator._map_tables  # nosec
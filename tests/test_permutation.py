@@ -0,0 +1,76 @@
+import pytest
+
+from src.pg_stage.mutator import Mutator
+from src.pg_stage.permutation import FeistelPermutation
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 10, 257, 1000, 4096])
+def test_feistel_permutation_is_bijection(size: int) -> None:
+    """
+    Arrange: Перестановка отрезка заданного размера
+    Act: Получение всех значений перестановки
+    Assert: Каждое значение отрезка встречается ровно один раз
+    """
+    permutation = FeistelPermutation(size, key=42)
+
+    assert sorted(permutation) == list(range(size))  # nosec
+
+
+def test_feistel_permutation_depends_on_key() -> None:
+    """
+    Arrange: Две перестановки одного отрезка с разными ключами и одна с повторным ключом
+    Act: Получение значений перестановок
+    Assert: Порядок определяется ключом
+    """
+    assert list(FeistelPermutation(1000, key=1)) != list(FeistelPermutation(1000, key=2))  # nosec
+    assert list(FeistelPermutation(1000, key=1)) == list(FeistelPermutation(1000, key=1))  # nosec
+
+
+def test_feistel_permutation_large_range() -> None:
+    """
+    Arrange: Перестановка диапазона bigint
+    Act: Получение нескольких значений
+    Assert: Значения в пределах диапазона и не повторяются
+    """
+    permutation = FeistelPermutation(2**64, key=7)
+
+    values = [permutation[index] for index in range(1000)]
+
+    assert all(0 <= value < 2**64 for value in values)  # nosec
+    assert len(set(values)) == len(values)  # nosec
+    with pytest.raises(IndexError):
+        permutation[2**64]
+
+
+@pytest.mark.parametrize(
+    'mutation_name',
+    ['numeric_smallserial', 'numeric_serial', 'numeric_bigserial', 'numeric_integer', 'numeric_bigint'],
+)
+def test_unique_numeric_fills_range(mutation_name: str) -> None:
+    """
+    Arrange: Уникальная мутация числа в узком диапазоне
+    Act: Генерация всех значений диапазона
+    Assert: Получены все числа диапазона без повторов, следующее значение вызывает ошибку
+    """
+    mutator = Mutator()
+    mutation = getattr(mutator, f'mutation_{mutation_name}')
+
+    values = [int(mutation(start=10, end=509, unique=True)) for _ in range(500)]
+
+    assert sorted(values) == list(range(10, 510))  # nosec
+    with pytest.raises(RecursionError, match='All unique values'):
+        mutation(start=10, end=509, unique=True)
+
+
+def test_unique_string_by_mask() -> None:
+    """
+    Arrange: Уникальная мутация строки по маске из двух символов и двух цифр
+    Act: Генерация всех возможных значений маски
+    Assert: Значения соответствуют маске и не повторяются
+    """
+    mutator = Mutator()
+
+    values = [mutator.mutation_string_by_mask(mask='@#-@#', unique=True) for _ in range(26 * 10 * 26 * 10)]
+
+    assert len(set(values)) == len(values)  # nosec
+    assert all(value[0].isupper() and value[1].isdigit() and value[2] == '-' for value in values)  # nosec
@@ -0,0 +1,106 @@
+import pytest
+
+from src.pg_stage.mutator import Mutator
+from src.pg_stage.pools import ValuePool
+
+
+def test_value_pool() -> None:
+    """
+    Arrange: Значения с повторами
+    Act: Создание ValuePool
+    Assert: Повторы отброшены, значения доступны по индексу в исходном порядке
+    """
+    pool = ValuePool(['Anna', 'Bob', 'Anna', '', 'Иван'])
+
+    assert len(pool) == 4  # nosec
+    assert [pool[index] for index in range(len(pool))] == ['Anna', 'Bob', '', 'Иван']  # nosec
+
+
+def test_value_pool_empty() -> None:
+    """
+    Arrange: Пустой список значений
+    Act: Создание ValuePool
+    Assert: Ошибка ValueError
+    """
+    with pytest.raises(ValueError, match='cannot be empty'):
+        ValuePool([])
+
+
+@pytest.mark.parametrize('mutation_name', ['first_name', 'last_name', 'email', 'address'])
+def test_pooled_mutations(mutation_name: str) -> None:
+    """
+    Arrange: Мутатор с маленькими пулами
+    Act: Многократный вызов мутации
+    Assert: Значения выбираются из одного пула
+    """
+    mutator = Mutator(pool_size=20)
+    mutation = getattr(mutator, f'mutation_{mutation_name}')
+
+    values = {mutation() for _ in range(200)}
+
+    assert len(values) <= 20  # nosec
+    assert values <= {mutator._pools[mutation_name][index] for index in range(len(mutator._pools[mutation_name]))}  # nosec
+
+
+def test_pooled_unique_values() -> None:
+    """
+    Arrange: Мутатор с маленьким пулом email
+    Act: Генерация уникальных email в количестве, превышающем размер пула
+    Assert: Значения не повторяются, после исчерпания пула генерируются обычным способом
+    """
+    mutator = Mutator(pool_size=20)
+
+    values = [mutator.mutation_email(unique=True) for _ in range(50)]
+
+    assert len(set(values)) == 50  # nosec
+
+
+def test_pool_refresh() -> None:
+    """
+    Arrange: Мутатор с обновлением пула после 10 значений
+    Act: Генерация 25 значений
+    Assert: Пул сгенерирован заново два раза
+    """
+    mutator = Mutator(pool_size=20, pool_refresh=10)
+
+    for _ in range(25):
+        mutator.mutation_first_name()
+
+    assert mutator._pools['first_name'].generation == 2  # nosec
+
+
+def test_pool_deterministic(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Arrange: Два детерминированных мутатора с пулами
+    Act: Мутация одинаковых исходных значений в разном порядке
+    Assert: Результат зависит только от исходного значения
+    """
+    monkeypatch.setenv('SECRET_KEY', 'secret')
+    monkeypatch.setenv('SECRET_KEY_NONCE', 'nonce')
+    results = []
+    for source_values in (['a', 'b', 'c'], ['c', 'b', 'a']):
+        mutator = Mutator(deterministic=True, pool_size=50)
+        mutation = mutator.make_deterministic(mutator.mutation_last_name, key='last_name')
+        results.append({value: mutation(current_value=value) for value in source_values})
+
+    assert results[0] == results[1]  # nosec
+
+
+@pytest.mark.parametrize('mutation_name', ['email', 'first_name'])
+def test_pool_deterministic_unique(monkeypatch: pytest.MonkeyPatch, mutation_name: str) -> None:
+    """
+    Arrange: Два детерминированных мутатора с пулами и уникальной мутацией
+    Act: Мутация одинаковых исходных значений в прямом и обратном порядке
+    Assert: Результат зависит только от исходного значения, значения не повторяются
+    """
+    monkeypatch.setenv('SECRET_KEY', 'secret')
+    monkeypatch.setenv('SECRET_KEY_NONCE', 'nonce')
+    source_values = [f'x{index}@y.z' for index in range(5)]
+    results = []
+    for values in (source_values, source_values[::-1]):
+        mutator = Mutator(deterministic=True, pool_size=1000)
+        mutation = mutator.make_deterministic(getattr(mutator, f'mutation_{mutation_name}'), key=mutation_name)
+        results.append({value: mutation(current_value=value, unique=True) for value in values})
+
+    assert results[0] == results[1]  # nosec
+    assert len(set(results[0].values())) == len(source_values)  # nosec
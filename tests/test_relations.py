@@ -0,0 +1,118 @@
+import io
+import os
+
+import pytest
+
+from src.pg_stage.obfuscators.plain import PlainObfuscator
+from src.pg_stage.relations import RelationStore, relation_space
+
+SPACE = relation_space('table_1', 'first_name', 'id')
+
+
+@pytest.mark.parametrize('hot_size', [None, 2])
+def test_relation_store(tmp_path, hot_size) -> None:
+    """
+    Arrange: Хранилище связей в памяти или с выгрузкой на диск и маленьким горячим набором
+    Act: Сохранение значений и привязка к ним ключей из разных пространств
+    Assert: Все ключи находят свои значения, в том числе вытесненные из горячего набора
+    """
+    store = RelationStore(hot_size=hot_size, spill_directory=str(tmp_path))
+    other_space = relation_space('table_2', 'f_name', 'uuid')
+    for key in range(10):
+        handle = store.add(f'value {key}')
+        store.bind(SPACE, str(key), handle)
+        store.bind(other_space, str(key), handle)
+
+    assert len(store) == 10  # nosec
+    assert store.find(SPACE, '10') is None  # nosec
+    for key in range(10):
+        assert store.value(store.find(SPACE, str(key))) == f'value {key}'  # nosec
+        assert store.find(other_space, str(key)) == store.find(SPACE, str(key))  # nosec
+
+    assert store.value(100) is None  # nosec
+
+
+def test_relation_store_close(tmp_path) -> None:
+    """
+    Arrange: Хранилище связей с выгрузкой на диск
+    Act: Вызов функции `close` класса RelationStore
+    Assert: Временная база удалена, хранилище пустое
+    """
+    store = RelationStore(hot_size=1, spill_directory=str(tmp_path))
+    store.bind(SPACE, 'key', store.add('value'))
+    assert len(os.listdir(tmp_path)) == 1  # nosec
+
+    store.close()
+
+    assert os.listdir(tmp_path) == []  # nosec
+    assert len(store) == 0  # nosec
+    assert store.find(SPACE, 'key') is None  # nosec
+
+
+def test_relations_with_spill(tmp_path) -> None:
+    """
+    Arrange: Дамп таблиц со связанными полями и обфускатор, который держит в памяти одну связь
+    Act: Вызов функции `run` класса PlainObfuscator
+    Assert: Связанное поле мутировано во всех таблицах одинаково, временная база удалена
+    """
+    with open('tests/sql/test_parse_copy_values_with_relations.sql') as file:
+        dump_sql = file.read()
+
+    stdout = io.StringIO()
+    obfuscator = PlainObfuscator(relation_cache_size=1, relation_spill_directory=str(tmp_path))
+    obfuscator.run(stdin=io.StringIO(dump_sql), stdout=stdout)
+
+    rows = [line.split('\t') for line in stdout.getvalue().splitlines() if line.startswith('20f654fe')]
+    names_by_id = {}
+    for row_id, name, _ in rows[:6]:
+        names_by_id.setdefault(row_id, set()).add(name)
+
+    assert all(len(names) == 1 for names in names_by_id.values())  # nosec
+    assert {name for names in names_by_id.values() for name in names}.isdisjoint({'111n', '222n'})  # nosec
+    assert [row[1] for row in rows[6:]] == ['111n', '222n']  # nosec
+    assert os.listdir(tmp_path) == []  # nosec
+
+
+def test_relation_store_persistent(tmp_path) -> None:
+    """
+    Arrange: Постоянная база связей, заполненная предыдущим запуском
+    Act: Поиск ключей новым хранилищем с той же базой и маленьким горячим набором
+    Assert: Ключи находят значения прошлого запуска, новые значения получают новые дескрипторы, база не удалена
+    """
+    path = str(tmp_path / 'relations.sqlite')
+    store = RelationStore(path=path)
+    handles = [store.add(f'value {key}') for key in range(3)]
+    for key, handle in enumerate(handles):
+        store.bind(SPACE, str(key), handle)
+    store.close()
+
+    store = RelationStore(path=path, hot_size=1)
+    new_handle = store.add('new value')
+
+    assert [store.value(store.find(SPACE, str(key))) for key in range(3)] == ['value 0', 'value 1', 'value 2']  # nosec
+    assert new_handle not in handles  # nosec
+    assert len(store) == 4  # nosec
+    store.close()
+    assert os.path.exists(path)  # nosec
+
+
+def test_relations_shared_between_runs(tmp_path) -> None:
+    """
+    Arrange: Дамп таблиц со связанными полями и постоянная база связей
+    Act: Два запуска PlainObfuscator с одной базой
+    Assert: Связанное поле мутировано в обоих запусках одинаково
+    """
+    with open('tests/sql/test_parse_copy_values_with_relations.sql') as file:
+        dump_sql = file.read()
+
+    results = []
+    for _ in range(2):
+        stdout = io.StringIO()
+        PlainObfuscator(relation_store_path=str(tmp_path / 'relations.sqlite')).run(
+            stdin=io.StringIO(dump_sql),
+            stdout=stdout,
+        )
+        results.append(stdout.getvalue())
+
+    assert results[0] == results[1]  # nosec
+    assert '111n' not in results[0].split('COPY table_4')[0]  # nosec
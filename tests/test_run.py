@@ -0,0 +1,83 @@
+import io
+
+import pytest
+
+from src.pg_stage.obfuscators.plain import PlainObfuscator
+from src.pg_stage.streams import LineReader, OutputWriter, WriteStats
+
+
+@pytest.mark.parametrize('block_size', [1, 2, 3, 7, 1024])
+def test_line_reader_copy_data_block(block_size: int) -> None:
+    """
+    Arrange: Поток с блоком данных COPY, терминатором и продолжением дампа
+    Act: Вызов функции `copy_data_block` класса LineReader с разными размерами блока
+    Assert: Скопированы только данные до терминатора, остальные строки читаются построчно
+    """
+    reader = LineReader(io.StringIO('1\ta\\\\.b\n\\\n2\tc\n\\.\n\nSELECT 1;\n'), block_size=block_size)
+    chunks = []
+    reader.copy_data_block(chunks.append)
+
+    assert ''.join(chunks) == '1\ta\\\\.b\n\\\n2\tc\n'  # nosec
+    assert list(reader) == ['\\.\n', '\n', 'SELECT 1;\n']  # nosec
+
+
+def test_run_pass_through_table_without_mutations(
+    obfuscator_object: PlainObfuscator,
+    capsys: pytest.CaptureFixture,
+) -> None:
+    """
+    Arrange: Дамп таблиц с мутациями и без
+    Act: Вызов функции `run` класса Obfuscator
+    Assert: Данные таблицы без мутаций скопированы без разбора строк, остальные обфусцированы
+    """
+    with open('tests/sql/test_parse_copy_values_with_relations.sql') as file:
+        dump_sql = file.read()
+
+    parsed_lines = []
+    parse_line = obfuscator_object._parse_line
+
+    def _parse_line(*, line: str):
+        parsed_lines.append(line)
+        return parse_line(line=line)
+
+    obfuscator_object._parse_line = _parse_line  # type: ignore[method-assign]
+    obfuscator_object.run(stdin=io.StringIO(dump_sql))
+
+    result = capsys.readouterr().out.splitlines()
+    table_4_data = dump_sql.split('COPY table_4 (identifier, fir_name, las_name) FROM stdin;\n')[1]
+    assert result[-3:] == table_4_data.splitlines()[:3]  # nosec
+    assert sum('Lourense' in line for line in parsed_lines) == 3  # nosec
+    assert len(result) == len(dump_sql.splitlines())  # nosec
+
+
+def test_output_writer_batches_lines() -> None:
+    """
+    Arrange: Бинарный поток и писатель с маленьким буфером
+    Act: Запись строк и блока данных через OutputWriter
+    Assert: Данные записаны батчами, статистика учитывает все байты и строки
+    """
+    stream = io.BytesIO()
+    writer = OutputWriter(stream, buffer_size=8)
+    writer.write_line('abc')
+    assert stream.getvalue() == b''  # nosec
+
+    writer.write_line('строка')
+    writer.write('1\t2\n3\t4\n')
+    writer.flush()
+
+    assert stream.getvalue() == 'abc\nстрока\n1\t2\n3\t4\n'.encode()  # nosec
+    assert writer.stats == WriteStats(bytes_written=len(stream.getvalue()), lines_written=4)  # nosec
+
+
+def test_run_to_binary_stream(obfuscator_object: PlainObfuscator) -> None:
+    """
+    Arrange: Дамп таблицы с удалением данных
+    Act: Вызов функции `run` класса Obfuscator с бинарным выходным потоком
+    Assert: Результат записан в переданный поток, возвращена статистика записи
+    """
+    stdout = io.BytesIO()
+    with open('tests/sql/test_parse_copy_values_with_delete_tables.sql') as file:
+        stats = obfuscator_object.run(stdin=file, stdout=stdout)
+
+    assert stdout.getvalue().count(b'\n') == stats.lines_written == 7  # nosec
+    assert stats.bytes_written == len(stdout.getvalue())  # nosec
@@ -0,0 +1,44 @@
+from src.pg_stage.obfuscators.plain import PlainObfuscator
+
+
+def test_table_plan_compiled_on_copy(obfuscator_object: PlainObfuscator) -> None:
+    """
+    Arrange: Комментарии с мутациями, одна из которых зависит от другой колонки
+    Act: Вызов функции `_parse_line` класса Obfuscator со строкой COPY
+    Assert: План построен один раз, зависимые колонки идут последними, константы вычислены заранее
+    """
+    obfuscator_object._parse_line(
+        line='COMMENT ON COLUMN table_1.uuid IS \'anon: [{"mutation_name": "uuid5_by_source_value", '
+        '"mutation_kwargs": {"source_column": "email", "namespace": "6ba7b810-9dad-11d1-80b4-00c04fd430c8"}}]\';',
+    )
+    obfuscator_object._parse_line(line='COMMENT ON COLUMN table_1.email IS \'anon: [{"mutation_name": "email"}]\';')
+    obfuscator_object._parse_line(line='COMMENT ON COLUMN table_1.notes IS \'anon: [{"mutation_name": "null"}]\';')
+    obfuscator_object._parse_line(line='COPY table_1 (uuid, id, email, notes) FROM stdin;')
+
+    plan = obfuscator_object._table_plan
+    assert plan is not None  # nosec
+    assert [column.name for column in plan.columns] == ['email', 'notes', 'uuid']  # nosec
+    assert [column.index for column in plan.columns] == [2, 3, 0]  # nosec
+    assert plan.columns[1].mutations[0].constant == '\\N'  # nosec
+    assert plan.uses_obfuscated_values  # nosec
+
+    new_line = obfuscator_object._parse_line(line='1\t2\ttest@mail.ru\tnote')
+    assert new_line is not None  # nosec
+    uuid, row_id, email, notes = new_line.split('\t')
+    assert (row_id, notes) == ('2', '\\N')  # nosec
+    assert email != 'test@mail.ru'  # nosec
+    assert obfuscator_object._table_plan is plan  # nosec
+
+    obfuscator_object._parse_line(line='\\.')
+    assert obfuscator_object._table_plan is None  # nosec
+
+
+def test_table_plan_not_compiled_without_mutations(obfuscator_object: PlainObfuscator) -> None:
+    """
+    Arrange: Строка COPY таблицы без мутаций
+    Act: Вызов функции `_parse_line` класса Obfuscator
+    Assert: План не построен, строки данных возвращаются без изменений
+    """
+    obfuscator_object._parse_line(line='COPY table_2 (id, email) FROM stdin;')
+    assert obfuscator_object._table_plan is None  # nosec
+    assert obfuscator_object._parse_line(line='1\ttest@mail.ru') == '1\ttest@mail.ru'  # nosec
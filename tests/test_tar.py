@@ -0,0 +1,38 @@
+import io
+
+from src.pg_stage.obfuscators.tar import TarObfuscator
+from tests.dump_builder import build_tar_dump, read_tar_dump
+
+ROWS_COUNT = 100
+TABLES = [
+    ('table_1', ['id', 'email', 'notes'], [f'{row}\tuser{row}@mail.ru\tnote {row}' for row in range(ROWS_COUNT)]),
+    ('table_2', ['id', 'email'], [f'{row}\tuser{row}@mail.ru' for row in range(ROWS_COUNT)]),
+]
+COMMENTS = [
+    'COMMENT ON COLUMN public.table_1.email IS \'anon: [{"mutation_name": "email"}]\';\n',
+    'COMMENT ON TABLE public.table_2 IS \'anon: {"mutation_name": "delete"}\';\n',
+]
+
+
+def test_run_tar() -> None:
+    """
+    Arrange: Дамп в формате tar с таблицей для обфускации и таблицей для очистки
+    Act: Вызов функции `run` класса TarObfuscator
+    Assert: Члены архива записаны в исходном порядке, toc.dat и restore.sql не изменены, данные обработаны,
+        в статистике учтены все записанные байты
+    """
+    dump = build_tar_dump(tables=TABLES, comments=COMMENTS)
+    stdout = io.BytesIO()
+    stats = TarObfuscator().run(stdin=io.BytesIO(dump), stdout=stdout)
+
+    source = read_tar_dump(dump)
+    result = read_tar_dump(stdout.getvalue())
+    assert list(result) == list(source)  # nosec
+    assert result['toc.dat'] == source['toc.dat']  # nosec
+    assert result['restore.sql'] == source['restore.sql']  # nosec
+    rows = [line.split('\t') for line in result['4.dat'].decode().splitlines()]
+    assert [row[0] for row in rows] == [str(row) for row in range(ROWS_COUNT)]  # nosec
+    assert [row[2] for row in rows] == [f'note {row}' for row in range(ROWS_COUNT)]  # nosec
+    assert all(row[1] != f'user{index}@mail.ru' for index, row in enumerate(rows))  # nosec
+    assert result['5.dat'] == b''  # nosec
+    assert stats.bytes_written == len(stdout.getvalue())  # nosec
@@ -0,0 +1,104 @@
+import io
+
+import pytest
+
+from src.pg_stage.obfuscators.plain import PlainObfuscator
+from src.pg_stage.uniqueness import BloomScope, UniquenessRegistry, UniqueScope
+
+
+@pytest.mark.parametrize('mode', ['memory', 'bloom', 'disk'])
+def test_unique_scope(tmp_path, mode: str) -> None:
+    """
+    Arrange: Реестр областей уникальности с разными способами хранения
+    Act: Добавление значений в области двух колонок
+    Assert: Повтор обнаруживается только внутри своей области
+    """
+    registry = UniquenessRegistry(mode=mode, bloom_capacity=1000, spill_directory=str(tmp_path))
+    emails = registry.scope('users.email')
+    phones = registry.scope('users.phone')
+
+    assert [emails.add(value) for value in ('a', 'b', 'a')] == [True, True, False]  # nosec
+    assert phones.add('a')  # nosec
+    assert registry.scope('users.email') is emails  # nosec
+
+    registry.close()
+    assert list(tmp_path.iterdir()) == []  # nosec
+
+
+@pytest.mark.parametrize(
+    ('lifetime', 'is_new_schema', 'is_reset'),
+    [
+        ('table', False, True),
+        ('schema', False, False),
+        ('schema', True, True),
+        ('run', True, False),
+    ],
+)
+def test_unique_lifetime(lifetime: str, *, is_new_schema: bool, is_reset: bool) -> None:
+    """
+    Arrange: Реестр областей уникальности с заданным временем жизни
+    Act: Переход к следующей таблице
+    Assert: Значения сброшены только по окончании времени жизни области
+    """
+    registry = UniquenessRegistry(lifetime=lifetime)
+    registry.scope('users.email').add('a')
+
+    registry.start_table(is_new_schema=is_new_schema)
+
+    assert registry.scope('users.email').add('a') == is_reset  # nosec
+
+
+def test_bloom_scope_false_positive_rate() -> None:
+    """
+    Arrange: Фильтр Блума, рассчитанный на 1000 значений
+    Act: Добавление 1000 разных значений
+    Assert: Доля ложных повторов не превышает нескольких процентов, размер фильтра фиксирован
+    """
+    scope = BloomScope(capacity=1000, error_rate=0.01)
+
+    results = [scope.add(f'value {index}') for index in range(1000)]
+
+    assert results.count(False) < 30  # nosec
+    assert len(scope._bits) == (scope.size + 7) // 8  # nosec
+
+
+def test_unique_values_scoped_by_column() -> None:
+    """
+    Arrange: Две колонки с уникальными числами из одного узкого диапазона
+    Act: Вызов функции `run` класса PlainObfuscator
+    Assert: Значения уникальны в каждой колонке, диапазон одной колонки не занимает диапазон другой
+    """
+    mutation = '[{"mutation_name": "numeric_smallserial", "mutation_kwargs": {"start": 1, "end": 6, "unique": true}}]'
+    rows = '\n'.join(f'{row}\t0\t0' for row in range(5))
+    dump = (
+        f"COMMENT ON COLUMN table_1.first IS 'anon: {mutation}';\n"
+        f"COMMENT ON COLUMN table_1.second IS 'anon: {mutation}';\n"
+        f'COPY table_1 (id, first, second) FROM stdin;\n{rows}\n\\.\n'
+    )
+    stdout = io.StringIO()
+
+    PlainObfuscator().run(stdin=io.StringIO(dump), stdout=stdout)
+
+    values = [line.split('\t') for line in stdout.getvalue().splitlines() if line.count('\t') == 2]
+    assert len({row[1] for row in values}) == 5  # nosec
+    assert len({row[2] for row in values}) == 5  # nosec
+
+
+def test_unique_mode_unknown() -> None:
+    """
+    Arrange: Неизвестный способ хранения уникальных значений
+    Act: Создание PlainObfuscator
+    Assert: Ошибка ValueError
+    """
+    with pytest.raises(ValueError, match='Unsupported unique mode'):
+        PlainObfuscator(unique_mode='redis')
+
+
+def test_unique_scope_is_abstract() -> None:
+    """
+    Arrange: Базовый класс области уникальности
+    Act: Создание экземпляра
+    Assert: Ошибка TypeError, так как метод add не реализован
+    """
+    with pytest.raises(TypeError):
+        UniqueScope()
@@ -0,0 +1,55 @@
+import io
+
+from src.pg_stage.obfuscators.plain import PlainObfuscator
+
+ROWS_COUNT = 250
+
+
+def _make_dump(*, with_relations: bool) -> str:
+    relations = (
+        ', "relations": [{"table_name": "table_1", "column_name": "email", '
+        '"from_column_name": "id", "to_column_name": "id"}]'
+        if with_relations
+        else ''
+    )
+    rows = ''.join(f'{index}\tuser{index}@mail.ru\tnote {index}\n' for index in range(ROWS_COUNT))
+    return (
+        f'COMMENT ON COLUMN table_1.email IS \'anon: [{{"mutation_name": "email"{relations}}}]\';\n'
+        'COPY table_1 (id, email, notes) FROM stdin;\n'
+        f'{rows}'
+        '\\.\n'
+        '\n'
+        'SELECT 1;\n'
+    )
+
+
+def test_run_with_workers_keeps_rows_order() -> None:
+    """
+    Arrange: Дамп таблицы с мутацией и обфускатор с пулом процессов
+    Act: Вызов функции `run` класса Obfuscator
+    Assert: Строки мутированы в процессах пула и записаны в исходном порядке
+    """
+    obfuscator = PlainObfuscator(workers=2, worker_batch_size=16)
+    stdout = io.StringIO()
+    obfuscator.run(stdin=io.StringIO(_make_dump(with_relations=False)), stdout=stdout)
+
+    result = stdout.getvalue().splitlines()
+    rows = [line.split('\t') for line in result[2 : 2 + ROWS_COUNT]]
+    assert [row[0] for row in rows] == [str(index) for index in range(ROWS_COUNT)]  # nosec
+    assert [row[2] for row in rows] == [f'note {index}' for index in range(ROWS_COUNT)]  # nosec
+    assert not any(row[1] == f'user{index}@mail.ru' for index, row in enumerate(rows))  # nosec
+    assert result[2 + ROWS_COUNT :] == ['\\.', '', 'SELECT 1;']  # nosec
+
+
+def test_workers_fallback_for_relations() -> None:
+    """
+    Arrange: Дамп таблицы с мутацией, у которой есть связи
+    Act: Вызов функции `_parse_line` класса Obfuscator со строкой COPY
+    Assert: Таблица обрабатывается в текущем процессе
+    """
+    obfuscator = PlainObfuscator(workers=2)
+    for line in _make_dump(with_relations=True).splitlines()[:2]:
+        obfuscator._parse_line(line=line)
+
+    assert obfuscator._table_plan is not None  # nosec
+    assert not obfuscator._is_parallel  # nosec